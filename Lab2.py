@@ -1,32 +1,39 @@
 import json
-import re
+import validation
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# Read-only stand-in for the courses/students of a record that has none.
+EMPTY = MappingProxyType({})
 
 class Person:
+    # Slots instead of a per-instance __dict__ keep large rosters compact;
+    # see memory_benchmark.py.
+    __slots__ = ('name', 'age', '_email')
+
     def __init__(self, name, age, email):
         self.name = self.validate_name(name)
         self.age = self.validate_age(age)
         self._email = self.validate_email(email)
 
     def validate_name(self, name):
-        # Regular expression to match names that contain only letters and spaces
-        name_regex = r'^[a-zA-Z\s]+$'
-        if re.match(name_regex, name):
+        # Names contain only letters and spaces; see validation.NAME_PATTERN
+        if validation.is_valid_name(name):
             return name
         else:
-            raise ValueError("Name must contain only letters")
+            raise ValueError(validation.NAME_ERROR)
     
     def validate_email(self, email):
-        email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if re.match(email_regex, email):
+        if validation.is_valid_email(email):
             return email
         else:
-            raise ValueError("Invalid email format")
+            raise ValueError(validation.EMAIL_ERROR)
 
     def validate_age(self, age):
         if age >= 0:
             return age
         else:
-            raise ValueError("Age cannot be negative")
+            raise ValueError(validation.AGE_ERROR)
 
     def get_email(self):
         return self._email
@@ -50,104 +57,430 @@ class Person:
 
 
 class Course:
-    def __init__(self, course_id, course_name, instructor):
+    __slots__ = ('course_id', 'course_name', 'registry')
+
+    def __init__(self, course_id, course_name, instructor=None, registry=None):
         self.course_id = course_id
         self.course_name = course_name
-        self.instructor = instructor
-        self.enrolled_students = []
+        self.registry = registry
+        if registry is not None:
+            registry.add(self)
+        if instructor is not None:
+            self.instructor = instructor
+
+    @property
+    def instructor(self):
+        # Read from the registry's assignments, so it always agrees with
+        # Instructor.assigned_courses.
+        instructors = EnrollmentRegistry.instructors_of_course(self)
+        return next(iter(instructors.values()), None)
+
+    @instructor.setter
+    def instructor(self, instructor):
+        if instructor is not None:
+            EnrollmentRegistry.shared(instructor, self).assign(instructor, self)
+        elif self.registry is not None:
+            for previous in list(self.registry.instructors_of(self.course_id).values()):
+                self.registry.unassign(previous, self)
+
+    @property
+    def enrolled_students(self):
+        # student_id -> Student, in enrollment order
+        if self.registry is None:
+            return EMPTY
+        return self.registry.students_in(self.course_id)
 
     def add_student(self, student):
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+        if EnrollmentRegistry.shared(student, self).enroll(student, self):
             print(f"Student {student.name} has been enrolled")
         else:
             print(f"Student {student.name} is already enrolled")
 
+    def remove_student(self, student):
+        if self.registry is not None and self.registry.withdraw(student, self):
+            print(f"Student {student.name} has been withdrawn")
+        else:
+            print(f"Student {student.name} is not enrolled")
+
     def __repr__(self):
-        return f"Course({self.course_id}, {self.course_name}, {self.instructor.name})"
+        return f"Course({self.course_id}, {self.course_name}, {getattr(self.instructor, 'name', None)})"
 
     def to_dict(self):
         return {
             'course_id': self.course_id,
             'course_name': self.course_name,
-            'instructor_id': self.instructor.instructor_id,
-            'enrolled_students': [student.student_id for student in self.enrolled_students]
+            'instructor_id': getattr(self.instructor, 'instructor_id', None),
+            'enrolled_students': list(self.enrolled_students)
         }
 
     @staticmethod
-    def from_dict(data, instructors, students):
-        instructor = instructors.get(data['instructor_id'])
-        course = Course(data['course_id'], data['course_name'], instructor)
+    def from_dict(data, instructors, students, registry=None):
+        course = Course(data['course_id'], data['course_name'], instructors.get(data['instructor_id']), registry)
         for student_id in data['enrolled_students']:
             student = students.get(student_id)
-            course.add_student(student)
+            if student is not None:
+                EnrollmentRegistry.shared(student, course).enroll(student, course)
         return course
 
 
 class Student(Person):
-    def __init__(self, name, age, email, student_id):
+    __slots__ = ('student_id', 'registry')
+
+    def __init__(self, name, age, email, student_id, registry=None):
         super().__init__(name, age, email)
         self.student_id = student_id
-        self.registered_courses = []
+        self.registry = registry
+        if registry is not None:
+            registry.add(self)
+
+    @property
+    def registered_courses(self):
+        # course_id -> Course, in registration order
+        if self.registry is None:
+            return EMPTY
+        return self.registry.courses_of(self.student_id)
 
     def register_course(self, course):
-        if course not in self.registered_courses:
-            self.registered_courses.append(course)
+        if EnrollmentRegistry.shared(self, course).enroll(self, course):
             print(f"Course {course.course_name} has been registered.")
         else:
             print(f"Course {course.course_name} is already registered.")
 
+    def withdraw_course(self, course):
+        if self.registry is not None and self.registry.withdraw(self, course):
+            print(f"Course {course.course_name} has been withdrawn.")
+        else:
+            print(f"Course {course.course_name} is not registered.")
+
     def to_dict(self):
         person_dict = super().to_dict()
         person_dict.update({
             'student_id': self.student_id,
-            'registered_courses': [course.course_id for course in self.registered_courses]
+            'registered_courses': list(self.registered_courses)
         })
         return person_dict
 
     @staticmethod
-    def from_dict(data, courses):
-        student = Student(data['name'], data['age'], data['email'], data['student_id'])
-        student.registered_courses = [courses.get(course_id) for course_id in data['registered_courses']]
+    def from_dict(data, courses, registry=None):
+        student = Student(data['name'], data['age'], data['email'], data['student_id'], registry)
+        for course_id in data['registered_courses']:
+            course = courses.get(course_id)
+            if course is not None:
+                EnrollmentRegistry.shared(student, course).enroll(student, course)
         return student
 
 
 class Instructor(Person):
-    def __init__(self, name, age, email, instructor_id):
+    __slots__ = ('instructor_id', 'registry')
+
+    def __init__(self, name, age, email, instructor_id, registry=None):
         super().__init__(name, age, email)
         self.instructor_id = instructor_id
-        self.assigned_courses = []
+        self.registry = registry
+        if registry is not None:
+            registry.add(self)
+
+    @property
+    def assigned_courses(self):
+        # course_id -> Course, in assignment order
+        if self.registry is None:
+            return EMPTY
+        return self.registry.courses_taught_by(self.instructor_id)
 
     def assign_course(self, course):
-        if course not in self.assigned_courses:
-            self.assigned_courses.append(course)
+        if EnrollmentRegistry.shared(self, course).assign(self, course):
             print(f"Course {course.course_name} has been assigned")
         else:
             print(f"Course {course.course_name} is already assigned")
 
+    def unassign_course(self, course):
+        if self.registry is not None and self.registry.unassign(self, course):
+            print(f"Course {course.course_name} has been unassigned")
+        else:
+            print(f"Course {course.course_name} is not assigned")
+
     def to_dict(self):
         person_dict = super().to_dict()
         person_dict.update({
             'instructor_id': self.instructor_id,
-            'assigned_courses': [course.course_id for course in self.assigned_courses]
+            'assigned_courses': list(self.assigned_courses)
         })
         return person_dict
 
     @staticmethod
-    def from_dict(data, courses):
-        instructor = Instructor(data['name'], data['age'], data['email'], data['instructor_id'])
-        instructor.assigned_courses = [courses.get(course_id) for course_id in data['registered_courses']]
-
+    def from_dict(data, courses, registry=None):
+        instructor = Instructor(data['name'], data['age'], data['email'], data['instructor_id'], registry)
+        for course_id in data['assigned_courses']:
+            course = courses.get(course_id)
+            if course is not None:
+                EnrollmentRegistry.shared(instructor, course).assign(instructor, course)
         return instructor
 
 
+class Relation:
+    # Many-to-many relation indexed from both sides: left id -> {right id: right object}
+    # and right id -> {left id: left object}. Inner dicts keep insertion order.
+    def __init__(self, left_key, right_key):
+        self.left_key = left_key
+        self.right_key = right_key
+        self.by_left = {}
+        self.by_right = {}
+
+    def add(self, left, right):
+        left_id, right_id = getattr(left, self.left_key), getattr(right, self.right_key)
+        rights = self.by_left.setdefault(left_id, {})
+        if right_id in rights:
+            return False
+        rights[right_id] = right
+        self.by_right.setdefault(right_id, {})[left_id] = left
+        return True
+
+    def remove(self, left, right):
+        left_id, right_id = getattr(left, self.left_key), getattr(right, self.right_key)
+        rights = self.by_left.get(left_id, {})
+        if right_id not in rights:
+            return False
+        del rights[right_id]
+        lefts = self.by_right[right_id]
+        del lefts[left_id]
+        # Drop emptied indexes so ids that come and go do not pile up.
+        if not rights:
+            del self.by_left[left_id]
+        if not lefts:
+            del self.by_right[right_id]
+        return True
+
+    def rights_of(self, left_id):
+        rights = self.by_left.get(left_id)
+        return EMPTY if rights is None else MappingProxyType(rights)
+
+    def lefts_of(self, right_id):
+        lefts = self.by_right.get(right_id)
+        return EMPTY if lefts is None else MappingProxyType(lefts)
+
+    def pairs(self):
+        return [[left_id, right_id] for left_id, rights in self.by_left.items() for right_id in rights]
+
+    def merge(self, other):
+        # Ids of the two relations' records never overlap (see EnrollmentRegistry.merge).
+        for left_id, rights in other.by_left.items():
+            self.by_left.setdefault(left_id, {}).update(rights)
+        for right_id, lefts in other.by_right.items():
+            self.by_right.setdefault(right_id, {}).update(lefts)
+
+
+class EnrollmentRegistry:
+    # Single owner of the student<->course and instructor<->course relations.
+    # Students, instructors and courses read their course/student lists from
+    # here, so both sides of a relation always agree. Records created without
+    # a registry get one when first related to another record (see shared),
+    # and relating records of two registries merges them; each collection of
+    # related records thus has one registry, which is freed with them.
+    def __init__(self):
+        self.students = {}
+        self.instructors = {}
+        self.courses = {}
+        self.enrollments = Relation('student_id', 'course_id')
+        self.assignments = Relation('instructor_id', 'course_id')
+
+    @staticmethod
+    def shared(*records):
+        # The registry of whichever records have one, or a new one; records
+        # without a registry join it. Records of different registries are
+        # being related, so the smaller registries are merged into the largest.
+        registries = {id(record.registry): record.registry for record in records if record.registry is not None}
+        if not registries:
+            registry = EnrollmentRegistry()
+        else:
+            registry = max(registries.values(), key=EnrollmentRegistry.size)
+            for other in registries.values():
+                if other is not registry:
+                    registry.merge(other)
+        registry.add(*records)
+        return registry
+
+    def size(self):
+        return len(self.students) + len(self.instructors) + len(self.courses)
+
+    def merge(self, other):
+        # Moves every record and relation of other into this registry, which
+        # fails without changing either if they hold different records with the same id.
+        tables = ((self.students, other.students), (self.instructors, other.instructors),
+                  (self.courses, other.courses))
+        for mine, theirs in tables:
+            for record_id, record in theirs.items():
+                existing = mine.get(record_id)
+                if existing is not None and existing is not record:
+                    raise ValueError(f"Duplicate id {record_id!r} in registry")
+        for mine, theirs in tables:
+            for record in theirs.values():
+                record.registry = self
+            mine.update(theirs)
+        self.enrollments.merge(other.enrollments)
+        self.assignments.merge(other.assignments)
+        other.students, other.instructors, other.courses = {}, {}, {}
+        other.enrollments = Relation('student_id', 'course_id')
+        other.assignments = Relation('instructor_id', 'course_id')
+
+    @staticmethod
+    def instructors_of_course(course):
+        if course.registry is None:
+            return EMPTY
+        return course.registry.instructors_of(course.course_id)
+
+    def add(self, *records):
+        for record in records:
+            if isinstance(record, Student):
+                table, record_id = self.students, record.student_id
+            elif isinstance(record, Instructor):
+                table, record_id = self.instructors, record.instructor_id
+            elif isinstance(record, Course):
+                table, record_id = self.courses, record.course_id
+            else:
+                raise TypeError(f"Cannot register {record!r}")
+            if record.registry is not None and record.registry is not self:
+                raise ValueError(f"{record!r} belongs to another registry")
+            existing = table.get(record_id)
+            if existing is not None and existing is not record:
+                raise ValueError(f"Duplicate id {record_id!r} in registry")
+            table[record_id] = record
+            record.registry = self
+
+    def enroll(self, student, course):
+        self.add(student, course)
+        return self.enrollments.add(student, course)
+
+    def withdraw(self, student, course):
+        return self.enrollments.remove(student, course)
+
+    def assign(self, instructor, course):
+        # A course has one instructor: assigning it replaces the previous one.
+        self.add(instructor, course)
+        for previous in list(self.instructors_of(course.course_id).values()):
+            if previous is not instructor:
+                self.assignments.remove(previous, course)
+        return self.assignments.add(instructor, course)
+
+    def unassign(self, instructor, course):
+        return self.assignments.remove(instructor, course)
+
+    def courses_of(self, student_id):
+        return self.enrollments.rights_of(student_id)
+
+    def students_in(self, course_id):
+        return self.enrollments.lefts_of(course_id)
+
+    def courses_taught_by(self, instructor_id):
+        return self.assignments.rights_of(instructor_id)
+
+    def instructors_of(self, course_id):
+        return self.assignments.lefts_of(course_id)
+
+    def to_dict(self):
+        # Each relation is written once as a list of id pairs instead of being
+        # repeated on both of its sides.
+        return {
+            'students': [dict(Person.to_dict(student), student_id=student.student_id)
+                         for student in self.students.values()],
+            'instructors': [dict(Person.to_dict(instructor), instructor_id=instructor.instructor_id)
+                            for instructor in self.instructors.values()],
+            'courses': [{
+                'course_id': course.course_id,
+                'course_name': course.course_name,
+                'instructor_id': getattr(course.instructor, 'instructor_id', None)
+            } for course in self.courses.values()],
+            'enrollments': self.enrollments.pairs(),
+            'assignments': self.assignments.pairs()
+        }
+
+    @staticmethod
+    def from_dict(data):
+        registry = EnrollmentRegistry()
+        for item in data['instructors']:
+            Instructor(item['name'], item['age'], item['email'], item['instructor_id'], registry)
+        for item in data['students']:
+            Student(item['name'], item['age'], item['email'], item['student_id'], registry)
+        for item in data['courses']:
+            instructor = registry.instructors.get(item['instructor_id'])
+            Course(item['course_id'], item['course_name'], instructor, registry)
+        for student_id, course_id in data['enrollments']:
+            registry.enroll(registry.students[student_id], registry.courses[course_id])
+        for instructor_id, course_id in data['assignments']:
+            registry.assign(registry.instructors[instructor_id], registry.courses[course_id])
+        return registry
+
+
 # Serialization functions
-def save_to_file(filename, data):
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+#
+# Files are JSON Lines: one record per line, so they are written and read one
+# record at a time. Students, instructors and courses are written as their
+# to_dict() plus a 'type' key; any other value is written as is. Records may
+# come in any order: links to a course that has not been read yet are kept
+# until it is.
+# Only the parsing is streamed: every loaded record is added to the registry
+# passed to load_from_file, so memory grows with the file while the caller
+# keeps that registry. orjson is used when it is installed and fast_json is true.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RECORD_TYPES = {'Student': Student, 'Instructor': Instructor, 'Course': Course}
+
+
+def json_codec(fast_json):
+    if fast_json and orjson is not None:
+        return orjson.dumps, orjson.loads
+    encoder = json.JSONEncoder(separators=(',', ':'))
+    return (lambda value: encoder.encode(value).encode('utf-8')), json.loads
+
 
-def load_from_file(filename):
-    with open(filename, 'r') as f:
-        return json.load(f)
+def save_to_file(filename, records, fast_json=True):
+    if isinstance(records, Mapping):
+        # A dict of record lists (the old save_to_file argument) would only
+        # write its keys.
+        raise TypeError("save_to_file takes an iterable of records, not a mapping")
+    dumps, _ = json_codec(fast_json)
+    count = 0
+    with open(filename, 'wb') as f:
+        for record in records:
+            if isinstance(record, tuple(RECORD_TYPES.values())):
+                record = dict(record.to_dict(), type=type(record).__name__)
+            f.write(dumps(record))
+            f.write(b'\n')
+            count += 1
+    return count
 
 
+def load_from_file(filename, registry, fast_json=True):
+    # Records are linked through, and kept by, the caller's registry.
+    _, loads = json_codec(fast_json)
+    # course_id -> instructors/students that listed the course before it was read
+    pending_assignments = {}
+    pending_enrollments = {}
+    with open(filename, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = loads(line)
+            record_type = data.get('type') if isinstance(data, dict) else None
+            if record_type == 'Instructor':
+                record = Instructor.from_dict(data, registry.courses, registry)
+                for course_id in data['assigned_courses']:
+                    if course_id not in registry.courses:
+                        pending_assignments.setdefault(course_id, []).append(record)
+            elif record_type == 'Course':
+                # Enrollments are restored from the student records, which list their courses.
+                record = Course.from_dict(dict(data, enrolled_students=[]), registry.instructors, {}, registry)
+                for instructor in pending_assignments.pop(record.course_id, []):
+                    registry.assign(instructor, record)
+                for student in pending_enrollments.pop(record.course_id, []):
+                    registry.enroll(student, record)
+            elif record_type == 'Student':
+                record = Student.from_dict(data, registry.courses, registry)
+                for course_id in data['registered_courses']:
+                    if course_id not in registry.courses:
+                        pending_enrollments.setdefault(course_id, []).append(record)
+            else:
+                record = data
+            yield record
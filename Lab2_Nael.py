@@ -1,6 +1,16 @@
-import sqlite3
 import json
-import re
+import validation
+from db_session import DatabaseSession
+from repository import Repository, LAB2_TABLES
+from migrations import migrate, LAB2_MIGRATIONS
+
+# Shared session used by every create_table/save_to_db/load_from_db below.
+# Importing this module does not touch the database: the tables are created
+# and migrated by create_schema when the session opens its first connection,
+# so ``session.path`` can still be pointed elsewhere until then.
+session = DatabaseSession('school_management_system.db')
+# Builds the INSERT/SELECT statements used with the session's connection.
+repository = Repository(LAB2_TABLES)
 
 class Person:
     def __init__(self, name, age, email):
@@ -28,8 +38,7 @@ class Person:
     
     @staticmethod
     def is_valid_email(email):
-        email_regex = r"^[\w\.-]+@[\w\.-]+\.\w{2,}$"
-        return re.match(email_regex, email) is not None
+        return validation.is_valid_email(email, validation.EMAIL_WITH_TLD_PATTERN)
     
     def to_dict(self):
         return {"name": self.name, "age": self.age, "_email": self._email}
@@ -41,37 +50,25 @@ class Person:
     # SQLite database interaction methods
     @staticmethod
     def create_table():
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS Person (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER NOT NULL,
-            email TEXT NOT NULL UNIQUE
-        )
-        ''')
-        conn.commit()
-        conn.close()
+        with session.transaction() as c:
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS Person (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                age INTEGER NOT NULL,
+                email TEXT NOT NULL UNIQUE
+            )
+            ''')
 
     def save_to_db(self):
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        INSERT INTO Person (name, age, email) VALUES (?, ?, ?)
-        ''', (self.name, self.age, self._email))
-        conn.commit()
-        conn.close()
+        with session.transaction():
+            repository.insert(session.connection(), "Person", (self.name, self.age, self._email))
 
     @staticmethod
     def load_from_db(email):
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('SELECT * FROM Person WHERE email = ?', (email,))
-        result = c.fetchone()
-        conn.close()
+        result = repository.get(session.connection(), "Person", email)
         if result:
-            return Person(result[1], result[2], result[3])
+            return Person(*result)
         else:
             return None
 
@@ -103,28 +100,34 @@ class Student(Person):
     # SQLite methods
     @staticmethod
     def create_table():
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS Student (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            student_id TEXT NOT NULL UNIQUE
-        )
-        ''')
-        conn.commit()
-        conn.close()
+        with session.transaction() as c:
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS Student (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                age INTEGER NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                student_id TEXT NOT NULL UNIQUE
+            )
+            ''')
 
     def save_to_db(self):
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        INSERT INTO Student (name, age, email, student_id) VALUES (?, ?, ?, ?)
-        ''', (self.name, self.age, self._email, self.student_id))
-        conn.commit()
-        conn.close()
+        with session.transaction():
+            repository.insert(session.connection(), "Student", (self.name, self.age, self._email, self.student_id))
+
+    @classmethod
+    def save_many(cls, students):
+        rows = []
+        for student in students:
+            if not isinstance(student, cls):
+                raise ValueError("Invalid student")
+            rows.append((student.name, student.age, student._email, student.student_id))
+        invalid_emails = validation.validate_many(
+            emails=[row[2] for row in rows], email_pattern=validation.EMAIL_WITH_TLD_PATTERN)
+        if invalid_emails:
+            raise ValueError(f"Invalid email format in rows {sorted(invalid_emails)}")
+        with session.transaction():
+            return repository.insert_many(session.connection(), "Student", rows)
 
 class Instructor(Person):
     def __init__(self, name, age, email, instructor_id):
@@ -154,28 +157,34 @@ class Instructor(Person):
     # SQLite methods
     @staticmethod
     def create_table():
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS Instructor (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            instructor_id TEXT NOT NULL UNIQUE
-        )
-        ''')
-        conn.commit()
-        conn.close()
+        with session.transaction() as c:
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS Instructor (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                age INTEGER NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                instructor_id TEXT NOT NULL UNIQUE
+            )
+            ''')
 
     def save_to_db(self):
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        INSERT INTO Instructor (name, age, email, instructor_id) VALUES (?, ?, ?, ?)
-        ''', (self.name, self.age, self._email, self.instructor_id))
-        conn.commit()
-        conn.close()
+        with session.transaction():
+            repository.insert(session.connection(), "Instructor", (self.name, self.age, self._email, self.instructor_id))
+
+    @classmethod
+    def save_many(cls, instructors):
+        rows = []
+        for instructor in instructors:
+            if not isinstance(instructor, cls):
+                raise ValueError("Invalid instructor")
+            rows.append((instructor.name, instructor.age, instructor._email, instructor.instructor_id))
+        invalid_emails = validation.validate_many(
+            emails=[row[2] for row in rows], email_pattern=validation.EMAIL_WITH_TLD_PATTERN)
+        if invalid_emails:
+            raise ValueError(f"Invalid email format in rows {sorted(invalid_emails)}")
+        with session.transaction():
+            return repository.insert_many(session.connection(), "Instructor", rows)
 
 class Course:
     def __init__(self, course_id, course_name, instructor):
@@ -212,30 +221,46 @@ class Course:
     @staticmethod
     
     def create_table():
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS Course (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_id TEXT NOT NULL UNIQUE,
-            course_name TEXT NOT NULL,
-            instructor_id INTEGER,
-            FOREIGN KEY (instructor_id) REFERENCES Instructor(id)
-        )
-        ''')
-        conn.commit()
-        conn.close()
+        with session.transaction() as c:
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS Course (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                course_id TEXT NOT NULL UNIQUE,
+                course_name TEXT NOT NULL,
+                instructor_id INTEGER,
+                FOREIGN KEY (instructor_id) REFERENCES Instructor(id)
+            )
+            ''')
 
     def save_to_db(self):
-        conn = sqlite3.connect('school_management_system.db')
-        c = conn.cursor()
-        c.execute('''
-        INSERT INTO Course (course_id, course_name, instructor_id) VALUES (?, ?, (SELECT id FROM Instructor WHERE instructor_id = ?))
-        ''', (self.course_id, self.course_name, self.instructor.instructor_id))
-        conn.commit()
-        conn.close()
-
-Person.create_table()
-Student.create_table()
-Instructor.create_table()
-Course.create_table()
+        with session.transaction():
+            conn = session.connection()
+            instructor = repository.get(conn, "Instructor", self.instructor.instructor_id, ("id",))
+            repository.insert(conn, "Course", (self.course_id, self.course_name, instructor[0] if instructor else None))
+
+    @classmethod
+    def save_many(cls, courses):
+        courses = list(courses)
+        for course in courses:
+            if not isinstance(course, cls):
+                raise ValueError("Invalid course")
+        with session.transaction():
+            conn = session.connection()
+            # Resolve every instructor's row id with one query instead of a
+            # lookup per inserted course.
+            instructor_ids = dict(repository.all(conn, "Instructor", ("instructor_id", "id")))
+            rows = [
+                (course.course_id, course.course_name,
+                 instructor_ids.get(course.instructor.instructor_id) if course.instructor else None)
+                for course in courses
+            ]
+            return repository.insert_many(conn, "Course", rows)
+
+def create_schema(session):
+    Person.create_table()
+    Student.create_table()
+    Instructor.create_table()
+    Course.create_table()
+    migrate(session.connection(), LAB2_MIGRATIONS)
+
+session.setup = create_schema
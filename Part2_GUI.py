@@ -6,9 +6,22 @@ import json
 import os
 import mysql.connector
 import subprocess
-from mysql.connector import Error
 import csv
+import gzip
+import itertools
+import threading
+from contextlib import closing
 from Lab2 import Student, Instructor, Course  
+from db_pool import ConnectionPool, MySQLBackend
+from db_worker import DatabaseWorker
+from repository import Repository, MYSQL_ROSTER, MYSQL_VERSIONED
+from migrations import migrate, MYSQL_ROSTER_MIGRATIONS
+import registrations
+from roster_queries import RosterQueries
+from versioned_cache import VersionedCache
+from search_index import SearchIndex
+from virtual_treeview import VirtualTreeview
+import bulk_import
 
 
 class SchoolManagementSystem(tk.Tk):
@@ -35,6 +48,38 @@ class SchoolManagementSystem(tk.Tk):
         self.students = []
         self.instructors = []
         self.courses = []
+        # Substring index over the three lists, kept in step by refresh_view_all.
+        self.search_index = SearchIndex()
+        # Ids of the students and courses listed in the registration dropdowns, in the same order.
+        self.student_choices = []
+        self.course_choices = []
+
+        # Database work runs on db_worker's threads, which borrow connections
+        # from this pool instead of reconnecting for every query.
+        self.db_pool = ConnectionPool(MySQLBackend(
+            host='localhost',
+            database='school_management_system',
+            user='root',
+            password='Ihab2003*'
+        ), size=5)
+        self.db_worker = DatabaseWorker(self, self.db_pool)
+        self.repository = Repository.for_backend(self.db_pool.backend, MYSQL_ROSTER, MYSQL_VERSIONED)
+        # Cached roster results and table reads; every job that commits a write
+        # invalidates them (see invalidate_caches).
+        self.roster_queries = RosterQueries(self.db_pool.backend.placeholder)
+        self.read_cache = VersionedCache()
+        # Adds any missing indexes and tables before the first queries need
+        # them; every later job waits until it finished.
+        self.db_worker.submit_first(
+            lambda conn: migrate(conn, MYSQL_ROSTER_MIGRATIONS, self.db_pool.backend.placeholder),
+            on_error=lambda e: messagebox.showerror("Database Error", f"Could not update the database schema: {e}")
+        )
+        # Bumped by each refresh so results of an older, slower refresh are dropped.
+        self.view_all_request = 0
+        self.dropdowns_request = 0
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Number of records written per statement when loading a JSON file.
+        self.import_batch_size = 1000
 
         # Create a notebook to manage tabs
         self.notebook = ttk.Notebook(self)
@@ -67,48 +112,29 @@ class SchoolManagementSystem(tk.Tk):
         self.create_register_course_form()
         self.create_view_all_form()
              
-    def get_db_connection(self):
+    def invalidate_caches(self):
         """
-        Establishes a connection to the database.
-
-        This method attempts to connect to the MySQL database using the provided
-        connection details. If the connection is successful, it returns the connection object.
-
-        Args:
-            None
+        Drops cached reads after this app commits a write, so the next refresh reads the new data.
 
-        Returns:
-            connection (mysql.connector.connection_cext.CMySQLConnection): The database connection object, or None if the connection fails.
-        """ 
-        
-        try:
-            connection = mysql.connector.connect(
-                host='localhost',
-                database='school_management_system',
-                user='root',
-                password='Ihab2003*'
-            )
-            if connection.is_connected():
-                return connection
-        except Error as e:
-            messagebox.showerror('Database Error', str(e))
-        return None
-
-    def close_db_connection(self, connection):
+        Safe to call from the database worker's threads.
         """
-        Closes the database connection.
+        self.roster_queries.invalidate()
+        self.read_cache.invalidate()
 
-        This method checks if the provided connection is active and closes it.
+    def on_close(self):
+        """
+        Stops the database worker and closes pooled connections before closing the window.
 
         Args:
-            connection (mysql.connector.connection_cext.CMySQLConnection): The database connection object.
+            None
 
         Returns:
             None
         """
-        if connection.is_connected():
-            connection.close()
-            
+        self.db_worker.shutdown()
+        self.db_pool.close_all()
+        self.destroy()
+
     def create_student_form(self):
         """
         Creates the form for adding a student.
@@ -206,7 +232,9 @@ class SchoolManagementSystem(tk.Tk):
         Creates the form for registering a student for a course.
 
         This method initializes the form fields (Select Student, Select Course) and
-        adds a button to submit the registration information to the database.
+        adds a button to submit the registration information to the database, plus
+        buttons showing the selected course's roster, the selected student's
+        schedule and every instructor's teaching load.
 
         Args:
             None
@@ -223,6 +251,12 @@ class SchoolManagementSystem(tk.Tk):
         self.course_dropdown.pack()
         
         tk.Button(self.register_course_frame, text="Register", command=self.register_course).pack()
+
+        roster_frame = tk.Frame(self.register_course_frame)
+        roster_frame.pack(pady=10)
+        tk.Button(roster_frame, text="Course Roster", command=self.show_course_roster).pack(side=tk.LEFT, padx=5)
+        tk.Button(roster_frame, text="Student Schedule", command=self.show_student_schedule).pack(side=tk.LEFT, padx=5)
+        tk.Button(roster_frame, text="Instructor Loads", command=self.show_instructor_loads).pack(side=tk.LEFT, padx=5)
         self.refresh_dropdowns()
     
     def create_view_all_form(self):
@@ -247,14 +281,25 @@ class SchoolManagementSystem(tk.Tk):
         self.search_entry.pack(side=tk.LEFT, padx=5)
         tk.Button(search_frame, text="Search", command=self.search_records).pack(side=tk.LEFT)
         
-        self.view_all_table = ttk.Treeview(self.view_all_frame, columns=("ID", "Name", "Age", "Email", "Additional Info", "Actions"), show="headings")
+        # Only the rows in view are created as Treeview items, so any number of
+        # records loads instantly; see VirtualTreeview.
+        table_frame = tk.Frame(self.view_all_frame)
+        table_frame.pack(expand=1, fill="both")
+        table_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
+        self.view_all_table = VirtualTreeview(
+            table_frame, columns=("ID", "Name", "Age", "Email", "Additional Info", "Actions"),
+            show="headings", yscrollcommand=table_scrollbar.set
+        )
+        table_scrollbar.config(command=self.view_all_table.yview)
+        table_scrollbar.pack(side=tk.RIGHT, fill="y")
         self.view_all_table.heading("ID", text="ID") 
         self.view_all_table.heading("Name", text="Name")
         self.view_all_table.heading("Age", text="Age")
         self.view_all_table.heading("Email", text="Email")
         self.view_all_table.heading("Additional Info", text="Additional Info")
         self.view_all_table.heading("Actions", text="Actions")
-        self.view_all_table.pack(expand=1, fill="both")
+        self.view_all_table.pack(side=tk.LEFT, expand=1, fill="both")
+        self.view_all_table.bind("<ButtonRelease-1>", self.handle_table_click)
         
         button_frame = tk.Frame(self.view_all_frame)
         button_frame.pack(pady=10)
@@ -275,76 +320,42 @@ class SchoolManagementSystem(tk.Tk):
         None
 
         Functionality:
-        - Clears the existing table data.
-        - Establishes a database connection and fetches all students, instructors, and courses.
-        - Inserts the fetched data into the table for display.
+        - Fetches all students, instructors, and courses on the database worker, from ``self.read_cache`` if none of them changed since the last fetch.
+        - Once the rows arrive, updates the search index and hands the fetched data to the table, which only draws the rows in view.
+        - Ignores the rows of a refresh that finishes after a newer one.
         - Binds the click event on the table to handle editing or deleting records.
 
         Example:
         self.refresh_view_all()
         """
-        # Clear existing table data
-        self.view_all_table.delete(*self.view_all_table.get_children())
-        
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-
-            # Fetch students
-            cursor.execute("SELECT student_id, name, age, email FROM students")
-            self.students = cursor.fetchall()  
-
-            # Fetch instructors
-            cursor.execute("SELECT instructor_id, name, age, email FROM instructors")
-            self.instructors = cursor.fetchall() 
-
-            # Fetch courses
-            cursor.execute("SELECT course_id, name, instructor_name FROM courses")
-            self.courses = cursor.fetchall()  
-
-            # Display Students
-            for student in self.students:
-                self.view_all_table.insert("", tk.END, values=(
-                    student[0],  # student_id
-                    student[1],  # name
-                    student[2],  # age
-                    student[3],  # email
-                    "Student",
-                    "Edit/Delete"
-                ))
-            
-            # Display Instructors
-            for instructor in self.instructors:
-                self.view_all_table.insert("", tk.END, values=(
-                    instructor[0],  
-                    instructor[1],  
-                    instructor[2],  
-                    instructor[3],  
-                    "Instructor",
-                    "Edit/Delete"
-                ))
-            
-            # Display Courses
-            for course in self.courses:
-                self.view_all_table.insert("", tk.END, values=(
-                    course[0],  
-                    course[1],  
-                    "-",  
-                    "-",  
-                    f"Instructor: {course[2]}",  # instructor
-                    "Edit/Delete"
-                ))
-
-            # Bind the click event
-            self.view_all_table.bind("<ButtonRelease-1>", self.handle_table_click)
-
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-        finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+        self.view_all_request += 1
+        request = self.view_all_request
+
+        def fetch_all(conn):
+            # Served from memory while no student, instructor or course changed.
+            return self.read_cache.get(conn, "view_all", ("students", "instructors", "courses"), lambda conn: (
+                self.repository.all(conn, "students"),
+                self.repository.all(conn, "instructors"),
+                self.repository.all(conn, "courses"),
+            ))
+
+        def show_all(results):
+            if request != self.view_all_request:
+                return
+            self.students, self.instructors, self.courses = results
+            self.search_index.update(itertools.chain(
+                (("Student", row[0], row, (row[1], row[0])) for row in self.students),
+                (("Instructor", row[0], row, (row[1], row[0])) for row in self.instructors),
+                (("Course", row[0], row, (row[1], row[0])) for row in self.courses),
+            ))
+
+            self.view_all_table.set_rows(
+                [self.table_values("Student", student) for student in self.students]
+                + [self.table_values("Instructor", instructor) for instructor in self.instructors]
+                + [self.table_values("Course", course) for course in self.courses]
+            )
 
+        self.db_worker.submit(fetch_all, show_all, lambda e: messagebox.showerror("Database Error", str(e)))
 
     def handle_table_click(self, event):
         """
@@ -393,9 +404,9 @@ class SchoolManagementSystem(tk.Tk):
         None
 
         Functionality:
-        - Retrieves selected student and course names from the dropdown menus.
+        - Retrieves the ids of the student and course selected in the dropdown menus.
         - Validates that both a student and course are selected.
-        - Inserts the registration data into the database and commits the transaction.
+        - Inserts the registration on the database worker and commits the transaction; registering twice changes nothing.
         - Displays a success message upon successful registration.
 
         Example:
@@ -403,25 +414,103 @@ class SchoolManagementSystem(tk.Tk):
         """
         student_name = self.student_dropdown.get()
         course_name = self.course_dropdown.get()
+        student_index = self.student_dropdown.current()
+        course_index = self.course_dropdown.current()
 
         
-        if not student_name or not course_name:
+        if student_index < 0 or course_index < 0:
             messagebox.showwarning("Registration Error", "Please select both student and course.")
             return
+        student_id = self.student_choices[student_index]
+        course_id = self.course_choices[course_index]
         
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO course_registrations (student_name, course_name) VALUES (%s, %s)",
-                (student_name, course_name)
-            )
+        def insert_registration(conn):
+            added = registrations.register(conn, self.repository, [student_id], [course_id])
             conn.commit()
+            self.invalidate_caches()
+            return added
+
+        def registered(added):
+            if not added:
+                messagebox.showinfo("Registration", f"{student_name} is already registered for {course_name}.")
+                return
             print(f"Course {course_name} is registered by {student_name}")
             messagebox.showinfo("Registration Successful", f"Course {course_name} has been registered by {student_name}.")
-        except Error as e:
-            messagebox.showwarning("Database Error", str(e))
+
+        self.db_worker.submit(insert_registration, registered, lambda e: messagebox.showwarning("Database Error", str(e)))
         
+
+    def show_course_roster(self):
+        """
+        Shows the students registered in the course selected in the registration form.
+
+        The roster is read on the database worker through ``self.roster_queries``,
+        so showing it again before any write is served from the cache.
+        """
+        course_index = self.course_dropdown.current()
+        if course_index < 0:
+            messagebox.showwarning("Course Roster", "Please select a course.")
+            return
+        course_id = self.course_choices[course_index]
+        course_name = self.course_dropdown.get()
+
+        def show(rows):
+            enrolled = rows[0][3] if rows else 0
+            self.show_rows(f"{course_name}: {enrolled} students", ("ID", "Name", "Email"),
+                           [row[:3] for row in rows])
+
+        self.db_worker.submit(lambda conn: self.roster_queries.course_roster(conn, course_id), show,
+                              lambda e: messagebox.showerror("Database Error", str(e)))
+
+    def show_student_schedule(self):
+        """
+        Shows the courses of the student selected in the registration form, with each course's size.
+        """
+        student_index = self.student_dropdown.current()
+        if student_index < 0:
+            messagebox.showwarning("Student Schedule", "Please select a student.")
+            return
+        student_id = self.student_choices[student_index]
+        student_name = self.student_dropdown.get()
+
+        def show(rows):
+            course_count = rows[0][4] if rows else 0
+            self.show_rows(f"{student_name}: {course_count} courses", ("ID", "Course", "Instructor", "Students"),
+                           [row[:4] for row in rows])
+
+        self.db_worker.submit(lambda conn: self.roster_queries.student_schedule(conn, student_id), show,
+                              lambda e: messagebox.showerror("Database Error", str(e)))
+
+    def show_instructor_loads(self):
+        """
+        Shows every instructor's number of courses and students, busiest first.
+        """
+        self.db_worker.submit(
+            self.roster_queries.instructor_loads,
+            lambda rows: self.show_rows("Instructor Loads", ("ID", "Instructor", "Courses", "Students", "Rank"), rows),
+            lambda e: messagebox.showerror("Database Error", str(e))
+        )
+
+    def show_rows(self, title, columns, rows):
+        """
+        Opens a window listing ``rows`` in a table.
+
+        Args:
+            title (str): The window title.
+            columns (tuple): Column headings.
+            rows (list): One tuple of values per row.
+        """
+        window = tk.Toplevel(self)
+        window.title(title)
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL)
+        table = VirtualTreeview(window, columns=columns, show="headings", yscrollcommand=scrollbar.set)
+        scrollbar.config(command=table.yview)
+        scrollbar.pack(side=tk.RIGHT, fill="y")
+        for column in columns:
+            table.heading(column, text=column)
+        table.pack(side=tk.LEFT, expand=1, fill="both")
+        table.set_rows(rows)
+
     def refresh_dropdowns(self):
         """
         Refreshes the values in the student, course, and instructor dropdown menus.
@@ -433,46 +522,37 @@ class SchoolManagementSystem(tk.Tk):
         None
 
         Functionality:
-        - Clears existing values in the dropdown menus.
-        - Establishes a database connection and fetches all student names, course names, and instructor names.
-        - Updates the dropdown menus with the fetched values.
+        - Fetches all student and course names with their ids, and all instructor names, on the database worker, from ``self.read_cache`` if none of them changed since the last fetch.
+        - Updates the dropdown menus with the fetched values once they arrive, ignoring a refresh that finishes after a newer one.
 
         Example:
         self.refresh_dropdowns()
         """
-        self.student_dropdown["values"] = []
-        self.course_dropdown["values"] = []
-        self.instructor_dropdown["values"]= []
-
-        # Database connection
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-
-            # Fetch student names
-            cursor.execute("SELECT name FROM students")
-            student_names = [row[0] for row in cursor.fetchall()]
-
-            # Fetch course names
-            cursor.execute("SELECT name FROM courses")
-            course_names = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT name FROM instructors")
-            instructor_name= [row[0] for row in cursor.fetchall()]
-
+        self.dropdowns_request += 1
+        request = self.dropdowns_request
+
+        def fetch_names(conn):
+            return self.read_cache.get(conn, "dropdowns", ("students", "instructors", "courses"), lambda conn: (
+                self.repository.all(conn, "students", ("student_id", "name")),
+                self.repository.all(conn, "courses", ("course_id", "name")),
+                self.repository.column(conn, "instructors", "name"),
+            ))
+
+        def update_dropdowns(names):
+            if request != self.dropdowns_request:
+                return
+            students, courses, instructor_names = names
             # Update dropdown values
-            self.student_dropdown["values"] = student_names
-            self.course_dropdown["values"] = course_names
-            self.instructor_dropdown["values"] = instructor_name
-
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-        finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.student_choices = [student_id for student_id, _ in students]
+            self.course_choices = [course_id for course_id, _ in courses]
+            self.student_dropdown["values"] = [name for _, name in students]
+            self.course_dropdown["values"] = [name for _, name in courses]
+            self.instructor_dropdown["values"] = instructor_names
+
+        self.db_worker.submit(fetch_names, update_dropdowns, lambda e: messagebox.showerror("Database Error", str(e)))
     
     
+
     def add_student(self):
         """
         Adds a new student to the database and updates the UI.
@@ -486,8 +566,8 @@ class SchoolManagementSystem(tk.Tk):
         Functionality:
         - Retrieves the student's name, age, email, and ID from the input fields.
         - Validates that all fields are filled.
-        - Creates a new Student object and inserts it into the database.
-        - Updates the student list and refreshes the dropdown menus and the display table.
+        - Creates a new Student object and inserts it into the database on the database worker.
+        - Once inserted, updates the student list and refreshes the dropdown menus and the display table.
         - Clears the input fields after adding the student.
         - Handles and displays any input or database errors.
 
@@ -505,14 +585,16 @@ class SchoolManagementSystem(tk.Tk):
         
         try:
             student = Student(name, int(age), email, student_id)
+        except ValueError as ve:
+            messagebox.showwarning("Input Error", str(ve))
+            return
 
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO students (student_id, name, age, email) VALUES (%s, %s, %s, %s)",
-                (student.student_id, student.name, student.age, student._email)
-            )
+        def insert_student(conn):
+            self.repository.insert(conn, "students", (student.student_id, student.name, student.age, student._email))
             conn.commit()
+            self.invalidate_caches()
+
+        def student_added(_):
             self.students.append(student)
             messagebox.showinfo("Add Student", f"Added Student: {student.name}, {student.age}, {student._email}, {student.student_id}")
             self.refresh_dropdowns()
@@ -522,13 +604,10 @@ class SchoolManagementSystem(tk.Tk):
             self.student_age_entry.delete(0, tk.END)
             self.student_email_entry.delete(0, tk.END)
             self.student_id_entry.delete(0, tk.END)
-            self.close_db_connection(conn)
 
-        except ValueError as ve:
-            messagebox.showwarning("Input Error", str(ve))
-        except Error as e:
-            messagebox.showwarning('Database Error', str(e))
+        self.db_worker.submit(insert_student, student_added, lambda e: messagebox.showwarning('Database Error', str(e)))
             
+
     def add_instructor(self):
         """
         Adds a new instructor to the database and updates the UI.
@@ -542,8 +621,8 @@ class SchoolManagementSystem(tk.Tk):
         Functionality:
         - Retrieves the instructor's name, age, email, and ID from the input fields.
         - Validates that all fields are filled.
-        - Creates a new Instructor object and inserts it into the database.
-        - Updates the instructor list and refreshes the dropdown menus and the display table.
+        - Creates a new Instructor object and inserts it into the database on the database worker.
+        - Once inserted, updates the instructor list and refreshes the dropdown menus and the display table.
         - Clears the input fields after adding the instructor.
         - Handles and displays any input or database errors.
 
@@ -561,14 +640,17 @@ class SchoolManagementSystem(tk.Tk):
         
         try:
             instructor = Instructor(name, int(age), email, instructor_id)
+        except ValueError as ve:
+            messagebox.showwarning("Input Error", str(ve))
+            return
 
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO instructors (instructor_id, name, age, email) VALUES (%s, %s, %s, %s)",
-                (instructor.instructor_id, instructor.name, instructor.age, instructor._email)
-            )
+        def insert_instructor(conn):
+            self.repository.insert(conn, "instructors",
+                                   (instructor.instructor_id, instructor.name, instructor.age, instructor._email))
             conn.commit()
+            self.invalidate_caches()
+
+        def instructor_added(_):
             self.instructors.append(instructor)
             messagebox.showinfo("Add Instructor", f"Added Instructor: {instructor.name}, {instructor.age}, {instructor._email}, {instructor.instructor_id}")
             self.refresh_dropdowns()
@@ -578,14 +660,11 @@ class SchoolManagementSystem(tk.Tk):
             self.instructor_age_entry.delete(0, tk.END)
             self.instructor_email_entry.delete(0, tk.END)
             self.instructor_id_entry.delete(0, tk.END)
-            
-            self.close_db_connection(conn)
-        except ValueError as ve:
-            messagebox.showwarning("Input Error", str(ve))
-        except Error as e:
-            messagebox.showwarning('Database Error', str(e))
+
+        self.db_worker.submit(insert_instructor, instructor_added, lambda e: messagebox.showwarning('Database Error', str(e)))
             
     
+
     def add_course(self):
         """
         Adds a new course to the database and updates the UI.
@@ -599,8 +678,8 @@ class SchoolManagementSystem(tk.Tk):
         Functionality:
         - Retrieves the course's ID, name, and instructor name from the input fields.
         - Validates that all fields are filled.
-        - Creates a new Course object and inserts it into the database.
-        - Updates the course list and refreshes the dropdown menus and the display table.
+        - Creates a new Course object and inserts it into the database on the database worker.
+        - Once inserted, updates the course list and refreshes the dropdown menus and the display table.
         - Clears the input fields after adding the course.
         - Handles and displays any input or database errors.
 
@@ -616,15 +695,17 @@ class SchoolManagementSystem(tk.Tk):
             return
         
         try:
-            course = Course(course_id, course_name, instructor_name)
+            course = Course(course_id, course_name)
+        except ValueError as ve:
+            messagebox.showwarning("Input Error", str(ve))
+            return
 
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO courses (course_id, name, instructor_name) VALUES (%s, %s, %s)",
-                (course.course_id, course.course_name, course.instructor)
-            )
+        def insert_course(conn):
+            self.repository.insert(conn, "courses", (course.course_id, course.course_name, instructor_name))
             conn.commit()
+            self.invalidate_caches()
+
+        def course_added(_):
             self.courses.append(course)
             messagebox.showinfo("Add Course", f"Added Course: {course_id}, {course_name}, {instructor_name}")
             self.refresh_dropdowns()
@@ -633,14 +714,11 @@ class SchoolManagementSystem(tk.Tk):
             self.course_id_entry.delete(0, tk.END)
             self.course_name_entry.delete(0, tk.END)
             self.instructor_dropdown.delete(0, tk.END)
-            
-            self.close_db_connection(conn)
-        except ValueError as ve:
-            messagebox.showwarning("Input Error", str(ve))
-        except Error as e:
-            messagebox.showwarning('Database Error', str(e))
+
+        self.db_worker.submit(insert_course, course_added, lambda e: messagebox.showwarning('Database Error', str(e)))
             
     
+
     def search_records(self):
         """
         Searches for students, instructors, and courses in the database.
@@ -653,58 +731,56 @@ class SchoolManagementSystem(tk.Tk):
 
         Functionality:
         - Retrieves the search term from the search entry field.
-        - Clears the current entries in the display table.
-        - Filters the student, instructor, and course lists based on the search term.
-        - Updates the display table with the filtered results.
+        - Looks the term up in the search index built by refresh_view_all, which matches
+          names, IDs, and record types without scanning every record.
+        - Replaces the rows of the display table with the matching results.
 
         Example:
         self.search_records()
         """
-        search_term = self.search_entry.get().lower()
-        for row in self.view_all_table.get_children():
-            self.view_all_table.delete(row)
-        
-        # Filter and display students
-        for student in self.students:
-            student_id, student_name, student_age, student_email = student
-            if search_term in student_name.lower() or search_term in str(student_id).lower() or search_term in "student":
-                self.view_all_table.insert("", tk.END, values=(
-                    student_id,
-                    student_name,
-                    student_age,
-                    student_email,
-                    "Student",
-                    "Edit/Delete"
-                ))
-        
-        # Filter and display instructors
-        for instructor in self.instructors:
-            instructor_id, instructor_name, instructor_age, instructor_email = instructor
-            if search_term in instructor_name.lower() or search_term in str(instructor_id).lower() or search_term in "instructor":
-                self.view_all_table.insert("", tk.END, values=(
-                    instructor_id,
-                    instructor_name,
-                    instructor_age,
-                    instructor_email,
-                    "Instructor",
-                    "Edit/Delete"
-                ))
-        
-        # Filter and display courses
-        for course in self.courses:
-            course_id, course_name, course_instructor = course
-            if search_term in course_name.lower() or search_term in str(course_id).lower() or search_term in "course":
-                self.view_all_table.insert("", tk.END, values=(
-                    course_id,
-                    course_name,
-                    "-",  # No age for courses
-                    "-",  # No email for courses
-                    f"Instructor: {course_instructor}",
-                    "Edit/Delete"
-                ))
+        search_term = self.search_entry.get()
+        self.view_all_table.set_rows([
+            self.table_values(record_type, record)
+            for record_type, record in self.search_index.search(search_term)
+        ])
 
+    def table_values(self, record_type, record):
+        """
+        Formats a database row as the column values of the "View All" table.
+
+        Args:
+            record_type (str): "Student", "Instructor" or "Course".
+            record (tuple): The row as fetched by refresh_view_all.
+
+        Returns:
+            tuple: Values for the ID, Name, Age, Email, Additional Info and Actions columns.
+        """
+        if record_type == "Course":
+            course_id, course_name, course_instructor = record
+            # No age or email for courses
+            return (course_id, course_name, "-", "-", f"Instructor: {course_instructor}", "Edit/Delete")
+        record_id, name, age, email = record
+        return (record_id, name, age, email, record_type, "Edit/Delete")
+
+    @staticmethod
+    def record_table(record_type):
+        """
+        Maps the record type shown in a table row to its database table.
+
+        Args:
+            record_type (str): The row's type column; course rows show "Instructor: <name>".
+
+        Returns:
+            str: "students", "instructors" or "courses", or None for an unknown type.
+        """
+        if record_type == "Student":
+            return "students"
+        if record_type == "Instructor":
+            return "instructors"
+        if record_type.startswith("Instructor:"):
+            return "courses"
+        return None
 
-    
     def save_data(self):
         """
         Opens a file dialog to save student, instructor, and course data in JSON format.
@@ -733,10 +809,13 @@ class SchoolManagementSystem(tk.Tk):
         """
         Opens a file dialog to load student, instructor, and course data from a JSON file.
 
-        If a valid file path is selected, the data is read from the JSON file and
-        deserialized into the respective attributes. The method inserts the data into
-        the database, updating existing records if they exist. A message box informs the
-        user about the success or failure of the loading process.
+        If a valid file path is selected, the JSON file is streamed record by record
+        and upserted into the database in batches of ``import_batch_size``, updating
+        existing records if they exist, while a progress bar shows how much of the file
+        has been read. The import runs on the database worker. Each batch is committed
+        on its own; if the import fails, loading the same file again offers to resume
+        after the last committed batch. A message box informs the user about the success
+        or failure of the loading process.
         """
         file_path = fd.askopenfilename(
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
@@ -745,101 +824,87 @@ class SchoolManagementSystem(tk.Tk):
         
         if file_path:
             if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    data = json.load(f)
-                    self.students = data.get("students", [])
-                    self.instructors = data.get("instructors", [])
-                    self.courses = data.get("courses", [])
-                    
+                resume_from = bulk_import.pending_checkpoint(file_path)
+                if resume_from and not messagebox.askyesno(
+                        "Load Data", f"A previous import of this file stopped after {resume_from} records. Resume from there?"):
+                    bulk_import.clear_checkpoint(file_path)
+
+                progress_window = tk.Toplevel(self)
+                progress_window.title("Loading Data")
+                progress_label = tk.Label(progress_window, text="Importing...")
+                progress_label.pack(padx=10, pady=5)
+                progress_bar = ttk.Progressbar(progress_window, length=300, maximum=os.path.getsize(file_path) or 1)
+                progress_bar.pack(padx=10, pady=5)
+
+                def show_progress(records_done, bytes_read, total_bytes):
+                    progress_bar["value"] = bytes_read
+                    progress_label.config(text=f"Imported {records_done} records")
+
+                def import_file(conn):
                     try:
-                        conn = self.get_db_connection()
-                        cursor = conn.cursor()
-                        
-                        # Insert students into the database
-                        for student in self.students:
-                            cursor.execute(
-                                "INSERT INTO students (student_id, name, age, email) VALUES (%s, %s, %s, %s) "
-                                "ON DUPLICATE KEY UPDATE name = VALUES(name), age = VALUES(age), email = VALUES(email)",
-                                (student[0], student[1], student[2], student[3])
-                            )
-                        
-                        # Insert instructors into the database
-                        for instructor in self.instructors:
-                            cursor.execute(
-                                "INSERT INTO instructors (instructor_id, name, age, email) VALUES (%s, %s, %s, %s) "
-                                "ON DUPLICATE KEY UPDATE name = VALUES(name), age = VALUES(age), email = VALUES(email)",
-                                (instructor[0], instructor[1], instructor[2], instructor[3])
-                            )
-                        
-                        # Insert courses into the database
-                        for course in self.courses:
-                            cursor.execute(
-                                "INSERT INTO courses (course_id, name, instructor_name) VALUES (%s, %s, %s) "
-                                "ON DUPLICATE KEY UPDATE name = VALUES(name), instructor_name = VALUES(instructor_name)",
-                                (course[0], course[1], course[2])
-                            )
-                        
-                        conn.commit()
-                        self.refresh_view_all()
-                        self.refresh_dropdowns()
-                        messagebox.showinfo("Load Data", f"Data loaded successfully from {file_path} and inserted into the database!")
-                        
-                        self.close_db_connection(conn)
-                    except Error as e:
-                        messagebox.showwarning("Database Error", str(e))
+                        return bulk_import.import_json(
+                            conn, file_path, batch_size=self.import_batch_size, repository=self.repository,
+                            progress=lambda *args: self.db_worker.call_soon(show_progress, *args)
+                        )
+                    finally:
+                        # Batches are committed as they go, even if a later one fails.
+                        self.invalidate_caches()
+
+                def imported(_):
+                    progress_window.destroy()
+                    self.refresh_view_all()
+                    self.refresh_dropdowns()
+                    messagebox.showinfo("Load Data", f"Data loaded successfully from {file_path} and inserted into the database!")
+
+                def import_failed(e):
+                    progress_window.destroy()
+                    if isinstance(e, ValueError):
+                        messagebox.showwarning("Load Data", f"The selected file is not valid data: {e}")
+                    else:
+                        messagebox.showwarning("Database Error", f"{e}\n\nLoad the same file again to resume the import.")
+
+                self.db_worker.submit(import_file, imported, import_failed)
             else:
                 messagebox.showwarning("Load Data", "The selected file does not exist!")
     
+
     def edit_record(self, record_type, record_id):
         """
         Opens an edit dialog for the specified record type and record ID.
 
-        It fetches the record from the database and populates the dialog with its data,
-        allowing the user to make changes. If the record is found, the dialog is opened;
-        otherwise, a warning message is displayed. 
+        It fetches the record from the database on the database worker and populates
+        the dialog with its data, allowing the user to make changes. If the record is
+        found, the dialog is opened; otherwise, a warning message is displayed. 
 
         Args:
             record_type (str): The type of record to edit (e.g., "Student", "Instructor").
             record_id (int): The unique identifier of the record to be edited.
         """
-        conn = self.get_db_connection()
-        if not conn:
-            return
-
-        try:
-            cursor = conn.cursor(dictionary=True)
-
-            record = None
-            if record_type == "Student":
-                cursor.execute("SELECT * FROM students WHERE student_id = %s", (record_id,))
-                record = cursor.fetchone()
-            elif record_type == "Instructor":
-                cursor.execute("SELECT * FROM instructors WHERE instructor_id = %s", (record_id,))
-                record = cursor.fetchone()
-            elif record_type.startswith("Instructor:"):
-                cursor.execute("SELECT * FROM courses WHERE course_id = %s", (record_id,))
-                record = cursor.fetchone()
-
+        def fetch_record(conn):
+            table = self.record_table(record_type)
+            if table is None:
+                return None
+            row = self.repository.get(conn, table, record_id)
+            return dict(zip(self.repository.tables[table].columns, row)) if row else None
+
+        def show_record(record):
             if record:
-                self.open_edit_dialog(record_type, record, conn)
+                self.open_edit_dialog(record_type, record)
             else:
                 messagebox.showwarning("Edit Error", "Record not found!")
-                self.close_db_connection(conn)
-        except Error as e:
-            messagebox.showerror("Database Error", str(e))
-            self.close_db_connection(conn)
 
-    def open_edit_dialog(self, record_type, record, conn):
+        self.db_worker.submit(fetch_record, show_record, lambda e: messagebox.showerror("Database Error", str(e)))
+
+    def open_edit_dialog(self, record_type, record):
         """
         Creates a dialog for editing a record with the specified type and data.
 
         The dialog allows the user to update the name, age, and email fields (if applicable)
-        and save the changes back to the database.
+        and save the changes back to the database on the database worker.
 
         Args:
             record_type (str): The type of record being edited.
             record (dict): The record data to populate the dialog with.
-            conn (Connection): The database connection to perform updates.
         """
         def save_changes():
             new_name = name_entry.get()
@@ -847,26 +912,23 @@ class SchoolManagementSystem(tk.Tk):
                 new_age = age_entry.get()
                 new_email = email_entry.get()
 
-            try:
-                cursor = conn.cursor()
+            def update_record(conn):
                 if record_type == "Student":
-                    cursor.execute("UPDATE students SET name = %s, age = %s, email = %s WHERE student_id = %s",
-                                (new_name, new_age, new_email, record['student_id']))
+                    self.repository.update(conn, "students", record['student_id'],
+                                           {"name": new_name, "age": new_age, "email": new_email})
                 elif record_type == "Instructor":
-                    cursor.execute("UPDATE instructors SET name = %s, age = %s, email = %s WHERE instructor_id = %s",
-                                (new_name, new_age, new_email, record['instructor_id']))
+                    self.repository.update(conn, "instructors", record['instructor_id'],
+                                           {"name": new_name, "age": new_age, "email": new_email})
                 elif record_type.startswith("Instructor:"):
-                    cursor.execute("UPDATE courses SET name = %s WHERE course_id = %s",
-                                (new_name, record['course_id']))
-
+                    self.repository.update(conn, "courses", record['course_id'], {"name": new_name})
                 conn.commit()
+                self.invalidate_caches()
+
+            def record_updated(_):
                 self.refresh_view_all()
                 edit_window.destroy()
-                self.close_db_connection(conn)
-            except Error as e:
-                messagebox.showerror("Database Error", str(e))
-                conn.rollback()
-                self.close_db_connection(conn)
+
+            self.db_worker.submit(update_record, record_updated, lambda e: messagebox.showerror("Database Error", str(e)))
 
         edit_window = tk.Toplevel(self)
         edit_window.title(f"Edit {record_type}")
@@ -893,8 +955,6 @@ class SchoolManagementSystem(tk.Tk):
         self.refresh_dropdowns()
         self.refresh_view_all()
 
-
-
     def backup_database(self):
         """
         Opens a file dialog to specify the location to save a backup of the database.
@@ -923,84 +983,138 @@ class SchoolManagementSystem(tk.Tk):
         """
         Deletes a record of the specified type and ID from the database.
 
-        The method attempts to delete the record and commits the changes. If an error occurs,
-        the transaction is rolled back and an error message is displayed.
+        The method deletes the record on the database worker and commits the changes.
+        If an error occurs, the transaction is rolled back and an error message is displayed.
 
         Args:
             record_type (str): The type of record to delete (e.g., "Student", "Instructor").
             record_id (int): The unique identifier of the record to be deleted.
         """
-        conn = self.get_db_connection()
-        
-        if not conn:
-            return
-
-        try:
-            cursor = conn.cursor()
+        def delete(conn):
+            table = self.record_table(record_type)
+            if table is not None:
+                self.repository.delete(conn, table, record_id)
+            conn.commit()
+            self.invalidate_caches()
 
-            if record_type == "Student":
-                cursor.execute("DELETE FROM students WHERE student_id = %s", (record_id,))
-            elif record_type == "Instructor":
-                cursor.execute("DELETE FROM instructors WHERE instructor_id = %s", (record_id,))
-            elif record_type.startswith("Instructor:"):
-                cursor.execute("DELETE FROM courses WHERE course_id = %s", (record_id,))
+        def refresh(_):
+            self.refresh_view_all()
+            self.refresh_dropdowns()
 
-            conn.commit()
-        except mysql.connector.Error as e:
-            conn.rollback()
+        def delete_failed(e):
+            # The pool rolls back the failed transaction when the connection is returned.
             messagebox.showerror("Delete Error", f"An error occurred: {e}")
-        finally:
-            # Close the connection
-            self.close_db_connection(conn)
-        
-        self.refresh_view_all()
-        self.refresh_dropdowns()
+            refresh(None)
+
+        self.db_worker.submit(delete, refresh, delete_failed)
         
+
     def export_to_csv(self):
         """
         Opens a file dialog to specify the location to save exported data in CSV format.
 
-        The method fetches data from the database for students, instructors, and courses,
-        writing it to the specified CSV file. A message box is displayed to inform the user
-        of the success or failure of the operation.
+        The export runs on the database worker (see write_csv_export) while a progress
+        window with a Cancel button stays responsive. Choosing a ``.gz`` file name writes
+        gzip-compressed CSV. A message box is displayed to inform the user of the success
+        or failure of the operation.
         """
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")]
+        )
         if not file_path:
             return
-        
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
 
-            with open(file_path, "w", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(["ID", "Name", "Age", "Email", "Additional Info", "Type"])
-                
-                # Fetch students from database
-                cursor.execute("SELECT * FROM students")
-                students = cursor.fetchall()
-                for student in students:
-                    writer.writerow([student[0], student[1], student[2], student[3], "Student", ""])
-                
-                # Fetch instructors from database
-                cursor.execute("SELECT * FROM instructors")
-                instructors = cursor.fetchall()
-                for instructor in instructors:
-                    writer.writerow([instructor[0], instructor[1], instructor[2], instructor[3], "Instructor", ""])
-                
-                # Fetch courses from database
-                cursor.execute("SELECT * FROM courses")
-                courses = cursor.fetchall()
-                for course in courses:
-                    writer.writerow([course[0], course[1], "-", "-", f"Instructor: {course[2]}", "Course"])
-            
-            messagebox.showinfo("Export to CSV", "Data exported successfully!")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"An error occurred while exporting data to CSV: {str(e)}")
-        finally:
-            if conn:
-                self.close_db_connection(conn)
+        cancel_event = threading.Event()
+
+        progress_window = tk.Toplevel(self)
+        progress_window.title("Export to CSV")
+        progress_label = tk.Label(progress_window, text="Exporting...")
+        progress_label.pack(padx=10, pady=5)
+        progress_bar = ttk.Progressbar(progress_window, length=300)
+        progress_bar.pack(padx=10, pady=5)
+        tk.Button(progress_window, text="Cancel", command=cancel_event.set).pack(pady=5)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+        def show_progress(done, total):
+            progress_bar["maximum"] = total or 1
+            progress_bar["value"] = done
+            progress_label.config(text=f"Exported {done} of {total} records")
+
+        def export(conn):
+            completed = False
+            try:
+                completed = self.write_csv_export(
+                    conn, file_path, cancel_event,
+                    progress=lambda done, total: self.db_worker.call_soon(show_progress, done, total)
+                )
+                return completed
+            finally:
+                if not completed:
+                    # A cancelled or failed export may leave rows unread; closing the
+                    # connection drops them without streaming the rest of the table.
+                    self.db_pool.discard(conn)
+
+        def exported(completed):
+            progress_window.destroy()
+            if completed:
+                messagebox.showinfo("Export to CSV", "Data exported successfully!")
 
+        def export_failed(e):
+            progress_window.destroy()
+            messagebox.showerror("Export Error", f"An error occurred while exporting data to CSV: {e}")
+
+        self.db_worker.submit(export, exported, export_failed)
+
+    def write_csv_export(self, conn, file_path, cancel_event, progress=None, chunk_size=1000):
+        """
+        Streams students, instructors and courses from the database into a CSV file.
+
+        Runs on a background thread and must not touch any widget. Rows are read with
+        ``Repository.chunks`` from unbuffered cursors, so the server streams them and only
+        one chunk is held in memory, and each chunk is written as soon as it arrives.
+        If ``cancel_event`` is set the partial file is deleted, and ``conn`` is left
+        with unread rows, so it must be discarded rather than reused.
+
+        Args:
+            conn (mysql.connector.connection_cext.CMySQLConnection): The database connection to read from.
+            file_path (str): The CSV file to write; gzip-compressed if it ends with ``.gz``.
+            cancel_event (threading.Event): Set by the GUI to stop the export.
+            progress (callable): Called as ``progress(records_done, total_records)`` after each chunk.
+            chunk_size (int): Number of rows fetched and written at a time.
+
+        Returns:
+            bool: True if the export finished, False if it was cancelled.
+        """
+        tables = [("students", "Student"), ("instructors", "Instructor"), ("courses", "Course")]
+        open_file = gzip.open if file_path.endswith(".gz") else open
+        total = sum(self.repository.count(conn, table) for table, _ in tables)
+
+        done = 0
+        with open_file(file_path, "wt", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["ID", "Name", "Age", "Email", "Additional Info", "Type"])
+
+            for table, record_type in tables:
+                # Closing the chunks on cancel leaves the rest of the rows unread.
+                with closing(self.repository.chunks(conn, table, chunk_size=chunk_size)) as chunks:
+                    for rows in chunks:
+                        if cancel_event.is_set():
+                            break
+                        if record_type == "Course":
+                            writer.writerows([row[0], row[1], "-", "-", f"Instructor: {row[2]}", "Course"] for row in rows)
+                        else:
+                            writer.writerows([row[0], row[1], row[2], row[3], record_type, ""] for row in rows)
+                        done += len(rows)
+                        if progress:
+                            progress(done, total)
+                if cancel_event.is_set():
+                    break
+
+        if cancel_event.is_set():
+            os.remove(file_path)
+            return False
+        return True
 
 # Run the application
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+import codecs
+import json
+import os
+
+# Statement and column count per section of a save_data JSON file. The
+# connector rewrites executemany on these into multi-row INSERTs.
+UPSERT_STATEMENTS = {
+    "students": (
+        "INSERT INTO students (student_id, name, age, email) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE name = VALUES(name), age = VALUES(age), email = VALUES(email)",
+        4,
+    ),
+    "instructors": (
+        "INSERT INTO instructors (instructor_id, name, age, email) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE name = VALUES(name), age = VALUES(age), email = VALUES(email)",
+        4,
+    ),
+    "courses": (
+        "INSERT INTO courses (course_id, name, instructor_name) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE name = VALUES(name), instructor_name = VALUES(instructor_name)",
+        3,
+    ),
+}
+
+
+class JSONRecordReader:
+    """
+    Iterates over a JSON object of arrays, e.g. ``{"students": [...], "courses": [...]}``,
+    yielding ``(section, record)`` pairs without loading the whole file.
+
+    The file is read in binary chunks; only the current chunk and the record
+    being decoded are held in memory.
+
+    Args:
+        file: A file object opened in binary mode.
+        chunk_size (int): Number of bytes read at a time.
+    """
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def __iter__(self):
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            section = self.decode()
+            self.expect(":")
+            self.expect("[")
+            if self.peek() == "]":
+                self.next_char()
+            else:
+                while True:
+                    yield section, self.decode()
+                    if self.next_char() == "]":
+                        break
+            if self.next_char() == "}":
+                return
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError("Unexpected end of JSON data")
+            self.fill()
+
+    def next_char(self):
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, char):
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON data")
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A value ending exactly at the buffer end may be a truncated number.
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            self.fill()
+
+
+def checkpoint_path(file_path):
+    return file_path + ".import-progress"
+
+
+def pending_checkpoint(file_path):
+    """
+    Returns how many records a previous, interrupted import of ``file_path`` committed.
+
+    Args:
+        file_path (str): The JSON file being imported.
+
+    Returns:
+        int: The number of records to skip, or 0 if there is nothing to resume or
+        the file changed since the checkpoint was written.
+    """
+    try:
+        with open(checkpoint_path(file_path)) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    stat = os.stat(file_path)
+    if checkpoint.get("size") != stat.st_size or checkpoint.get("mtime") != stat.st_mtime:
+        return 0
+    return checkpoint.get("committed", 0)
+
+
+def save_checkpoint(file_path, committed):
+    stat = os.stat(file_path)
+    with open(checkpoint_path(file_path), "w") as f:
+        json.dump({"size": stat.st_size, "mtime": stat.st_mtime, "committed": committed}, f)
+
+
+def clear_checkpoint(file_path):
+    try:
+        os.remove(checkpoint_path(file_path))
+    except FileNotFoundError:
+        pass
+
+
+def import_json(connection, file_path, batch_size=1000, progress=None, statements=UPSERT_STATEMENTS,
+                repository=None):
+    """
+    Streams a save_data JSON file into the database in batches.
+
+    Records are grouped into batches of ``batch_size`` per section and written with
+    one ``executemany`` and one commit per batch. After every commit the number of
+    records done is saved next to the file, so if the import fails it resumes after
+    the last committed batch the next time the same file is imported.
+
+    Args:
+        connection: An open DB-API connection.
+        file_path (str): The JSON file to import.
+        batch_size (int): Number of records written per statement and commit.
+        progress (callable): Called as ``progress(records_done, bytes_read, total_bytes)``
+            after each batch.
+        statements (dict): Maps each section name to ``(sql, column_count)``; records in
+            other sections are skipped.
+        repository (Repository): If given, bumps the version of each batch's table
+            before the batch is committed.
+
+    Returns:
+        int: The number of records imported by this call.
+    """
+    skip = pending_checkpoint(file_path)
+    total_bytes = os.path.getsize(file_path)
+    cursor = connection.cursor()
+    position = 0
+    batch = []
+    batch_section = None
+
+    with open(file_path, "rb") as f:
+        reader = JSONRecordReader(f)
+
+        def flush(done):
+            sql, _ = statements[batch_section]
+            cursor.executemany(sql, batch)
+            if repository is not None:
+                repository.bump(connection, batch_section)
+            connection.commit()
+            save_checkpoint(file_path, done)
+            batch.clear()
+            if progress:
+                progress(done, reader.bytes_read, total_bytes)
+
+        for section, record in reader:
+            position += 1
+            if position <= skip or section not in statements:
+                continue
+            if batch and section != batch_section:
+                flush(position - 1)
+            batch_section = section
+            batch.append(tuple(record[:statements[section][1]]))
+            if len(batch) >= batch_size:
+                flush(position)
+        if batch:
+            flush(position)
+
+    clear_checkpoint(file_path)
+    cursor.close()
+    if progress:
+        progress(position, total_bytes, total_bytes)
+    return position - skip
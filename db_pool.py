@@ -0,0 +1,213 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """
+    Raised when no pooled connection becomes free within the pool's timeout.
+    """
+
+
+class MySQLBackend:
+    """
+    Opens and checks MySQL connections for a ConnectionPool.
+
+    Args:
+        **config: Keyword arguments passed to ``mysql.connector.connect``.
+    """
+
+    placeholder = "%s"
+    insert_ignore = "INSERT IGNORE"
+
+    def __init__(self, **config):
+        # Imported here so the pool (and the SQLite backend) can be used on
+        # machines without mysql-connector-python installed.
+        import mysql.connector
+        self.connector = mysql.connector
+        self.config = config
+
+    def connect(self):
+        return self.connector.connect(**self.config)
+
+    def is_alive(self, connection):
+        """
+        Pings the server, reconnecting once if the connection was dropped.
+        """
+        if connection.is_connected():
+            return True
+        try:
+            connection.reconnect(attempts=1, delay=0)
+        except self.connector.Error:
+            return False
+        return connection.is_connected()
+
+    def reset(self, connection):
+        connection.rollback()
+
+    def close(self, connection):
+        try:
+            if connection.unread_result:
+                # Dropped mid-stream (see ConnectionPool.discard): close() would
+                # read off the rest of the rows, shutdown() just closes the socket.
+                connection.shutdown()
+            else:
+                connection.close()
+        except self.connector.Error:
+            pass
+
+
+class SQLiteBackend:
+    """
+    Opens and checks SQLite connections for a ConnectionPool, e.g. to run without a MySQL server.
+
+    Args:
+        path (str): Path of the SQLite database file.
+    """
+
+    placeholder = "?"
+    insert_ignore = "INSERT OR IGNORE"
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        # Pooled connections are handed to whichever thread borrows them; the
+        # pool guarantees only one borrower at a time.
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def is_alive(self, connection):
+        try:
+            connection.execute("SELECT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self, connection):
+        connection.rollback()
+
+    def close(self, connection):
+        connection.close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of database connections shared by the GUI's database methods.
+
+    At most ``size`` connections are borrowed at once; further borrowers wait up to
+    ``timeout`` seconds. Idle connections are health-checked on checkout and replaced
+    if the server dropped them, and any uncommitted work is rolled back when a
+    connection is returned.
+
+    Args:
+        backend: A MySQLBackend, SQLiteBackend or any object with ``connect``,
+            ``is_alive``, ``reset`` and ``close`` methods.
+        size (int): Maximum number of connections open at once.
+        timeout (float): Seconds to wait for a free connection.
+    """
+
+    def __init__(self, backend, size=5, timeout=10.0):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._borrowed = set()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Borrows a healthy connection, opening a new one if none is idle.
+
+        Returns:
+            A backend connection; give it back with :meth:`release`.
+
+        Raises:
+            PoolTimeoutError: If every connection stays borrowed for ``timeout`` seconds.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No database connection became free within {self.timeout} seconds")
+        try:
+            connection = None
+            while connection is None:
+                try:
+                    idle = self._idle.get_nowait()
+                except queue.Empty:
+                    connection = self.backend.connect()
+                    break
+                if self.backend.is_alive(idle):
+                    connection = idle
+                else:
+                    self.backend.close(idle)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._borrowed.add(id(connection))
+        return connection
+
+    def release(self, connection):
+        """
+        Returns a borrowed connection to the pool. Releasing it twice is a no-op.
+
+        Args:
+            connection: A connection obtained from :meth:`acquire`.
+        """
+        with self._lock:
+            if id(connection) not in self._borrowed:
+                return
+            self._borrowed.discard(id(connection))
+        try:
+            self.backend.reset(connection)
+        except Exception:
+            self.backend.close(connection)
+        else:
+            self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def discard(self, connection):
+        """
+        Closes a borrowed connection instead of returning it, freeing its slot.
+
+        For connections left unusable, e.g. by a query whose rows were not all
+        read. Releasing or discarding it afterwards is a no-op.
+
+        Args:
+            connection: A connection obtained from :meth:`acquire`.
+        """
+        with self._lock:
+            if id(connection) not in self._borrowed:
+                return
+            self._borrowed.discard(id(connection))
+        try:
+            self.backend.close(connection)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrows a connection for the duration of a ``with`` block.
+
+        Example:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self):
+        """
+        Closes every idle connection, e.g. when the application exits.
+        """
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.backend.close(connection)
@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = 'school_management_system.db'
+
+# WAL lets readers keep going while a writer commits, and synchronous=NORMAL
+# is durable in WAL mode without an fsync on every commit.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,
+}
+
+
+class DatabaseSession:
+    """
+    Reusable SQLite session shared by the persistence methods.
+
+    Each thread gets its own long-lived connection (sqlite3 connections must not
+    be shared across threads), opened lazily on first use and tuned with
+    ``pragmas``. Writes go through :meth:`transaction`, which can be nested so a
+    batch of saves commits once instead of once per row.
+
+    Args:
+        path (str): Path of the SQLite database file. Set it before the first
+            connection is opened; nothing touches the file until then.
+        pragmas (dict): PRAGMA overrides applied on top of ``DEFAULT_PRAGMAS``.
+        timeout (float): Seconds to wait on a locked database before failing.
+        setup (callable): Called as ``setup(session)`` once, when the first
+            connection is opened, e.g. to create the schema. Other threads
+            opening a connection meanwhile wait for it to finish.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, pragmas=None, timeout=5.0, setup=None):
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.timeout = timeout
+        self.setup = setup
+        self._setup_done = False
+        self._setup_lock = threading.Lock()
+        self._local = threading.local()
+
+    def connection(self):
+        """
+        Returns the calling thread's connection, opening it if needed.
+
+        Returns:
+            sqlite3.Connection: A connection in autocommit mode; transactions are
+            managed explicitly by :meth:`transaction`.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            self._local.conn = conn
+            self._local.depth = 0
+            if not self._setup_done:
+                self._run_setup()
+        return conn
+
+    def _run_setup(self):
+        with self._setup_lock:
+            if self._setup_done:
+                return
+            try:
+                # setup may use the session; this thread's connection is
+                # already open, so that does not come back here.
+                if self.setup is not None:
+                    self.setup(self)
+            except BaseException:
+                self.close()
+                raise
+            self._setup_done = True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the enclosed block in a single transaction and yields a cursor.
+
+        The outermost scope issues BEGIN/COMMIT; nested scopes use savepoints, so
+        an inner failure can be caught without losing the outer batch. Any
+        exception leaving a scope rolls back that scope's changes.
+
+        Example:
+            with session.transaction():
+                for student in students:
+                    student.save_to_db()
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        savepoint = f"sp_{depth}"
+        conn.execute("BEGIN" if depth == 0 else f"SAVEPOINT {savepoint}")
+        self._local.depth = depth + 1
+        try:
+            yield conn.cursor()
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        self._local.depth = depth
+        conn.execute("COMMIT" if depth == 0 else f"RELEASE {savepoint}")
+
+    def close(self):
+        """
+        Closes the calling thread's connection, if one is open.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._local.depth = 0
@@ -0,0 +1,119 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DatabaseWorker:
+    """
+    Runs database jobs on background threads and hands their results back to the Tk thread.
+
+    Each job borrows a connection from ``pool`` on a worker thread. Its result or
+    exception is put on a queue, and the queue is polled with the widget's ``after``
+    while jobs are pending. Callbacks therefore always run on the Tk thread and may
+    touch widgets, but jobs must not.
+
+    Args:
+        widget: Any Tk widget; its ``after`` method schedules the polling.
+        pool (ConnectionPool): Pool the jobs borrow their connections from.
+        workers (int): Number of worker threads; keep it below the pool size so
+            the GUI thread can still borrow a connection.
+        poll_interval (int): Milliseconds between polls of the result queue.
+    """
+
+    def __init__(self, widget, pool, workers=2, poll_interval=50):
+        self.widget = widget
+        self.pool = pool
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-worker")
+        self.results = queue.Queue()
+        self.pending = 0
+        self.polling = False
+        # Jobs submitted while a submit_first job runs, or None.
+        self.held = None
+
+    def submit(self, job, on_success=None, on_error=None):
+        """
+        Runs ``job(connection)`` on a worker thread.
+
+        The connection is returned to the pool when the job finishes; uncommitted
+        work is rolled back, so jobs that write must commit.
+
+        Args:
+            job (callable): Called with a pooled connection on a worker thread.
+            on_success (callable): Called with the job's return value on the Tk thread.
+            on_error (callable): Called with the exception on the Tk thread if the job
+                or the connection checkout fails. Without one, the exception is passed
+                to Tk's ``report_callback_exception``.
+        """
+        if self.held is not None:
+            self.held.append((job, on_success, on_error))
+            return
+        self.pending += 1
+        self.executor.submit(self.run, job, on_success, on_error)
+        if not self.polling:
+            self.polling = True
+            self.widget.after(self.poll_interval, self.poll)
+
+    def submit_first(self, job, on_success=None, on_error=None):
+        """
+        Runs ``job(connection)`` like :meth:`submit`, holding back the jobs submitted after it until it finished.
+
+        For work the other jobs rely on, e.g. a schema migration. The held jobs
+        are submitted once ``job`` succeeded or failed, before its callback runs.
+        """
+        def release():
+            held, self.held = self.held, None
+            for args in held:
+                self.submit(*args)
+
+        def succeeded(result):
+            release()
+            if on_success:
+                on_success(result)
+
+        def failed(error):
+            release()
+            (on_error or self.report_error)(error)
+
+        self.submit(job, succeeded, failed)
+        self.held = []
+
+    def call_soon(self, callback, *args):
+        """
+        Schedules ``callback(*args)`` on the Tk thread. Safe to call from a job, e.g. to report progress.
+        """
+        self.results.put((callback, args, False))
+
+    def run(self, job, on_success, on_error):
+        try:
+            with self.pool.connection() as connection:
+                result = job(connection)
+        except Exception as e:
+            self.results.put((on_error or self.report_error, (e,), True))
+        else:
+            self.results.put((on_success, (result,), True))
+
+    def report_error(self, error):
+        self.widget.report_callback_exception(type(error), error, error.__traceback__)
+
+    def poll(self):
+        try:
+            while True:
+                try:
+                    callback, args, finished = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if finished:
+                    self.pending -= 1
+                if callback:
+                    callback(*args)
+        finally:
+            if self.pending or not self.results.empty():
+                self.widget.after(self.poll_interval, self.poll)
+            else:
+                self.polling = False
+
+    def shutdown(self):
+        """
+        Drops jobs that have not started yet and stops accepting new ones.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
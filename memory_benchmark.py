@@ -0,0 +1,55 @@
+"""
+Measures the memory used per Student by Lab2's slot-based classes.
+
+The baseline is a class with the same attributes stored in an ordinary
+per-instance ``__dict__``, i.e. the layout Lab2 used before ``__slots__``.
+
+Usage:
+    python memory_benchmark.py [count]
+"""
+import sys
+import tracemalloc
+
+from Lab2 import Student
+
+
+class DictStudent:
+    def __init__(self, name, age, email, student_id):
+        self.name = name
+        self.age = age
+        self._email = email
+        self.student_id = student_id
+        self.registry = None
+
+
+def measure(factory, rows):
+    """
+    Creates one object per row and returns the bytes allocated per object.
+
+    Args:
+        factory (callable): Called as ``factory(name, age, email, student_id)``.
+        rows (list): Argument tuples, built beforehand so their strings are not counted.
+
+    Returns:
+        float: Average bytes allocated per object.
+    """
+    tracemalloc.start()
+    objects = [factory(*row) for row in rows]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return allocated / len(rows)
+
+
+def main(count=200_000):
+    rows = [(f"Student {chr(65 + i % 26)}", 20, f"student{i}@example.com", f"S{i}") for i in range(count)]
+    baseline = measure(DictStudent, rows)
+    slotted = measure(Student, rows)
+    print(f"{count} students")
+    print(f"__dict__ instances: {baseline:.1f} bytes each")
+    print(f"__slots__ instances: {slotted:.1f} bytes each")
+    print(f"saved: {baseline - slotted:.1f} bytes each ({1 - slotted / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,271 @@
+"""
+Versioned schema migrations for the school databases.
+
+Each database keeps the versions applied to it in a ``schema_migrations`` table,
+so every migration runs once per database, in version order, whichever program
+opens it first.
+"""
+import logging
+
+from repository import MYSQL_VERSIONED, SQLITE_VERSIONED, Repository, Table
+
+MIGRATIONS_TABLE = {"schema_migrations": Table("schema_migrations", "version", ("version", "name"), order_by="version")}
+
+logger = logging.getLogger(__name__)
+
+
+class Migration:
+    """
+    One schema change: a version number and the statements that make it.
+
+    Args:
+        version (int): Position of the migration; versions are applied in increasing order.
+        name (str): Short description, recorded with the version.
+        statements (list): SQL statements run in order. A ``(statement, done_query)``
+            pair is skipped when ``done_query`` returns a row, for statements
+            that cannot be written to be run twice (see :func:`migrate`).
+        report (tuple): Optional ``(message, query)``; once the statements ran,
+            every row of ``query`` is logged as a warning with ``message``.
+    """
+
+    def __init__(self, version, name, statements, report=None):
+        self.version = version
+        self.name = name
+        self.statements = statements
+        self.report = report
+
+
+def mysql_table_exists(table):
+    return ("SELECT 1 FROM information_schema.tables "
+            f"WHERE table_schema = DATABASE() AND table_name = '{table}'")
+
+
+def mysql_column_exists(table, column):
+    return ("SELECT 1 FROM information_schema.columns "
+            f"WHERE table_schema = DATABASE() AND table_name = '{table}' AND column_name = '{column}'")
+
+
+def mysql_index_exists(table, index):
+    return ("SELECT 1 FROM information_schema.statistics "
+            f"WHERE table_schema = DATABASE() AND table_name = '{table}' AND index_name = '{index}'")
+
+
+def mysql_create_index(index, table, columns):
+    return (f"CREATE INDEX {index} ON {table} ({columns})", mysql_index_exists(table, index))
+
+
+def version_tracking(tables, sqlite=True):
+    """
+    Returns the statements creating ``table_versions`` with one row per tracked table.
+
+    A Repository created with ``versioned`` adds one to a table's version in
+    the same transaction as each of its writes to that table, which
+    versioned_cache.VersionedCache compares to decide whether a cached read is
+    still current. Bumping once per statement instead of from a FOR EACH ROW
+    trigger keeps bulk writes from updating the counter row once per row
+    (under InnoDB, a lock every writer of the table queues on).
+
+    Args:
+        tables (list): Names of the tracked tables.
+        sqlite (bool): True for SQLite, False for MySQL.
+
+    Returns:
+        list: SQL statements.
+    """
+    if sqlite:
+        return [
+            "CREATE TABLE IF NOT EXISTS table_versions (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+            "INSERT OR IGNORE INTO table_versions (table_name) VALUES " + ", ".join(f"('{table}')" for table in tables),
+        ]
+    return [
+        "CREATE TABLE IF NOT EXISTS table_versions (table_name VARCHAR(64) PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0)",
+        "INSERT IGNORE INTO table_versions (table_name) VALUES " + ", ".join(f"('{table}')" for table in tables),
+    ]
+
+
+def drop_version_triggers(tables):
+    """
+    Returns the statements dropping the per-row version triggers of earlier releases.
+
+    Both dialects accept DROP TRIGGER IF EXISTS, so databases created without
+    the triggers are left as they are.
+    """
+    return [f"DROP TRIGGER IF EXISTS {table}_version_{event}"
+            for table in tables for event in ("insert", "update", "delete")]
+
+
+# Done once courses no longer has the course_name column of the layout the
+# shipped school_management.db was created with.
+SQLITE_COURSES_CONVERTED = ("SELECT 1 WHERE NOT EXISTS "
+                            "(SELECT 1 FROM pragma_table_info('courses') WHERE name = 'course_name')")
+
+# pyQt5.py's school_management.db. Migration 0 converts a courses table of the
+# shipped layout, whose instructor_id is an integer, to the one create_database
+# makes; it runs first because the others index courses.name. Lookups by
+# name/email and the courses of an instructor (the edit cascade and the course
+# list join) become index seeks; the courses index also holds every column the
+# courses queries read.
+SQLITE_ROSTER_MIGRATIONS = [
+    Migration(0, "convert courses from the course_name layout", [
+        ("""CREATE TABLE IF NOT EXISTS courses_converted (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                course_id TEXT UNIQUE,
+                instructor_id TEXT,
+                FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
+            )""", SQLITE_COURSES_CONVERTED),
+        # The old instructor_id is meant to be instructors.id, but the shipped
+        # rows hold the instructor's instructor_id; either is converted to the latter.
+        ("""INSERT OR IGNORE INTO courses_converted (id, name, course_id, instructor_id)
+            SELECT courses.id, courses.course_name, courses.course_id,
+                   COALESCE((SELECT instructor_id FROM instructors WHERE id = courses.instructor_id),
+                            CAST(courses.instructor_id AS TEXT))
+            FROM courses""", SQLITE_COURSES_CONVERTED),
+        # An index of the old table would never be rebuilt once it is gone.
+        ("DROP TABLE IF EXISTS courses_fts", SQLITE_COURSES_CONVERTED),
+        ("DROP TABLE courses", SQLITE_COURSES_CONVERTED),
+        ("ALTER TABLE courses_converted RENAME TO courses",
+         "SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'courses_converted')"),
+    ]),
+    Migration(1, "index names and emails", [
+        "CREATE INDEX IF NOT EXISTS students_name ON students (name)",
+        "CREATE INDEX IF NOT EXISTS students_email ON students (email)",
+        "CREATE INDEX IF NOT EXISTS instructors_name ON instructors (name)",
+        "CREATE INDEX IF NOT EXISTS instructors_email ON instructors (email)",
+    ]),
+    Migration(2, "index courses by instructor", [
+        "CREATE INDEX IF NOT EXISTS courses_instructor ON courses (instructor_id, course_id, name)",
+        "CREATE INDEX IF NOT EXISTS courses_name ON courses (name)",
+    ]),
+    Migration(3, "track table versions", version_tracking(SQLITE_VERSIONED)),
+    Migration(4, "bump table versions per statement", drop_version_triggers(SQLITE_VERSIONED)),
+]
+
+# Lab2_Nael.py's school_management_system.db. Emails and ids are UNIQUE, so
+# they are indexed already; Course.instructor_id is the integer Instructor.id.
+LAB2_MIGRATIONS = [
+    Migration(1, "index names and course instructors", [
+        "CREATE INDEX IF NOT EXISTS Person_name ON Person (name)",
+        "CREATE INDEX IF NOT EXISTS Student_name ON Student (name)",
+        "CREATE INDEX IF NOT EXISTS Instructor_name ON Instructor (name)",
+        "CREATE INDEX IF NOT EXISTS Course_instructor ON Course (instructor_id)",
+        "CREATE INDEX IF NOT EXISTS Course_name ON Course (course_name)",
+    ]),
+]
+
+# Part2_GUI.py's MySQL database (tables created as in README.md). MySQL commits
+# every DDL statement as it runs and has no CREATE INDEX IF NOT EXISTS, so the
+# statements that cannot be repeated are skipped when information_schema shows
+# they already ran; a migration that failed part way then completes on retry.
+MYSQL_ROSTER_MIGRATIONS = [
+    Migration(1, "index names", [
+        mysql_create_index("students_name", "students", "name"),
+        mysql_create_index("instructors_name", "instructors", "name"),
+        mysql_create_index("courses_name", "courses", "name"),
+        mysql_create_index("courses_instructor", "courses", "instructor_name, course_id"),
+    ]),
+    Migration(2, "index registration pairs", [
+        mysql_create_index("course_registrations_student", "course_registrations", "student_name, course_name"),
+        mysql_create_index("course_registrations_course", "course_registrations", "course_name, student_name"),
+    ]),
+    # Registrations by name keep their old table; the new one pairs integer
+    # surrogate ids (students.id, courses.id) under a composite primary key.
+    # Names are not unique, so only registrations whose student and course
+    # names each match one row are copied; the others are logged and stay in
+    # course_registrations_by_name.
+    Migration(3, "key registrations by integer ids", [
+        ("RENAME TABLE course_registrations TO course_registrations_by_name",
+         mysql_table_exists("course_registrations_by_name")),
+        ("ALTER TABLE students ADD COLUMN id INT NOT NULL AUTO_INCREMENT UNIQUE",
+         mysql_column_exists("students", "id")),
+        ("ALTER TABLE courses ADD COLUMN id INT NOT NULL AUTO_INCREMENT UNIQUE",
+         mysql_column_exists("courses", "id")),
+        """CREATE TABLE IF NOT EXISTS course_registrations (
+            student_id INT NOT NULL,
+            course_id INT NOT NULL,
+            PRIMARY KEY (course_id, student_id),
+            KEY course_registrations_student (student_id, course_id),
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES courses (id) ON DELETE CASCADE
+        )""",
+        """INSERT IGNORE INTO course_registrations (student_id, course_id)
+            SELECT students.id, courses.id FROM course_registrations_by_name AS registration
+            JOIN students ON students.name = registration.student_name
+            JOIN courses ON courses.name = registration.course_name
+            WHERE registration.student_name IN (SELECT name FROM students GROUP BY name HAVING COUNT(*) = 1)
+              AND registration.course_name IN (SELECT name FROM courses GROUP BY name HAVING COUNT(*) = 1)""",
+    ], report=(
+        "registration not copied, the student or course name is ambiguous",
+        """SELECT registration.student_name, registration.course_name FROM course_registrations_by_name AS registration
+            WHERE registration.student_name IN (SELECT name FROM students GROUP BY name HAVING COUNT(*) > 1)
+               OR registration.course_name IN (SELECT name FROM courses GROUP BY name HAVING COUNT(*) > 1)""",
+    )),
+    Migration(4, "track table versions", version_tracking(MYSQL_VERSIONED, sqlite=False)),
+    Migration(5, "bump table versions per statement", drop_version_triggers(MYSQL_VERSIONED)),
+]
+
+
+def applied_versions(conn, repository):
+    """
+    Returns the versions already applied to the database, creating the version table if needed.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL)"
+        )
+    finally:
+        cursor.close()
+    return set(repository.column(conn, "schema_migrations", "version"))
+
+
+def migrate(conn, migrations, placeholder="?"):
+    """
+    Applies the migrations that were not applied to the database yet.
+
+    A migration's version row is committed after all of its statements ran,
+    but the statements themselves are not rolled back if a later one fails:
+    MySQL commits every DDL statement as it runs, and so does sqlite3 outside
+    a transaction. A failed migration is therefore run again from its first
+    statement by the next call, and each statement must be safe to repeat,
+    either by itself (IF NOT EXISTS, INSERT IGNORE) or by pairing it with a
+    query that detects it already ran (see :class:`Migration`).
+
+    Args:
+        conn: An open sqlite3 or mysql.connector connection.
+        migrations (list): Migration objects, e.g. ``SQLITE_ROSTER_MIGRATIONS``.
+        placeholder (str): The driver's parameter marker, as in Repository.
+
+    Returns:
+        list: The versions applied by this call, in order.
+
+    Example:
+        with sqlite3.connect('school_management.db') as conn:
+            migrate(conn, SQLITE_ROSTER_MIGRATIONS)
+    """
+    repository = Repository(MIGRATIONS_TABLE, placeholder)
+    done = applied_versions(conn, repository)
+    applied = []
+    for migration in sorted(migrations, key=lambda migration: migration.version):
+        if migration.version in done:
+            continue
+        cursor = conn.cursor()
+        try:
+            for statement in migration.statements:
+                if isinstance(statement, tuple):
+                    statement, done_query = statement
+                    cursor.execute(done_query)
+                    if cursor.fetchall():
+                        continue
+                cursor.execute(statement)
+            if migration.report is not None:
+                message, query = migration.report
+                cursor.execute(query)
+                for row in cursor.fetchall():
+                    logger.warning("Migration %s: %s: %s", migration.version, message, row)
+        finally:
+            cursor.close()
+        repository.insert(conn, "schema_migrations", (migration.version, migration.name))
+        conn.commit()
+        applied.append(migration.version)
+    return applied
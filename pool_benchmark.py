@@ -0,0 +1,54 @@
+"""
+Times short queries run on pooled connections against a new connection per query.
+
+Each operation reads one student by id, the typical Part2_GUI.py lookup, from
+a SQLite file through db_pool.SQLiteBackend, so it runs without a MySQL server.
+A MySQL connection costs a network handshake and login on top of what is
+measured here, so the pool saves more there.
+
+Usage:
+    python pool_benchmark.py [count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from db_pool import ConnectionPool, SQLiteBackend
+from repository import MYSQL_ROSTER, Repository
+
+
+def lookups(connect, release, repository, count):
+    start = time.perf_counter()
+    for i in range(count):
+        conn = connect()
+        try:
+            repository.get(conn, "students", f"S{i % 1000}")
+        finally:
+            release(conn)
+    return time.perf_counter() - start
+
+
+def main(count=20_000):
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(os.path.join(directory, "pool_benchmark.db"))
+        repository = Repository.for_backend(backend, MYSQL_ROSTER)
+        conn = backend.connect()
+        conn.execute("CREATE TABLE students (student_id TEXT PRIMARY KEY, name TEXT, age INTEGER, email TEXT)")
+        repository.insert_many(conn, "students", ((f"S{i}", "Student", 20, f"s{i}@example.com") for i in range(1000)))
+        conn.commit()
+        conn.close()
+
+        unpooled = lookups(backend.connect, backend.close, repository, count)
+        pool = ConnectionPool(backend, size=5)
+        pooled = lookups(pool.acquire, pool.release, repository, count)
+        pool.close_all()
+
+    print(f"{count} lookups")
+    print(f"connection per lookup: {unpooled / count * 1e6:.1f} us each")
+    print(f"pooled connection:     {pooled / count * 1e6:.1f} us each")
+    print(f"speedup: {unpooled / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
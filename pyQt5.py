@@ -1,11 +1,517 @@
 import sys
-import pickle
 import csv
+import itertools
 import sqlite3
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QTableWidget, QTableWidgetItem, QFileDialog, QFormLayout, QHBoxLayout, QMessageBox, QDialog, QTableView
+from contextlib import closing
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QFileDialog, QFormLayout, QHBoxLayout, QMessageBox, QDialog, QTableView
 from PyQt5.QtCore import Qt
 from PyQt5 import QtCore
 from Lab2_Nael import Person, Student, Instructor, Course
+from snapshot import SnapshotStore, WriteBehind
+from repository import Repository, SQLITE_ROSTER, SQLITE_VERSIONED
+from migrations import migrate, SQLITE_ROSTER_MIGRATIONS
+
+# Columns covered by each table's FTS5 search index (``<table>_fts``).
+SEARCH_INDEXES = {
+    "students": ("name", "student_id", "email"),
+    "instructors": ("name", "instructor_id", "email"),
+    "courses": ("name", "course_id"),
+}
+
+class RecordTableModel(QtCore.QAbstractTableModel):
+    """
+    Read-only table model that pages students, instructors and courses out of SQLite.
+
+    Rows are fetched ``page_size`` at a time through canFetchMore/fetchMore as the
+    view scrolls, so opening a large database only reads the first page. Pages are
+    read with keyset paging on each table's integer primary key, which is an index
+    seek rather than an OFFSET scan, and only the display text and natural key of
+    fetched rows are kept in memory.
+
+    Attributes:
+        db_path (str): Path of the SQLite database file.
+        page_size (int): Number of rows read per fetchMore call.
+        search_term (str): FTS5 query the rows are filtered by, or None.
+    """
+
+    HEADERS = ["Type", "Name/ID", "Additional Info"]
+
+    # Snapshot table holding each entry of SOURCES, in the same order.
+    SNAPSHOT_TABLES = ["students", "instructors", "courses"]
+
+    # (record type, primary key column, query, search index); students come
+    # first, then instructors, then courses, each in primary key order.
+    SOURCES = [
+        ("Student", "students.id",
+         "SELECT students.id, students.student_id, students.name, students.age, students.email, NULL FROM students",
+         "students_fts"),
+        ("Instructor", "instructors.id",
+         "SELECT instructors.id, instructors.instructor_id, instructors.name, instructors.age, instructors.email, NULL "
+         "FROM instructors",
+         "instructors_fts"),
+        ("Course", "courses.id",
+         "SELECT courses.id, courses.course_id, courses.name, instructors.name, NULL, courses.instructor_id "
+         "FROM courses LEFT JOIN instructors ON courses.instructor_id = instructors.instructor_id",
+         "courses_fts"),
+    ]
+
+    def __init__(self, db_path, page_size=500, parent=None):
+        """
+        Initializes an empty model; rows are fetched once a view asks for them.
+
+        :param db_path: Path of the SQLite database file.
+        :type db_path: str
+        :param page_size: Number of rows read per fetchMore call.
+        :type page_size: int
+        :param parent: Optional Qt parent object.
+        :type parent: QObject
+        :return: None
+        :rtype: None
+        """
+        super().__init__(parent)
+        self.db_path = db_path
+        self.page_size = page_size
+        self.search_term = None
+        self.connection = sqlite3.connect(db_path)
+        self.rows = []
+        self.section_counts = [0] * len(self.SOURCES)
+        self.source = 0
+        self.last_id = 0
+        self.ranked = {}
+        # A search's ranked ids may be delivered by a SearchWorker; until they
+        # arrive for a table, fetching waits instead of ranking on this thread.
+        self.awaiting_ranks = False
+        self.generation = 0
+        # While a snapshot is shown, rows are paged from it instead of SQLite.
+        self.snapshot = None
+        self.snapshot_rows = None
+        self.snapshot_instructors = {}
+
+    @staticmethod
+    def format_row(record_type, key, name, extra, email, instructor_id=None):
+        """
+        Builds a stored row from raw column values.
+
+        :param record_type: "Student", "Instructor" or "Course".
+        :type record_type: str
+        :param key: The student, instructor or course ID.
+        :type key: str
+        :param name: The person or course name.
+        :type name: str
+        :param extra: The age for people, the instructor name for courses.
+        :type extra: int or str
+        :param email: The email for people, unused for courses.
+        :type email: str
+        :param instructor_id: The course's instructor ID, unused for people.
+        :type instructor_id: str
+        :return: (record type, key, Name/ID text, Additional Info text, instructor ID)
+        :rtype: tuple
+        """
+        if record_type == "Course":
+            return (record_type, key, f"{key}, {name}", f"Instructor: {extra or 'Not assigned'}", instructor_id)
+        return (record_type, key, f"{name} ({key})", f"Age: {extra}, Email: {email}", None)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of rows fetched so far.
+        """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of columns (Type, Name/ID, Additional Info).
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the display text of a cell.
+        """
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        return row[0] if index.column() == 0 else row[index.column() + 1]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Returns the horizontal header labels.
+        """
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        """
+        Returns True while some table still has rows that were not fetched.
+        """
+        if parent.isValid() or self.source >= len(self.SOURCES):
+            return False
+        return not (self.search_term and self.awaiting_ranks and self.source not in self.ranked)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """
+        Appends the next page of rows, moving on to the next table when one runs out.
+
+        :param parent: Must be the invalid root index.
+        :type parent: QModelIndex
+        :raises sqlite3.Error: May raise an error if there are issues with database operations.
+        :return: None
+        :rtype: None
+        """
+        while not parent.isValid() and self.source < len(self.SOURCES):
+            section = self.source
+            record_type, id_column, query, search_index = self.SOURCES[section]
+            if self.snapshot_rows is not None:
+                fetched, exhausted = self.fetch_snapshot_page(section, record_type)
+            elif self.search_term:
+                if section not in self.ranked:
+                    if self.awaiting_ranks:
+                        return
+                    self.ranked[section] = self.rank_matches(self.connection, search_index, self.search_term)
+                fetched, exhausted = self.fetch_ranked_page(section, id_column, query)
+            else:
+                sql = f"{query} WHERE {id_column} > ? ORDER BY {id_column} LIMIT ?"
+                fetched = self.connection.execute(sql, (self.last_id, self.page_size)).fetchall()
+                exhausted = len(fetched) < self.page_size
+                if fetched:
+                    self.last_id = fetched[-1][0]
+
+            if exhausted:
+                self.source += 1
+                self.last_id = 0
+                self.ranked.pop(section, None)
+
+            if fetched:
+                start = len(self.rows)
+                self.beginInsertRows(QtCore.QModelIndex(), start, start + len(fetched) - 1)
+                self.rows.extend(self.format_row(record_type, *row[1:]) for row in fetched)
+                self.section_counts[section] += len(fetched)
+                self.endInsertRows()
+                return
+
+    @staticmethod
+    def rank_matches(connection, search_index, search_term):
+        """
+        Returns the ids of every row matching ``search_term``, best match first.
+
+        :param connection: Connection to rank on; SearchWorker passes its own.
+        :type connection: sqlite3.Connection
+        :param search_index: Name of the table's FTS5 index.
+        :type search_index: str
+        :param search_term: FTS5 query built by :meth:`match_query`.
+        :type search_term: str
+        :raises sqlite3.Error: May raise an error if there are issues with database operations.
+        :return: The matching primary keys.
+        :rtype: list
+        """
+        return [rowid for (rowid,) in connection.execute(
+            f"SELECT rowid FROM {search_index} WHERE {search_index} MATCH ? ORDER BY rank",
+            (search_term,))]
+
+    def fetch_ranked_page(self, section, id_column, query):
+        """
+        Reads the next page of search results for the current table, best match first.
+
+        The matching ids are ranked once per table and search; pages only look
+        rows up by id, so scrolling a broad search does not re-rank every match.
+        ``last_id`` is used as the position in the ranked ids while searching.
+
+        :param section: Index of the table in ``SOURCES``.
+        :type section: int
+        :param id_column: The table's primary key column.
+        :type id_column: str
+        :param query: The table's SELECT statement.
+        :type query: str
+        :return: The fetched rows and whether the table has no more matches.
+        :rtype: tuple
+        """
+        ranked_ids = self.ranked[section]
+        page_ids = ranked_ids[self.last_id:self.last_id + self.page_size]
+        self.last_id += len(page_ids)
+        exhausted = self.last_id >= len(ranked_ids)
+        if not page_ids:
+            return [], exhausted
+
+        placeholders = ", ".join("?" * len(page_ids))
+        rows = {row[0]: row for row in self.connection.execute(f"{query} WHERE {id_column} IN ({placeholders})", page_ids)}
+        return [rows[rowid] for rowid in page_ids if rowid in rows], exhausted
+
+    def fetch_snapshot_page(self, section, record_type):
+        """
+        Reads the next page of the current table from the loaded snapshot.
+
+        :param section: Index of the table in ``SOURCES``.
+        :type section: int
+        :param record_type: "Student", "Instructor" or "Course".
+        :type record_type: str
+        :return: The fetched rows, shaped like the ``SOURCES`` queries, and whether the table has no more rows.
+        :rtype: tuple
+        """
+        rows = list(itertools.islice(self.snapshot_rows[section], self.page_size))
+        if record_type == "Course":
+            fetched = [(None, course_id, name, self.snapshot_instructors.get(instructor_id), None, instructor_id)
+                       for course_id, name, instructor_id in rows]
+        else:
+            fetched = [(None, key, name, age, email, None) for key, name, age, email in rows]
+        return fetched, len(rows) < self.page_size
+
+    def reload(self, search_term=None, snapshot=None):
+        """
+        Drops every fetched row and starts paging again from the first table.
+
+        :param search_term: FTS5 query to filter records by (see :meth:`match_query`), or None for all records.
+        :type search_term: str
+        :param snapshot: A snapshot opened by SnapshotStore.load to page rows from instead of SQLite,
+            until the next reload. The model closes it when it is replaced.
+        :type snapshot: snapshot.Snapshot
+        :return: None
+        :rtype: None
+        """
+        self.beginResetModel()
+        if self.snapshot is not None and self.snapshot is not snapshot:
+            self.snapshot.close()
+        self.snapshot = snapshot
+        if snapshot is not None:
+            self.snapshot_rows = [iter(snapshot[table]) for table in self.SNAPSHOT_TABLES]
+            self.snapshot_instructors = {row[0]: row[1] for row in snapshot["instructors"]}
+        else:
+            self.snapshot_rows = None
+            self.snapshot_instructors = {}
+        self.search_term = search_term
+        self.rows = []
+        self.section_counts = [0] * len(self.SOURCES)
+        self.source = 0
+        self.last_id = 0
+        self.ranked = {}
+        self.awaiting_ranks = False
+        self.generation += 1
+        self.endResetModel()
+
+    def begin_search(self, search_term):
+        """
+        Clears the table for a search whose ranked ids will arrive through :meth:`add_ranked_ids`.
+
+        :param search_term: FTS5 query built by :meth:`match_query`.
+        :type search_term: str
+        :return: The generation number results for this search must carry.
+        :rtype: int
+        """
+        self.reload(search_term)
+        self.awaiting_ranks = True
+        return self.generation
+
+    def add_ranked_ids(self, generation, section, ranked_ids):
+        """
+        Receives one table's ranked search matches and shows the first page if it is next in line.
+
+        Results from an older search or reload are ignored.
+
+        :param generation: The generation returned by :meth:`begin_search`.
+        :type generation: int
+        :param section: Index of the table in ``SOURCES``.
+        :type section: int
+        :param ranked_ids: Matching primary keys, best match first.
+        :type ranked_ids: list
+        :return: None
+        :rtype: None
+        """
+        if generation != self.generation:
+            return
+        self.ranked[section] = ranked_ids
+        if section == self.source:
+            self.fetchMore()
+
+    @staticmethod
+    def match_query(text):
+        """
+        Turns free text typed by the user into an FTS5 prefix query.
+
+        Every word must match the start of a token in one of the indexed columns,
+        so "ali sm" finds "Ali Smith" and "s10" finds student "s1024".
+
+        :param text: The text typed into the search box.
+        :type text: str
+        :return: The MATCH expression, or None if the text has no words.
+        :rtype: str
+        """
+        words = text.split()
+        if not words:
+            return None
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def record_at(self, row_position):
+        """
+        Returns the record type and ID shown in a row.
+
+        :param row_position: Index of a fetched row.
+        :type row_position: int
+        :return: (record type, student/instructor/course ID)
+        :rtype: tuple
+        """
+        row = self.rows[row_position]
+        return row[0], row[1]
+
+    def section_of(self, record_type):
+        """
+        Returns the index of the table a record type is paged from.
+        """
+        return [source[0] for source in self.SOURCES].index(record_type)
+
+    def insert_record(self, record_type, key, name, extra, email, instructor_id=None):
+        """
+        Shows a newly inserted record without refetching the table.
+
+        New records have the highest primary key in their table, so they belong at
+        the end of their section. If that section has not been fully fetched yet
+        the record will arrive with a later page: from SQLite as is, and from a
+        shown snapshot, which does not hold it, by queueing it after the
+        snapshot's rows.
+
+        While a search is shown the search is reloaded, which starts a new
+        generation so ranked ids still arriving for the old one are ignored, and
+        ranks on this thread; MainWindow.show_new_record searches again on a
+        SearchWorker instead.
+
+        :return: None
+        :rtype: None
+        """
+        if self.search_term:
+            self.reload(self.search_term)
+            return
+        section = self.section_of(record_type)
+        if self.snapshot_rows is not None:
+            if record_type == "Instructor":
+                self.snapshot_instructors[key] = name
+            if section >= self.source:
+                row = (key, name, instructor_id) if record_type == "Course" else (key, name, extra, email)
+                self.snapshot_rows[section] = itertools.chain(self.snapshot_rows[section], [row])
+                return
+        elif section >= self.source:
+            return
+        row_position = sum(self.section_counts[:section + 1])
+        self.beginInsertRows(QtCore.QModelIndex(), row_position, row_position)
+        self.rows.insert(row_position, self.format_row(record_type, key, name, extra, email, instructor_id))
+        self.section_counts[section] += 1
+        self.endInsertRows()
+
+    def update_record(self, row_position, key, name, extra, email, instructor_id=None):
+        """
+        Replaces the contents of one row after its record was edited.
+
+        :return: None
+        :rtype: None
+        """
+        record_type = self.rows[row_position][0]
+        self.rows[row_position] = self.format_row(record_type, key, name, extra, email, instructor_id)
+        self.dataChanged.emit(self.index(row_position, 0), self.index(row_position, len(self.HEADERS) - 1))
+
+    def remove_record(self, row_position):
+        """
+        Removes one row after its record was deleted.
+
+        :return: None
+        :rtype: None
+        """
+        self.beginRemoveRows(QtCore.QModelIndex(), row_position, row_position)
+        record_type = self.rows.pop(row_position)[0]
+        self.section_counts[self.section_of(record_type)] -= 1
+        self.endRemoveRows()
+
+    def relabel_instructor(self, instructor_id, instructor_name, new_instructor_id=None):
+        """
+        Updates the instructor shown on every fetched course taught by ``instructor_id``.
+
+        :param instructor_id: The instructor ID stored on the affected courses.
+        :type instructor_id: str
+        :param instructor_name: The name to show, or None if the instructor was deleted.
+        :type instructor_name: str
+        :param new_instructor_id: The instructor's new ID if it was changed.
+        :type new_instructor_id: str
+        :return: None
+        :rtype: None
+        """
+        first_course_row = sum(self.section_counts[:self.section_of("Course")])
+        for row_position in range(first_course_row, len(self.rows)):
+            record_type, key, name_cell, _, course_instructor_id = self.rows[row_position]
+            if course_instructor_id == instructor_id:
+                name = name_cell[len(key) + 2:]
+                self.update_record(row_position, key, name, instructor_name, None,
+                                   new_instructor_id or instructor_id)
+
+
+class SearchSignals(QtCore.QObject):
+    """
+    Signals emitted by a SearchWorker, since a QRunnable cannot emit signals itself.
+    """
+
+    ranked = QtCore.pyqtSignal(int, int, list)
+    failed = QtCore.pyqtSignal(int, str)
+
+
+class SearchWorker(QtCore.QRunnable):
+    """
+    Ranks full-text search matches for every table on a QThreadPool thread.
+
+    Each table's ranked ids are emitted as soon as they are ready, tagged with the
+    model generation of the search, so the GUI thread only pages rows in by id.
+    A stale search is stopped with :meth:`cancel`, which also interrupts the
+    statement currently running.
+
+    Attributes:
+        db_path (str): Path of the SQLite database file.
+        search_term (str): FTS5 query built by RecordTableModel.match_query.
+        generation (int): Model generation returned by RecordTableModel.begin_search.
+        signals (SearchSignals): Emits ``ranked`` per table, or ``failed`` on a database error.
+    """
+
+    def __init__(self, db_path, search_term, generation):
+        super().__init__()
+        self.db_path = db_path
+        self.search_term = search_term
+        self.generation = generation
+        self.signals = SearchSignals()
+        self.cancelled = False
+        self.connection = None
+
+    def cancel(self):
+        """
+        Stops the search; no further signals are emitted.
+
+        :return: None
+        :rtype: None
+        """
+        self.cancelled = True
+        connection = self.connection
+        if connection is not None:
+            try:
+                connection.interrupt()
+            except sqlite3.ProgrammingError:
+                pass
+
+    def run(self):
+        """
+        Ranks the matches of each table in turn, emitting them as they complete.
+
+        :return: None
+        :rtype: None
+        """
+        connection = sqlite3.connect(self.db_path)
+        self.connection = connection
+        try:
+            for section, (_, _, _, search_index) in enumerate(RecordTableModel.SOURCES):
+                if self.cancelled:
+                    return
+                ranked_ids = RecordTableModel.rank_matches(connection, search_index, self.search_term)
+                if self.cancelled:
+                    return
+                self.signals.ranked.emit(self.generation, section, ranked_ids)
+        except sqlite3.Error as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.generation, str(e))
+        finally:
+            self.connection = None
+            connection.close()
+
 
 class MainWindow(QMainWindow):
     """
@@ -16,11 +522,17 @@ class MainWindow(QMainWindow):
     editing, deleting, searching, and displaying records, as well as exporting data to CSV files.
 
     Attributes:
-        students (list): List of Student objects.
-        instructors (list): List of Instructor objects.
-        courses (list): List of Course objects.
+        instructors (list): List of all Instructor objects, used by the instructor dropdown.
+        model (RecordTableModel): Paged model behind the main table.
+        store (SnapshotStore): Snapshot of the records, tracking the rows changed since its last save.
+        writer (WriteBehind): Saves the changed rows to the snapshot in the background.
+        repository (Repository): Builds the SQL for reading and writing records.
     """
 
+    # Seconds between background saves of the snapshot, and the longest closing waits for the last one.
+    SAVE_INTERVAL = 10.0
+    CLOSE_TIMEOUT = 2.0
+
     def __init__(self):
         """
         Initializes the MainWindow, sets up the UI, and creates the database.
@@ -35,12 +547,14 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("School Management System")
         self.setGeometry(100, 100, 800, 600)
 
-        self.students = []
         self.instructors = []
-        self.courses = []
+        self.search_worker = None
+        self.store = SnapshotStore('school_management.snap')
+        self.repository = Repository(SQLITE_ROSTER, versioned=SQLITE_VERSIONED)
 
-        self.initUI()
         self.create_database()
+        self.writer = WriteBehind(self.store, self.read_tables, self.SAVE_INTERVAL)
+        self.initUI()
         self.update_table()
 
     def initUI(self):
@@ -100,6 +614,11 @@ class MainWindow(QMainWindow):
 
         search_layout = QHBoxLayout()
         self.search_entry = QLineEdit()
+        self.search_entry.textChanged.connect(self.schedule_search)
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.search_records)
         search_button = QPushButton("Search")
         search_button.clicked.connect(self.search_records)
         search_layout.addWidget(QLabel("Search by Name/ID/Course"))
@@ -107,9 +626,11 @@ class MainWindow(QMainWindow):
         search_layout.addWidget(search_button)
         layout.addLayout(search_layout)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Type", "Name/ID", "Additional Info"])
+        self.model = RecordTableModel('school_management.db', parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
 
         action_buttons = QHBoxLayout()
@@ -144,6 +665,10 @@ class MainWindow(QMainWindow):
         """
         Creates the SQLite database and tables for students, instructors, and courses.
 
+        Indexes and other later schema changes are applied by :func:`migrations.migrate`.
+        A search index that cannot be built is dropped and reported, and the window
+        opens without it.
+
         :param None: This method does not take any parameters.
         :type None: None
         :raises sqlite3.Error: May raise an error if there are issues with database operations.
@@ -179,13 +704,98 @@ class MainWindow(QMainWindow):
                     FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
                 )
             ''')
+            # Migrations come first: they may convert the tables the search
+            # indexes are built over.
+            migrate(conn, SQLITE_ROSTER_MIGRATIONS)
+            failed = []
+            for table, columns in SEARCH_INDEXES.items():
+                try:
+                    self.create_search_index(cursor, table, columns)
+                except sqlite3.Error as e:
+                    # Searching the table then reports an error; everything else still works.
+                    self.drop_search_index(cursor, table)
+                    failed.append(f"{table}: {e}")
             conn.commit()
+        if failed:
+            QMessageBox.warning(self, "Search Error", "Search is unavailable for " + "; ".join(failed))
+
+
+    def create_search_index(self, cursor, table, columns):
+        """
+        Creates the FTS5 index over ``columns`` of ``table`` and the triggers that keep it in sync.
+
+        The index is an external-content table keyed by the table's ``id``, so it
+        stores only the search terms. It is built from existing rows the first time
+        it is created.
+
+        :param cursor: Cursor of the open database connection.
+        :type cursor: sqlite3.Cursor
+        :param table: Name of the indexed table.
+        :type table: str
+        :param columns: Names of the indexed columns.
+        :type columns: tuple
+        :raises sqlite3.Error: May raise an error if SQLite was built without FTS5.
+        :return: None
+        :rtype: None
+        """
+        index = f"{table}_fts"
+        column_list = ", ".join(columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (index,)).fetchone()
+
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {index}
+            USING fts5({column_list}, content='{table}', content_rowid='id', prefix='2 3')
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {index} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {index} ({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {index} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        if not exists:
+            cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+
+    def drop_search_index(self, cursor, table):
+        """
+        Drops the FTS5 index of ``table`` and its triggers, e.g. after building it failed.
+
+        Without the triggers, writes to the table no longer depend on the index.
+
+        :param cursor: Cursor of the open database connection.
+        :type cursor: sqlite3.Cursor
+        :param table: Name of the indexed table.
+        :type table: str
+        :return: None
+        :rtype: None
+        """
+        index = f"{table}_fts"
+        for event in ("insert", "delete", "update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {index}_{event}")
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS {index}")
+        except sqlite3.Error:
+            # An FTS5 table cannot be dropped without the FTS5 module; unused, it does no harm.
+            pass
 
 
     def update_table(self):
         """
-        Updates the table in the UI to reflect the current state of the database,
-        loading students, instructors, and courses from the database.
+        Updates the table in the UI to reflect the current state of the database.
+
+        The table model is reset so it pages records in again from the first one,
+        and the instructor list behind the dropdown is reloaded.
 
         :param None: This method does not take any parameters.
         :type None: None
@@ -193,51 +803,32 @@ class MainWindow(QMainWindow):
         :return: None
         :rtype: None
         """
-        self.table.setRowCount(0)
-        self.students.clear()
+        self.model.reload()
         self.instructors.clear()
-        self.courses.clear()
 
         with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM students")
-            for row in cursor.fetchall():
-                student = Student(row[1], row[2], row[3], row[4])
-                self.students.append(student)
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Student"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f"{student.name} ({student.student_id})"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Age: {student.age}, Email: {student.getEmail()}"))
-
-            cursor.execute("SELECT * FROM instructors")
-            for row in cursor.fetchall():
-                instructor = Instructor(row[1], row[2], row[3], row[4])
-                self.instructors.append(instructor)
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Instructor"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f"{instructor.name} ({instructor.instructor_id})"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Age: {instructor.age}, Email: {instructor.getEmail()}"))
-
-            cursor.execute("""
-                SELECT courses.*, instructors.name AS instructor_name 
-                FROM courses 
-                LEFT JOIN instructors ON courses.instructor_id = instructors.instructor_id
-            """)
-            for row in cursor.fetchall():
-                course = Course(row[2], row[1], None)  # Assuming Course constructor takes (course_id, name, instructor)
-                self.courses.append(course)
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Course"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f" {course.course_id} ,{course.course_name}"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Instructor: {row[4] or 'Not assigned'}"))
+            rows = self.repository.all(conn, "instructors")
+        for instructor_id, name, age, email in rows:
+            self.instructors.append(Instructor(name, age, email, instructor_id))
 
         self.instructor_dropdown.clear()
         for instructor in self.instructors:
-            self.instructor_dropdown.addItem(instructor.name)
+            self.instructor_dropdown.addItem(instructor.name, instructor.instructor_id)
+
+
+    def find_instructor(self, instructor_id):
+        """
+        Returns the index of an instructor in ``self.instructors`` and the dropdown.
+
+        :param instructor_id: The instructor ID to look for.
+        :type instructor_id: str
+        :return: The index, or -1 if no instructor has that ID.
+        :rtype: int
+        """
+        for index, instructor in enumerate(self.instructors):
+            if instructor.instructor_id == instructor_id:
+                return index
+        return -1
 
 
     def add_student(self):
@@ -271,15 +862,14 @@ class MainWindow(QMainWindow):
             return
 
         student = Student(name, age, email, student_id)
-        self.students.append(student)
 
+        row = (student.student_id, student.name, student.age, student.getEmail())
         with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO students (name, age, email, student_id) VALUES (?, ?, ?, ?)", 
-                        (student.name, student.age, student.email, student.student_id))
+            self.repository.insert(conn, "students", row)
             conn.commit()
 
-        self.update_table()
+        self.store.mark("students", row)
+        self.show_new_record("Student", student.student_id, student.name, student.age, student.getEmail())
 
 
     def add_instructor(self):
@@ -313,15 +903,16 @@ class MainWindow(QMainWindow):
             return
 
         instructor = Instructor(name, age, email, instructor_id)
-        self.instructors.append(instructor)
 
+        row = (instructor.instructor_id, instructor.name, instructor.age, instructor.getEmail())
         with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO instructors (name, age, email, instructor_id) VALUES (?, ?, ?, ?)", 
-                        (instructor.name, instructor.age, instructor.email, instructor.instructor_id))
+            self.repository.insert(conn, "instructors", row)
             conn.commit()
 
-        self.update_table()
+        self.store.mark("instructors", row)
+        self.show_new_record("Instructor", instructor.instructor_id, instructor.name, instructor.age, instructor.getEmail())
+        self.instructors.append(instructor)
+        self.instructor_dropdown.addItem(instructor.name, instructor.instructor_id)
 
 
     def add_course(self):
@@ -341,19 +932,40 @@ class MainWindow(QMainWindow):
         """
         course_id = self.course_id_entry.text()
         name = self.course_name_entry.text()
-        instructor_id = self.instructor_dropdown.currentText()  
+        instructor_name = self.instructor_dropdown.currentText()
+        instructor_id = self.instructor_dropdown.currentData()
 
         if not course_id or not name:
             QMessageBox.warning(self, "Input Error", "Course ID and Name must be filled out.")
             return
 
+        row = (course_id, name, instructor_id)
         with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO courses (course_id, name, instructor_id) VALUES (?, ?, ?)", 
-                        (course_id, name, instructor_id))
+            self.repository.insert(conn, "courses", row)
             conn.commit()
 
-        self.update_table()
+        self.store.mark("courses", row)
+        self.show_new_record("Course", course_id, name, instructor_name or None, None, instructor_id)
+
+
+    def show_new_record(self, record_type, key, name, extra, email, instructor_id=None):
+        """
+        Shows a record just added to the database.
+
+        Without a search the model places the row itself. While a search is
+        shown, the search is run again instead, so the running SearchWorker is
+        cancelled and the new ranking is done on the thread pool rather than
+        on this thread.
+
+        :param record_type: "Student", "Instructor" or "Course".
+        :type record_type: str
+        :return: None
+        :rtype: None
+        """
+        if self.model.search_term:
+            self.search_records()
+            return
+        self.model.insert_record(record_type, key, name, extra, email, instructor_id)
 
 
     def search_records(self):
@@ -361,9 +973,11 @@ class MainWindow(QMainWindow):
         Searches for records in the database based on the input and updates the table.
 
         This method retrieves the search term from the user interface and filters 
-        records for students, instructors, and courses based on the provided term. 
-        The search is case-insensitive and updates the displayed table to show 
-        matching records.
+        records for students, instructors, and courses through their full-text 
+        indexes. Each word matches the start of a name, ID, email or course name, 
+        case-insensitively, and the best matches are shown first. Matches are 
+        ranked by a SearchWorker in the thread pool and stream into the table as 
+        each table finishes; any search still running is cancelled.
 
         :param None: This method does not take any parameters.
         :type None: None
@@ -371,45 +985,51 @@ class MainWindow(QMainWindow):
         :return: None
         :rtype: None
         """
-        search_term = self.search_entry.text().lower()
-        self.table.setRowCount(0)
+        self.search_timer.stop()
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
+
+        search_term = RecordTableModel.match_query(self.search_entry.text())
+        if search_term is None:
+            self.model.reload()
+            return
 
-        with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
+        generation = self.model.begin_search(search_term)
+        self.search_worker = SearchWorker('school_management.db', search_term, generation)
+        self.search_worker.signals.ranked.connect(self.model.add_ranked_ids)
+        self.search_worker.signals.failed.connect(self.search_failed)
+        QtCore.QThreadPool.globalInstance().start(self.search_worker)
+
+
+    def schedule_search(self, text):
+        """
+        Restarts the search debounce timer whenever the search text changes.
+
+        The search runs once typing pauses for the timer interval, instead of
+        on every keystroke.
+
+        :param text: The new search text.
+        :type text: str
+        :return: None
+        :rtype: None
+        """
+        self.search_timer.start()
 
-            cursor.execute("SELECT * FROM students WHERE LOWER(name) LIKE ? OR LOWER(student_id) LIKE ?", 
-                        (f"%{search_term}%", f"%{search_term}%"))
-            for row in cursor.fetchall():
-                student = Student(row[1], row[2], row[3], row[4])
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Student"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f"{student.name} ({student.student_id})"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Age: {student.age}, Email: {student.getEmail()}"))
-
-            cursor.execute("SELECT * FROM instructors WHERE LOWER(name) LIKE ? OR LOWER(instructor_id) LIKE ?", 
-                        (f"%{search_term}%", f"%{search_term}%"))
-            for row in cursor.fetchall():
-                instructor = Instructor(row[1], row[2], row[3], row[4])
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Instructor"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f"{instructor.name} ({instructor.instructor_id})"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Age: {instructor.age}, Email: {instructor.getEmail()}"))
-
-            cursor.execute(""" 
-                SELECT courses.*, instructors.name AS instructor_name 
-                FROM courses 
-                LEFT JOIN instructors ON courses.instructor_id = instructors.instructor_id
-                WHERE LOWER(courses.name) LIKE ? OR LOWER(courses.course_id) LIKE ?
-            """, (f"%{search_term}%", f"%{search_term}%"))
-            for row in cursor.fetchall():
-                course = Course(row[2], row[1], None)
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                self.table.setItem(row_position, 0, QTableWidgetItem("Course"))
-                self.table.setItem(row_position, 1, QTableWidgetItem(f"{course.course_id}, {course.course_name}"))
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"Instructor: {row[4] or 'Not assigned'}"))
+
+    def search_failed(self, generation, message):
+        """
+        Reports a database error raised while searching, unless a newer search replaced it.
+
+        :param generation: The generation of the failed search.
+        :type generation: int
+        :param message: The error message.
+        :type message: str
+        :return: None
+        :rtype: None
+        """
+        if generation == self.model.generation:
+            QMessageBox.warning(self, "Search Error", f"An error occurred while searching: {message}")
 
 
     def delete_selected(self):
@@ -427,32 +1047,25 @@ class MainWindow(QMainWindow):
         :return: None
         :rtype: None
         """
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "Selection Error", "No record selected.")
             return
 
-        record_type = self.table.item(current_row, 0).text()
-        if record_type == "Student":
-            student_id = self.students[current_row].student_id
-            with sqlite3.connect('school_management.db') as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
-                conn.commit()
-        elif record_type == "Instructor":
-            instructor_id = self.instructors[current_row].instructor_id
-            with sqlite3.connect('school_management.db') as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM instructors WHERE instructor_id = ?", (instructor_id,))
-                conn.commit()
-        elif record_type == "Course":
-            course_id = self.courses[current_row].course_id
-            with sqlite3.connect('school_management.db') as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
-                conn.commit()
+        record_type, record_id = self.model.record_at(current_row)
+        table = RecordTableModel.SNAPSHOT_TABLES[self.model.section_of(record_type)]
+        with sqlite3.connect('school_management.db') as conn:
+            self.repository.delete(conn, table, record_id)
+            conn.commit()
+        self.store.mark_deleted(table, record_id)
 
-        self.update_table()
+        self.model.remove_record(current_row)
+        if record_type == "Instructor":
+            index = self.find_instructor(record_id)
+            if index >= 0:
+                del self.instructors[index]
+                self.instructor_dropdown.removeItem(index)
+            self.model.relabel_instructor(record_id, None)
 
     def edit_selected(self):
         """
@@ -461,7 +1074,8 @@ class MainWindow(QMainWindow):
         This method retrieves the currently selected row in the UI table, 
         determines the type of record (student, instructor, or course), 
         and allows the user to edit the details of the selected record. 
-        If no record is selected, a warning message is displayed.
+        If no record is selected, or the selected record no longer exists,
+        a warning message is displayed.
 
         :param None: This method does not take any parameters.
         :type None: None
@@ -469,88 +1083,151 @@ class MainWindow(QMainWindow):
         :return: None
         :rtype: None
         """
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         if current_row < 0:
             QMessageBox.warning(self, "Selection Error", "No record selected.")
             return
 
-        record_type = self.table.item(current_row, 0).text()
+        record_type, record_id = self.model.record_at(current_row)
 
         if record_type == "Student":
-            student = self.students[current_row]
+            with sqlite3.connect('school_management.db') as conn:
+                row = self.repository.get(conn, "students", record_id)
+            if row is None:
+                QMessageBox.warning(self, "Selection Error", f"Student {record_id} no longer exists.")
+                return
+            student_id, name, age, email = row
+            student = Student(name, age, email, student_id)
             self.student_name_entry.setText(student.name)
             self.student_age_entry.setText(str(student.age))
-            self.student_email_entry.setText(student.email)
+            self.student_email_entry.setText(student.getEmail())
             self.student_id_entry.setText(student.student_id)
 
             if QMessageBox.question(self, "Edit Student", "Do you want to save changes?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
                 student.name = self.student_name_entry.text()
                 student.age = int(self.student_age_entry.text())
-                student.email = self.student_email_entry.text()
+                student.setEmail(self.student_email_entry.text())
                 student.student_id = self.student_id_entry.text()
 
                 with sqlite3.connect('school_management.db') as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE students 
-                        SET name = ?, age = ?, email = ?, student_id = ? 
-                        WHERE student_id = ?
-                    """, (student.name, student.age, student.email, student.student_id, student.student_id))
+                    self.repository.update(conn, "students", record_id, {
+                        "name": student.name, "age": student.age, "email": student.getEmail(), "student_id": student.student_id,
+                    })
                     conn.commit()
 
+                if student.student_id != record_id:
+                    self.store.mark_deleted("students", record_id)
+                self.store.mark("students", (student.student_id, student.name, student.age, student.getEmail()))
+
+                self.model.update_record(current_row, student.student_id, student.name, student.age, student.getEmail())
+
         elif record_type == "Instructor":
-            instructor = self.instructors[current_row]
+            index = self.find_instructor(record_id)
+            if index < 0:
+                QMessageBox.warning(self, "Selection Error", f"Instructor {record_id} no longer exists.")
+                return
+            instructor = self.instructors[index]
             self.instructor_name_entry.setText(instructor.name)
             self.instructor_age_entry.setText(str(instructor.age))
-            self.instructor_email_entry.setText(instructor.email)
+            self.instructor_email_entry.setText(instructor.getEmail())
             self.instructor_id_entry.setText(instructor.instructor_id)
 
             if QMessageBox.question(self, "Edit Instructor", "Do you want to save changes?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
                 instructor.name = self.instructor_name_entry.text()
                 instructor.age = int(self.instructor_age_entry.text())
-                instructor.email = self.instructor_email_entry.text()
+                instructor.setEmail(self.instructor_email_entry.text())
                 instructor.instructor_id = self.instructor_id_entry.text()
 
                 with sqlite3.connect('school_management.db') as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE instructors 
-                        SET name = ?, age = ?, email = ?, instructor_id = ? 
-                        WHERE instructor_id = ?
-                    """, (instructor.name, instructor.age, instructor.email, instructor.instructor_id, instructor.instructor_id))
+                    self.repository.update(conn, "instructors", record_id, {
+                        "name": instructor.name, "age": instructor.age, "email": instructor.getEmail(),
+                        "instructor_id": instructor.instructor_id,
+                    })
+                    self.repository.update(conn, "courses", record_id, {"instructor_id": instructor.instructor_id},
+                                           where="instructor_id")
                     conn.commit()
+                    if instructor.instructor_id != record_id:
+                        # The courses now point at the new id, so they changed too.
+                        for course_row in self.repository.find(conn, "courses", "instructor_id", instructor.instructor_id):
+                            self.store.mark("courses", course_row)
 
-        elif record_type == "Course":
-            course = self.courses[current_row]
-            self.course_id_entry.setText(course.course_id)
-            self.course_name_entry.setText(course.course_name)
+                if instructor.instructor_id != record_id:
+                    self.store.mark_deleted("instructors", record_id)
+                self.store.mark("instructors", (instructor.instructor_id, instructor.name, instructor.age, instructor.getEmail()))
 
-            self.instructor_dropdown.setCurrentText(course.instructor_id)
+                self.model.update_record(current_row, instructor.instructor_id, instructor.name, instructor.age, instructor.getEmail())
+                self.instructor_dropdown.setItemText(index, instructor.name)
+                self.instructor_dropdown.setItemData(index, instructor.instructor_id)
+                self.model.relabel_instructor(record_id, instructor.name, instructor.instructor_id)
+
+        elif record_type == "Course":
+            with sqlite3.connect('school_management.db') as conn:
+                row = self.repository.get(conn, "courses", record_id)
+            if row is None:
+                QMessageBox.warning(self, "Selection Error", f"Course {record_id} no longer exists.")
+                return
+            _, course_name, course_instructor_id = row
+            self.course_id_entry.setText(record_id)
+            self.course_name_entry.setText(course_name)
+            self.instructor_dropdown.setCurrentIndex(self.find_instructor(course_instructor_id))
 
             if QMessageBox.question(self, "Edit Course", "Do you want to save changes?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
-                course.course_id = self.course_id_entry.text()
-                course.course_name = self.course_name_entry.text()
-                instructor_id = self.instructor_dropdown.currentText() 
+                course = Course(self.course_id_entry.text(), self.course_name_entry.text(), None)
+                instructor_name = self.instructor_dropdown.currentText() or None
+                instructor_id = self.instructor_dropdown.currentData()
 
                 with sqlite3.connect('school_management.db') as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE courses 
-                        SET course_id = ?, name = ?, instructor_id = ? 
-                        WHERE course_id = ?
-                    """, (course.course_id, course.course_name, instructor_id, course.course_id))
+                    self.repository.update(conn, "courses", record_id, {
+                        "course_id": course.course_id, "name": course.course_name, "instructor_id": instructor_id,
+                    })
                     conn.commit()
 
-        self.update_table()  
+                if course.course_id != record_id:
+                    self.store.mark_deleted("courses", record_id)
+                self.store.mark("courses", (course.course_id, course.course_name, instructor_id))
+
+                self.model.update_record(current_row, course.course_id, course.course_name, instructor_name, None, instructor_id)
+
+
+    def read_tables(self):
+        """
+        Reads every student, instructor and course, for writing a full snapshot.
+
+        Called by the snapshot writer on its own thread, so the rows are read on
+        connections of its own (see :meth:`table_rows`).
+
+        :return: The rows of each table, in the column order of ``snapshot.ROSTER_COLUMNS``.
+        :rtype: dict
+        """
+        return {table: self.table_rows(table) for table in RecordTableModel.SNAPSHOT_TABLES}
 
+    def table_rows(self, table):
+        """
+        Yields every row of a table, a chunk at a time.
+
+        The connection is opened when the first row is read and closed once the
+        rows are exhausted or the generator is closed.
+
+        :param table: Name of the table in ``SQLITE_ROSTER``.
+        :type table: str
+        :return: The table's rows.
+        :rtype: generator
+        """
+        with closing(sqlite3.connect('school_management.db')) as conn:
+            for rows in self.repository.chunks(conn, table):
+                yield from rows
 
     def save_data(self):
         """
-        Saves the current data of students and instructors to pickle files.
+        Saves students, instructors and courses to the snapshot file now.
 
-        This method serializes the lists of students and instructors into
-        their respective pickle files. If any errors occur during the 
-        file operation, an error message will be displayed.
+        Changes are saved in the background every ``SAVE_INTERVAL`` seconds
+        anyway; this saves the rows changed since then without waiting. The
+        first save writes every row to a binary snapshot. Later saves append
+        only the rows added, edited or deleted since the last save to the
+        snapshot's change log (see :class:`snapshot.SnapshotStore`). If any
+        errors occur during the file operation, an error message will be
+        displayed.
 
         :param None: This method does not take any parameters.
         :type None: None
@@ -559,24 +1236,20 @@ class MainWindow(QMainWindow):
         :rtype: None
         """
         try:
-            with open('students.pkl', 'wb') as student_file:
-                pickle.dump(self.students, student_file)
-            
-            with open('instructors.pkl', 'wb') as instructor_file:
-                pickle.dump(self.instructors, instructor_file)
-
+            self.writer.flush()
             QMessageBox.information(self, "Data Saved", "Data has been saved successfully.")
-        except OSError as e:
+        except (OSError, sqlite3.Error) as e:
             QMessageBox.critical(self, "Save Error", f"An error occurred while saving data: {e}")
 
     def load_data(self):
         """
-        Loads students and instructors from pickle files and updates the UI.
+        Loads students, instructors and courses from the snapshot file and shows them.
 
-        This method deserializes the student and instructor data from 
-        their respective pickle files. If any file is not found, a warning
-        message will be displayed. The UI is then updated to reflect the 
-        loaded data.
+        The snapshot is memory-mapped and its rows are paged straight into
+        the table, without unpickling objects or reading them back from the
+        database. The file holds plain data only, so loading it cannot run
+        code. If the file is not found or is not a valid snapshot, a message
+        is displayed. The table shows the snapshot until the next search.
 
         :param None: This method does not take any parameters.
         :type None: None
@@ -585,22 +1258,20 @@ class MainWindow(QMainWindow):
         :rtype: None
         """
         try:
-            with open('students.pkl', 'rb') as student_file:
-                self.students = pickle.load(student_file)
-        except FileNotFoundError:
-            QMessageBox.warning(self, "File Error", "Students data file not found.")
-        except Exception as e:
-            QMessageBox.critical(self, "Load Error", f"An error occurred while loading students data: {e}")
-
-        try:
-            with open('instructors.pkl', 'rb') as instructor_file:
-                self.instructors = pickle.load(instructor_file)
+            snapshot = self.store.load()
         except FileNotFoundError:
-            QMessageBox.warning(self, "File Error", "Instructors data file not found.")
-        except Exception as e:
-            QMessageBox.critical(self, "Load Error", f"An error occurred while loading instructors data: {e}")
+            QMessageBox.warning(self, "File Error", "Snapshot file not found.")
+            return
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Load Error", f"An error occurred while loading data: {e}")
+            return
 
-        self.update_table()
+        self.instructors = [Instructor(name, age, email, instructor_id)
+                            for instructor_id, name, age, email in snapshot["instructors"]]
+        self.instructor_dropdown.clear()
+        for instructor in self.instructors:
+            self.instructor_dropdown.addItem(instructor.name, instructor.instructor_id)
+        self.model.reload(snapshot=snapshot)
 
 
     def export_to_csv(self):
@@ -622,18 +1293,23 @@ class MainWindow(QMainWindow):
 
         if file_name:
             try:
-                with open(file_name, 'w', newline='') as csv_file:
+                with open(file_name, 'w', newline='') as csv_file, sqlite3.connect('school_management.db') as conn:
                     writer = csv.writer(csv_file)
                     writer.writerow(["Type", "Name/ID", "Additional Info"])
 
-                    for student in self.students:
-                        writer.writerow(["Student", student.name, f"Age: {student.age}, Email: {student.email}, ID: {student.student_id}"])
+                    # Rows are read and written a chunk at a time rather than
+                    # loaded into memory first.
+                    for rows in self.repository.chunks(conn, "students"):
+                        writer.writerows(["Student", name, f"Age: {age}, Email: {email}, ID: {student_id}"]
+                                         for student_id, name, age, email in rows)
 
-                    for instructor in self.instructors:
-                        writer.writerow(["Instructor", instructor.name, f"Age: {instructor.age}, Email: {instructor.email}, ID: {instructor.instructor_id}"])
+                    for rows in self.repository.chunks(conn, "instructors"):
+                        writer.writerows(["Instructor", name, f"Age: {age}, Email: {email}, ID: {instructor_id}"]
+                                         for instructor_id, name, age, email in rows)
 
-                    for course in self.courses:
-                        writer.writerow(["Course", course.course_name, f"Course ID: {course.course_id}, Instructor: {course.instructor_id}"])
+                    for rows in self.repository.chunks(conn, "courses"):
+                        writer.writerows(["Course", name, f"Course ID: {course_id}, Instructor: {instructor_id}"]
+                                         for course_id, name, instructor_id in rows)
 
                 QMessageBox.information(self, "Data Exported", "Data has been exported to CSV successfully.")
 
@@ -645,70 +1321,46 @@ class MainWindow(QMainWindow):
         """
         Opens a dialog to view the records in the database in a tabular format.
 
-        This method retrieves data from the students, instructors, and courses 
-        tables and displays it in a QTableWidget within a QDialog.
+        This method pages data from the students, instructors, and courses 
+        tables into a QTableView within a QDialog as the user scrolls. Once the
+        dialog is closed, the model's connection is closed and the dialog is
+        deleted along with the model and its rows.
         """
         db_view = QDialog(self)
         db_view.setWindowTitle("Database Records")
         db_view.setGeometry(100, 100, 600, 400)
 
         layout = QVBoxLayout()
-        table = QTableWidget(db_view)
-        table.setColumnCount(3)
-        table.setHorizontalHeaderLabels(["Type", "Name/ID", "Additional Info"])
-        table.setRowCount(0)
-
-        with sqlite3.connect('school_management.db') as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT * FROM students")
-            for row in cursor.fetchall():
-                student = Student(row[1], row[2], row[3], row[4])
-                row_position = table.rowCount()
-                table.insertRow(row_position)
-                table.setItem(row_position, 0, QTableWidgetItem("Student"))
-                table.setItem(row_position, 1, QTableWidgetItem(f"{student.name} ({student.student_id})"))
-                table.setItem(row_position, 2, QTableWidgetItem(f"Age: {student.age}, Email: {student.getEmail()}"))
-
-            cursor.execute("SELECT * FROM instructors")
-            for row in cursor.fetchall():
-                instructor = Instructor(row[1], row[2], row[3], row[4])
-                row_position = table.rowCount()
-                table.insertRow(row_position)
-                table.setItem(row_position, 0, QTableWidgetItem("Instructor"))
-                table.setItem(row_position, 1, QTableWidgetItem(f"{instructor.name} ({instructor.instructor_id})"))
-                table.setItem(row_position, 2, QTableWidgetItem(f"Age: {instructor.age}, Email: {instructor.getEmail()}"))
-
-            cursor.execute("""
-                SELECT courses.*, instructors.name AS instructor_name 
-                FROM courses 
-                LEFT JOIN instructors ON courses.instructor_id = instructors.instructor_id
-            """)
-            for row in cursor.fetchall():
-                course = Course(row[2], row[1], None)
-                row_position = table.rowCount()
-                table.insertRow(row_position)
-                table.setItem(row_position, 0, QTableWidgetItem("Course"))
-                table.setItem(row_position, 1, QTableWidgetItem(f"{course.course_id}, {course.course_name}"))
-                table.setItem(row_position, 2, QTableWidgetItem(f"Instructor: {row[4] or 'Not assigned'}"))
+        table = QTableView(db_view)
+        model = RecordTableModel('school_management.db', parent=db_view)
+        table.setModel(model)
+        table.horizontalHeader().setStretchLastSection(True)
 
         layout.addWidget(table)
         db_view.setLayout(layout)
-        db_view.exec_()
+        try:
+            db_view.exec_()
+        finally:
+            model.connection.close()
+            db_view.deleteLater()
 
 
     def closeEvent(self, event):
         """
         Handles the close event for the main window.
 
-        This method saves data and performs any necessary cleanup 
-        before the application closes. It is called when the user attempts 
-        to close the main window.
+        This method saves the rows changed since the last background save
+        and performs any necessary cleanup before the application closes.
+        It is called when the user attempts to close the main window. The
+        save only writes the changed rows and waits at most ``CLOSE_TIMEOUT``
+        seconds, so closing does not wait on the size of the roster. Every
+        change is already in the database, so a save that runs out of time
+        only costs the snapshot, which is then rewritten by the next save.
         
         Args:
             event: The close event that triggers this method.
         """
-        self.save_data()
+        self.writer.close(self.CLOSE_TIMEOUT)
         
         event.accept()
 
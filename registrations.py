@@ -0,0 +1,70 @@
+"""
+Course registrations keyed by the integer ids of students and courses.
+
+``course_registrations`` (see migrations.MYSQL_ROSTER_MIGRATIONS) holds one
+``(student_id, course_id)`` row per registration, where both columns are the
+integer ``id`` columns of ``students`` and ``courses``, not their text ids.
+The pair is the primary key, so registering twice is a no-op.
+"""
+
+
+def batches(values, size):
+    values = list(dict.fromkeys(values))
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def register(conn, repository, student_ids, course_ids, batch_size=5000):
+    """
+    Registers every given student in every given course.
+
+    Registrations that already exist are skipped, as are ids with no matching
+    student or course. Each batch is a single ``INSERT ... SELECT`` that looks
+    up the integer ids in the database, so a registration wave of many students
+    into one course (or one student into many courses) takes one statement per
+    ``batch_size`` ids instead of one per registration. The version of
+    ``course_registrations`` is bumped once per call that added any. Does not commit.
+
+    Args:
+        conn: An open sqlite3 or mysql.connector connection.
+        repository (Repository): Supplies the dialect's placeholder and
+            INSERT IGNORE spelling, caches the statements and bumps the version.
+        student_ids (iterable): Text ids of the students (``students.student_id``).
+        course_ids (iterable): Text ids of the courses (``courses.course_id``).
+        batch_size (int): Most ids of one kind bound to a single statement.
+
+    Returns:
+        int: Number of registrations added.
+
+    Example:
+        with pool.connection() as conn:
+            added = register(conn, repository, student_ids, ["CS101"])
+            conn.commit()
+    """
+    added = 0
+    cursor = conn.cursor()
+    try:
+        for course_batch in batches(course_ids, batch_size):
+            for student_batch in batches(student_ids, batch_size):
+                cursor.execute(registration_statement(repository, len(student_batch), len(course_batch)),
+                               student_batch + course_batch)
+                added += cursor.rowcount
+    finally:
+        cursor.close()
+    if added:
+        repository.bump(conn, "course_registrations")
+    return added
+
+
+def registration_statement(repository, student_count, course_count):
+    cache_key = ("register", student_count, course_count)
+    sql = repository.statements.get(cache_key)
+    if sql is None:
+        students = ", ".join([repository.placeholder] * student_count)
+        courses = ", ".join([repository.placeholder] * course_count)
+        sql = (
+            f"{repository.insert_ignore} INTO course_registrations (student_id, course_id) "
+            f"SELECT students.id, courses.id FROM students, courses "
+            f"WHERE students.student_id IN ({students}) AND courses.course_id IN ({courses})"
+        )
+        repository.statements[cache_key] = sql
+    return sql
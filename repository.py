@@ -0,0 +1,334 @@
+"""
+Shared data access for the school management front ends.
+
+pyQt5.py (SQLite), Part2_GUI.py (MySQL through db_pool) and Lab2_Nael.py
+(SQLite through db_session) describe their tables with :class:`Table` and go
+through a :class:`Repository` instead of writing their own SQL strings.
+"""
+
+
+class Table:
+    """
+    Describes a table as the repository reads and writes it.
+
+    Args:
+        name (str): The table name.
+        key (str): Column identifying a record, e.g. "student_id".
+        columns (tuple): Columns in the order rows are read and inserted.
+        order_by (str): Column that keeps rows in insertion order, or None for
+            the database's own order.
+        cascades (tuple): Tables whose rows a delete from this table also
+            deletes through ON DELETE CASCADE foreign keys.
+    """
+
+    def __init__(self, name, key, columns, order_by=None, cascades=()):
+        self.name = name
+        self.key = key
+        self.columns = tuple(columns)
+        self.order_by = order_by
+        self.cascades = tuple(cascades)
+
+
+# Tables of pyQt5.py's school_management.db.
+SQLITE_ROSTER = {
+    "students": Table("students", "student_id", ("student_id", "name", "age", "email"), order_by="id"),
+    "instructors": Table("instructors", "instructor_id", ("instructor_id", "name", "age", "email"), order_by="id"),
+    "courses": Table("courses", "course_id", ("course_id", "name", "instructor_id"), order_by="id"),
+}
+
+# Tables of Part2_GUI.py's MySQL database (see README.md).
+MYSQL_ROSTER = {
+    "students": Table("students", "student_id", ("student_id", "name", "age", "email"),
+                      cascades=("course_registrations",)),
+    "instructors": Table("instructors", "instructor_id", ("instructor_id", "name", "age", "email")),
+    "courses": Table("courses", "course_id", ("course_id", "name", "instructor_name"),
+                     cascades=("course_registrations",)),
+}
+
+# Tables with a version counter in ``table_versions`` (see
+# migrations.version_tracking), bumped by the writes of a Repository created
+# with ``versioned``.
+SQLITE_VERSIONED = ("students", "instructors", "courses")
+MYSQL_VERSIONED = ("students", "instructors", "courses", "course_registrations")
+
+# MySQL's ER_NO_SUCH_TABLE error number.
+MYSQL_NO_SUCH_TABLE = 1146
+
+
+def is_missing_table(error):
+    # The drivers share no error base class: sqlite3 names a missing table only
+    # in its message, mysql.connector sets errno.
+    return getattr(error, "errno", None) == MYSQL_NO_SUCH_TABLE or "no such table" in str(error)
+
+
+# Tables of Lab2_Nael.py's school_management_system.db.
+LAB2_TABLES = {
+    "Person": Table("Person", "email", ("name", "age", "email"), order_by="id"),
+    "Student": Table("Student", "student_id", ("name", "age", "email", "student_id"), order_by="id"),
+    "Instructor": Table("Instructor", "instructor_id", ("name", "age", "email", "instructor_id"), order_by="id"),
+    "Course": Table("Course", "course_id", ("course_id", "course_name", "instructor_id"), order_by="id"),
+}
+
+
+class Repository:
+    """
+    Builds and runs the SQL for a set of tables in one database dialect.
+
+    Every statement is built once per repository and then reused verbatim, so
+    each connection's statement cache (sqlite3 keeps one per connection) parses
+    it only once. Methods take the connection to run on and never commit;
+    callers keep their own transaction handling (``conn.commit()``,
+    ``DatabaseSession.transaction``, ...).
+
+    Each write method that changes a table listed in ``versioned`` also adds
+    one to the table's row in ``table_versions``, once per call rather than
+    once per row, in the caller's transaction (see versioned_cache.py).
+
+    Args:
+        tables (dict): Maps table names to :class:`Table` descriptions.
+        placeholder (str): Parameter marker of the driver: "?" for sqlite3,
+            "%s" for mysql.connector. Backends in db_pool expose it as ``placeholder``.
+        insert_ignore (str): How the dialect spells an INSERT that skips rows
+            already present: "INSERT OR IGNORE" for SQLite, "INSERT IGNORE" for MySQL.
+        versioned (tuple): Tables whose writes bump ``table_versions``, e.g.
+            ``SQLITE_VERSIONED``; empty for databases without that table.
+
+    Example:
+        repository = Repository(MYSQL_ROSTER, MySQLBackend.placeholder)
+        with pool.connection() as conn:
+            students = repository.all(conn, "students")
+    """
+
+    def __init__(self, tables, placeholder="?", insert_ignore="INSERT OR IGNORE", versioned=()):
+        self.tables = tables
+        self.placeholder = placeholder
+        self.insert_ignore = insert_ignore
+        self.versioned = frozenset(versioned)
+        self.statements = {}
+
+    @classmethod
+    def for_backend(cls, backend, tables, versioned=()):
+        """
+        Creates a repository using the dialect of a db_pool backend.
+        """
+        return cls(tables, backend.placeholder, backend.insert_ignore, versioned)
+
+    def statement(self, kind, table_name, columns=None, where=None):
+        cache_key = (kind, table_name, columns, where)
+        sql = self.statements.get(cache_key)
+        if sql is not None:
+            return sql
+
+        table = self.tables[table_name]
+        marker = self.placeholder
+        column_list = ", ".join(columns or table.columns)
+        if kind == "select":
+            sql = f"SELECT {column_list} FROM {table.name}"
+            if where is not None:
+                sql += f" WHERE {where} = {marker}"
+            if table.order_by:
+                sql += f" ORDER BY {table.order_by}"
+        elif kind == "insert":
+            markers = ", ".join([marker] * len(columns or table.columns))
+            sql = f"INSERT INTO {table.name} ({column_list}) VALUES ({markers})"
+        elif kind == "update":
+            assignments = ", ".join(f"{column} = {marker}" for column in columns)
+            sql = f"UPDATE {table.name} SET {assignments} WHERE {where} = {marker}"
+        elif kind == "delete":
+            sql = f"DELETE FROM {table.name} WHERE {where} = {marker}"
+        elif kind == "count":
+            sql = f"SELECT COUNT(*) FROM {table.name}"
+        else:
+            raise ValueError(f"Unknown statement kind: {kind}")
+        self.statements[cache_key] = sql
+        return sql
+
+    def bump(self, conn, *table_names):
+        """
+        Adds one to the version of each of ``table_names`` that is versioned.
+
+        Called by the write methods; code writing a versioned table with its
+        own SQL (e.g. registrations.register) calls it once per statement.
+        Does nothing until the migration creating ``table_versions`` ran;
+        VersionedCache does not cache without it either. Any other error
+        is raised.
+        """
+        for table_name in table_names:
+            if table_name not in self.versioned:
+                continue
+            sql = self.statements.get("bump")
+            if sql is None:
+                sql = f"UPDATE table_versions SET version = version + 1 WHERE table_name = {self.placeholder}"
+                self.statements["bump"] = sql
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, (table_name,))
+            except Exception as e:
+                if not is_missing_table(e):
+                    raise
+                return
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def execute(conn, sql, params=()):
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def all(self, conn, table_name, columns=None):
+        """
+        Reads every row of a table.
+
+        Args:
+            conn: An open sqlite3 or mysql.connector connection.
+            table_name (str): Name of the table in ``tables``.
+            columns (tuple): Columns to read, or None for the table's columns.
+
+        Returns:
+            list: One tuple per row.
+        """
+        cursor = self.execute(conn, self.statement("select", table_name, columns))
+        try:
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def chunks(self, conn, table_name, columns=None, chunk_size=1000):
+        """
+        Yields the rows of a table in lists of up to ``chunk_size`` rows.
+
+        Unlike :meth:`all`, only one chunk is held in memory, e.g. for exports.
+        The cursor is closed once the last chunk was read. When stopping early,
+        discard the connection instead of reusing it (see ConnectionPool.discard):
+        the rest of the rows are left unread.
+        """
+        cursor = self.execute(conn, self.statement("select", table_name, columns))
+        stopped = False
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield rows
+        except GeneratorExit:
+            # Closed before the last row. An unbuffered mysql.connector cursor
+            # cannot be closed until every row was read, and reading them
+            # would stream the rest of the table, so the cursor is left open.
+            stopped = True
+            raise
+        finally:
+            if not stopped:
+                cursor.close()
+
+    def find(self, conn, table_name, column, value, columns=None):
+        """
+        Reads the rows whose ``column`` equals ``value``.
+
+        Returns:
+            list: One tuple per matching row.
+        """
+        cursor = self.execute(conn, self.statement("select", table_name, columns, where=column), (value,))
+        try:
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def get(self, conn, table_name, key, columns=None):
+        """
+        Reads the record with the given key.
+
+        Returns:
+            tuple: The row, or None if there is no such record.
+        """
+        table = self.tables[table_name]
+        rows = self.find(conn, table_name, table.key, key, columns)
+        return rows[0] if rows else None
+
+    def column(self, conn, table_name, column):
+        """
+        Reads one column of every row, e.g. the names for a dropdown.
+
+        Returns:
+            list: The column's values.
+        """
+        return [row[0] for row in self.all(conn, table_name, (column,))]
+
+    def count(self, conn, table_name):
+        cursor = self.execute(conn, self.statement("count", table_name))
+        try:
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def insert(self, conn, table_name, row, columns=None):
+        """
+        Inserts one row, given in the order of ``columns`` or the table's columns.
+        """
+        self.execute(conn, self.statement("insert", table_name, columns), tuple(row)).close()
+        self.bump(conn, table_name)
+
+    def insert_many(self, conn, table_name, rows, columns=None, batch_size=1000):
+        """
+        Inserts rows with one ``executemany`` per ``batch_size`` rows.
+
+        mysql.connector turns each batch into a single multi-row INSERT, and
+        sqlite3 reuses one prepared statement for the whole batch. Rows are
+        consumed lazily, so ``rows`` can be a generator of any length.
+
+        Returns:
+            int: Number of rows inserted.
+        """
+        sql = self.statement("insert", table_name, columns)
+        inserted = 0
+        cursor = conn.cursor()
+        try:
+            rows = iter(rows)
+            while True:
+                batch = [tuple(row) for _, row in zip(range(batch_size), rows)]
+                if not batch:
+                    if inserted:
+                        self.bump(conn, table_name)
+                    return inserted
+                cursor.executemany(sql, batch)
+                inserted += len(batch)
+        finally:
+            cursor.close()
+
+    def update(self, conn, table_name, key, values, where=None):
+        """
+        Sets columns of the records whose ``where`` column (the key by default) equals ``key``.
+
+        Args:
+            values (dict): New value of each column to change.
+
+        Returns:
+            int: Number of rows changed.
+        """
+        where = where or self.tables[table_name].key
+        sql = self.statement("update", table_name, tuple(values), where=where)
+        cursor = self.execute(conn, sql, (*values.values(), key))
+        try:
+            changed = cursor.rowcount
+        finally:
+            cursor.close()
+        if changed:
+            self.bump(conn, table_name)
+        return changed
+
+    def delete(self, conn, table_name, key):
+        """
+        Deletes the record with the given key.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        table = self.tables[table_name]
+        cursor = self.execute(conn, self.statement("delete", table_name, where=table.key), (key,))
+        try:
+            deleted = cursor.rowcount
+        finally:
+            cursor.close()
+        if deleted:
+            self.bump(conn, table_name, *table.cascades)
+        return deleted
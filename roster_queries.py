@@ -0,0 +1,132 @@
+"""
+Course rosters, student schedules and instructor teaching loads.
+
+Each result is computed by one SQL statement, with the counts done in the
+database by GROUP BY and window functions (MySQL 8+, SQLite 3.25+), against
+the tables of Part2_GUI.py's database: ``course_registrations`` pairs the
+integer ids of ``students`` and ``courses`` (see migrations.py), and courses
+name their instructor in ``instructor_name``.
+"""
+from versioned_cache import VersionedCache
+
+# Tables every roster query may read; a write to any of them bumps its
+# version in table_versions and so refreshes the cached results.
+ROSTER_TABLES = ("students", "instructors", "courses", "course_registrations")
+
+COURSE_ROSTER = """
+    SELECT students.student_id, students.name, students.email,
+           COUNT(*) OVER () AS enrolled
+    FROM courses
+    JOIN course_registrations ON course_registrations.course_id = courses.id
+    JOIN students ON students.id = course_registrations.student_id
+    WHERE courses.course_id = {0}
+    ORDER BY students.name, students.student_id
+"""
+
+COURSE_SIZES = """
+    SELECT courses.course_id, courses.name, courses.instructor_name,
+           COUNT(course_registrations.student_id) AS enrolled
+    FROM courses
+    LEFT JOIN course_registrations ON course_registrations.course_id = courses.id
+    GROUP BY courses.id, courses.course_id, courses.name, courses.instructor_name
+    ORDER BY courses.course_id
+"""
+
+# Each course's size is counted by a correlated subquery over the primary
+# key's (course_id, ...) prefix, so only the student's own courses are counted.
+STUDENT_SCHEDULE = """
+    SELECT courses.course_id, courses.name, courses.instructor_name,
+           (SELECT COUNT(*) FROM course_registrations AS registered
+            WHERE registered.course_id = courses.id) AS enrolled,
+           COUNT(*) OVER () AS course_count
+    FROM students
+    JOIN course_registrations AS mine ON mine.student_id = students.id
+    JOIN courses ON courses.id = mine.course_id
+    WHERE students.student_id = {0}
+    ORDER BY courses.course_id
+"""
+
+INSTRUCTOR_LOADS = """
+    SELECT instructors.instructor_id, instructors.name,
+           COUNT(DISTINCT courses.id) AS course_count,
+           COUNT(course_registrations.student_id) AS student_count,
+           RANK() OVER (ORDER BY COUNT(course_registrations.student_id) DESC) AS load_rank
+    FROM instructors
+    LEFT JOIN courses ON courses.instructor_name = instructors.name
+    LEFT JOIN course_registrations ON course_registrations.course_id = courses.id
+    GROUP BY instructors.instructor_id, instructors.name
+    ORDER BY load_rank, instructors.name
+"""
+
+
+class RosterQueries:
+    """
+    Runs the roster queries and caches their results until the data changes.
+
+    Results are kept per query and arguments in a VersionedCache keyed on
+    ``ROSTER_TABLES``, so they are refreshed after any versioned write to those
+    tables, whichever program or connection made it. :meth:`invalidate` drops
+    them all at once after the app's own writes. The cache is shared by the
+    GUI's worker threads.
+
+    Args:
+        placeholder (str): The driver's parameter marker, as in Repository.
+    """
+
+    def __init__(self, placeholder="?"):
+        self.placeholder = placeholder
+        self.cache = VersionedCache()
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+    def query(self, conn, sql, *params):
+        def load(conn):
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql.format(self.placeholder), params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+        return self.cache.get(conn, (sql, params), ROSTER_TABLES, load)
+
+    def course_roster(self, conn, course_id):
+        """
+        Lists the students registered in a course.
+
+        Returns:
+            list: ``(student_id, name, email, enrolled)`` rows ordered by name,
+            where ``enrolled`` is the course's number of students.
+        """
+        return self.query(conn, COURSE_ROSTER, course_id)
+
+    def course_sizes(self, conn):
+        """
+        Lists every course with its number of registered students.
+
+        Returns:
+            list: ``(course_id, name, instructor_name, enrolled)`` rows.
+        """
+        return self.query(conn, COURSE_SIZES)
+
+    def student_schedule(self, conn, student_id):
+        """
+        Lists the courses a student is registered in.
+
+        Returns:
+            list: ``(course_id, name, instructor_name, enrolled, course_count)``
+            rows, where ``enrolled`` is each course's number of students and
+            ``course_count`` the student's number of courses.
+        """
+        return self.query(conn, STUDENT_SCHEDULE, student_id)
+
+    def instructor_loads(self, conn):
+        """
+        Lists every instructor's number of courses and of students taught.
+
+        Returns:
+            list: ``(instructor_id, name, course_count, student_count, load_rank)``
+            rows, busiest first; instructors with the same number of students share a rank.
+        """
+        return self.query(conn, INSTRUCTOR_LOADS)
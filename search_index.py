@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+
+class SearchIndex:
+    """
+    In-memory substring index over the records shown in the Tkinter "View All" table.
+
+    Every substring of up to ``gram_size`` characters of each record's lower-cased
+    search texts maps to the keys of the records containing it. Terms up to that
+    length are answered with a single dictionary lookup. Longer terms intersect the
+    postings of their n-grams, starting with the rarest, and check only the remaining
+    candidates. A term that is part of a record type's name (e.g. "stu") also matches
+    every record of that type, as the linear search did.
+
+    :meth:`update` is incremental: records whose row is unchanged since the last
+    update keep their n-grams, so reloading a mostly unchanged roster only indexes
+    what changed.
+
+    Args:
+        gram_size (int): Length of the longest indexed substring.
+    """
+
+    def __init__(self, gram_size=3):
+        self.gram_size = gram_size
+        self.grams = defaultdict(set)
+        self.by_type = defaultdict(set)
+        # key -> (row, lower-cased texts)
+        self.entries = {}
+        # key -> position in the last update, used to return results in load order
+        self.order = {}
+
+    def update(self, records):
+        """
+        Makes the index match ``records``, re-indexing only new or changed records.
+
+        Args:
+            records (iterable): ``(record_type, record_id, row, texts)`` tuples in
+                display order, where ``texts`` are the strings to search.
+        """
+        order = {}
+        for position, (record_type, record_id, row, texts) in enumerate(records):
+            key = (record_type, record_id)
+            order[key] = position
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] == row:
+                    continue
+                self.remove(key)
+            self.add(key, row, texts)
+        for key in [key for key in self.entries if key not in order]:
+            self.remove(key)
+        self.order = order
+
+    def add(self, key, row, texts):
+        texts = tuple(str(text).lower() for text in texts)
+        self.entries[key] = (row, texts)
+        self.by_type[key[0]].add(key)
+        for gram in self.ngrams(texts):
+            self.grams[gram].add(key)
+
+    def remove(self, key):
+        _, texts = self.entries.pop(key)
+        self.by_type[key[0]].discard(key)
+        for gram in self.ngrams(texts):
+            keys = self.grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self.grams[gram]
+
+    def ngrams(self, texts):
+        grams = set()
+        for text in texts:
+            for size in range(1, self.gram_size + 1):
+                for start in range(len(text) - size + 1):
+                    grams.add(text[start:start + size])
+        return grams
+
+    def search(self, term):
+        """
+        Finds the records whose texts contain ``term``, ignoring case.
+
+        Args:
+            term (str): The substring to look for; an empty term matches everything.
+
+        Returns:
+            list: ``(record_type, row)`` pairs in the order of the last update.
+        """
+        term = term.lower()
+        if not term:
+            matches = set(self.entries)
+        elif len(term) <= self.gram_size:
+            matches = set(self.grams.get(term, ()))
+        else:
+            postings = sorted(
+                (self.grams.get(term[start:start + self.gram_size], set())
+                 for start in range(len(term) - self.gram_size + 1)),
+                key=len
+            )
+            matches = {
+                key for key in postings[0].intersection(*postings[1:])
+                if any(term in text for text in self.entries[key][1])
+            }
+        for record_type, keys in self.by_type.items():
+            if term in record_type.lower():
+                matches |= keys
+        return [(key[0], self.entries[key][0]) for key in sorted(matches, key=self.order.__getitem__)]
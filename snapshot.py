@@ -0,0 +1,592 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+# File layout (version 1):
+#   magic (8 bytes) | version (uint32) | header length (uint32) | header (JSON)
+#   column and string pool blobs, each starting on an 8-byte boundary.
+# The header maps each table to its row count and, for every column, its kind
+# and blob offset. "int" columns are int64 arrays; "str" columns are uint32
+# indexes into one string pool shared by the whole file, so repeated names and
+# emails are stored once. The pool is a uint64 offsets array plus UTF-8 data.
+MAGIC = b"ROSTSNAP"
+VERSION = 1
+PREAMBLE = struct.Struct("<8sII")
+TYPECODES = {"int": "q", "str": "I"}
+NULL_STRING = 0xFFFFFFFF
+
+# Column layouts of the roster tables as stored by the GUIs.
+ROSTER_COLUMNS = {
+    "students": [("student_id", "str"), ("name", "str"), ("age", "int"), ("email", "str")],
+    "instructors": [("instructor_id", "str"), ("name", "str"), ("age", "int"), ("email", "str")],
+    "courses": [("course_id", "str"), ("name", "str"), ("instructor_id", "str")],
+}
+
+
+def save_snapshot(path, tables):
+    """
+    Writes tables of rows to a binary columnar snapshot file.
+
+    Args:
+        path (str): The file to write.
+        tables (dict): Maps each table name to ``(columns, rows)``, where ``columns``
+            is a list of ``(name, kind)`` pairs with kind "int" or "str" (see
+            ``ROSTER_COLUMNS``) and ``rows`` is an iterable of tuples in that order.
+            ``None`` is allowed in "str" columns.
+
+    Returns:
+        dict: Number of rows written per table.
+    """
+    strings = {}
+    pool = []
+    columns_data = {}
+    header = {"byteorder": sys.byteorder, "tables": {}}
+
+    for table_name, (columns, rows) in tables.items():
+        arrays = [array(TYPECODES[kind]) for _, kind in columns]
+        string_columns = [kind == "str" for _, kind in columns]
+        count = 0
+        for row in rows:
+            for value, values, is_string in zip(row, arrays, string_columns):
+                if is_string:
+                    if value is None:
+                        value = NULL_STRING
+                    else:
+                        index = strings.get(value)
+                        if index is None:
+                            index = strings[value] = len(pool)
+                            pool.append(value)
+                        value = index
+                values.append(value)
+            count += 1
+        header["tables"][table_name] = {"rows": count, "columns": {}}
+        columns_data[table_name] = list(zip(columns, arrays))
+
+    encoded = [value.encode("utf-8") for value in pool]
+    string_offsets = array("Q", [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    blobs = [string_offsets.tobytes(), b"".join(encoded)]
+    blob_names = [("strings", "offsets"), ("strings", "data")]
+    for table_name, columns in columns_data.items():
+        for (column_name, kind), values in columns:
+            blobs.append(values.tobytes())
+            blob_names.append((table_name, column_name, kind))
+
+    # Offsets depend on the header length and the header holds the offsets, so
+    # reserve room for the largest possible offsets before laying out the blobs.
+    placeholder = dict(header, strings={"count": len(pool), "offsets": 2 ** 63, "data": 2 ** 63})
+    for table_name, columns in columns_data.items():
+        placeholder["tables"][table_name]["columns"] = {
+            column_name: [kind, 2 ** 63] for (column_name, kind), _ in columns
+        }
+    position = align(PREAMBLE.size + len(json.dumps(placeholder)))
+    offsets = []
+    for blob in blobs:
+        offsets.append(position)
+        position = align(position + len(blob))
+
+    header["strings"] = {"count": len(pool), "offsets": offsets[0], "data": offsets[1]}
+    for (table_name, column_name, kind), offset in zip(blob_names[2:], offsets[2:]):
+        header["tables"][table_name]["columns"][column_name] = [kind, offset]
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for blob, offset in zip(blobs, offsets):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(blob)
+    return {table_name: info["rows"] for table_name, info in header["tables"].items()}
+
+
+def align(position):
+    return (position + 7) & ~7
+
+
+class Snapshot:
+    """
+    Memory-mapped, read-only view of a snapshot written by save_snapshot.
+
+    Opening a snapshot only reads its header; columns are views into the mapped
+    file and strings are decoded when a row is accessed, so opening takes the same
+    time for any number of rows and nothing is materialized up front.
+
+    Args:
+        path (str): The snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written by a newer version.
+
+    Example:
+        with Snapshot("roster.snap") as snapshot:
+            students = snapshot["students"]
+            print(len(students), students[0])
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mmap)
+        # Every view into the map, released by close() before the map itself.
+        self.views = []
+        try:
+            if len(self.buffer) < PREAMBLE.size:
+                raise ValueError("Not a roster snapshot file")
+            magic, version, header_size = PREAMBLE.unpack_from(self.buffer)
+            if magic != MAGIC:
+                raise ValueError("Not a roster snapshot file")
+            if version > VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}")
+            self.header = json.loads(bytes(self.buffer[PREAMBLE.size:PREAMBLE.size + header_size]))
+        except ValueError:
+            self.close()
+            raise
+        strings = self.header["strings"]
+        self.string_offsets = self.view(strings["offsets"], "Q", strings["count"] + 1)
+        self.string_data = strings["data"]
+        self.tables = {
+            name: SnapshotTable(self, info["rows"], {
+                column_name: (kind, self.view(offset, TYPECODES[kind], info["rows"]))
+                for column_name, (kind, offset) in info["columns"].items()
+            })
+            for name, info in self.header["tables"].items()
+        }
+
+    def view(self, offset, typecode, count):
+        size = array(typecode).itemsize
+        raw = self.buffer[offset:offset + count * size]
+        values = raw.cast(typecode)
+        self.views += [values, raw]
+        if self.header["byteorder"] != sys.byteorder:
+            # Written on a machine of the other endianness: copy and swap.
+            values = array(typecode, values)
+            values.byteswap()
+        return values
+
+    def string(self, index):
+        if index == NULL_STRING:
+            return None
+        start = self.string_data + self.string_offsets[index]
+        end = self.string_data + self.string_offsets[index + 1]
+        return str(self.mmap[start:end], "utf-8")
+
+    def __getitem__(self, table_name):
+        return self.tables[table_name]
+
+    def close(self):
+        """
+        Releases the memory map. Rows already read stay valid; tables do not.
+        """
+        self.tables = {}
+        self.string_offsets = None
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.buffer.release()
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SnapshotTable:
+    """
+    One table of a Snapshot, indexable like a list of row tuples.
+
+    Args:
+        snapshot (Snapshot): The snapshot the columns belong to.
+        rows (int): Number of rows.
+        columns (dict): Maps column names to ``(kind, values)``.
+    """
+
+    def __init__(self, snapshot, rows, columns):
+        self.snapshot = snapshot
+        self.rows = rows
+        self.columns = columns
+        self.names = list(columns)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("snapshot row index out of range")
+        string = self.snapshot.string
+        return tuple(
+            string(values[index]) if kind == "str" else values[index]
+            for kind, values in self.columns.values()
+        )
+
+    def __iter__(self):
+        for index in range(self.rows):
+            yield self[index]
+
+    def column(self, name):
+        """
+        Returns one column as a list of Python values.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            list: The column's values, decoded.
+        """
+        kind, values = self.columns[name]
+        if kind == "str":
+            return [self.snapshot.string(index) for index in values]
+        return values.tolist()
+
+
+class MergedTable:
+    """
+    A snapshot table with changes from a change log applied on top, read in order.
+
+    Rows are yielded in snapshot order, with changed rows replaced and deleted rows
+    skipped, followed by rows whose keys are not in the snapshot. The key is a
+    row's first column.
+
+    Args:
+        base (SnapshotTable): The table from the snapshot, or None if it has none.
+        changes (dict): Maps keys to their new row, or to None if deleted.
+    """
+
+    def __init__(self, base, changes):
+        self.base = base
+        self.changes = changes
+
+    def __iter__(self):
+        changes = self.changes
+        in_base = set()
+        if self.base is not None:
+            for row in self.base:
+                key = row[0]
+                if key in changes:
+                    in_base.add(key)
+                    row = changes[key]
+                    if row is None:
+                        continue
+                yield row
+        for key, row in changes.items():
+            if row is not None and key not in in_base:
+                yield row
+
+
+class SnapshotStore:
+    """
+    Snapshot file plus an append-only change log, so saving writes only what changed.
+
+    Changed rows are recorded with :meth:`mark` and :meth:`mark_deleted`. :meth:`save`
+    appends just those rows to ``<path>.changes`` as JSON Lines, and folds the log
+    back into a new snapshot once it grows past ``compact_ratio`` of the snapshot's
+    size. Both files hold plain data only, so loading never runs code from the file.
+
+    Rows may be marked from one thread while another saves (see :class:`WriteBehind`):
+    a save takes the rows marked so far, and rows marked meanwhile wait for the next one.
+
+    Args:
+        path (str): The snapshot file.
+        columns (dict): Column layout of each table, as in ``ROSTER_COLUMNS``.
+        compact_ratio (float): Log size, relative to the snapshot, that triggers compaction.
+        compact_minimum (int): Log size in bytes below which the log is never compacted.
+    """
+
+    def __init__(self, path, columns=ROSTER_COLUMNS, compact_ratio=0.25, compact_minimum=1 << 20):
+        self.path = path
+        self.changes_path = path + ".changes"
+        self.columns = columns
+        self.compact_ratio = compact_ratio
+        self.compact_minimum = compact_minimum
+        self.dirty = {table: {} for table in columns}
+        # dirty_lock is only held to swap or copy ``dirty``, so marking never
+        # waits for a save; lock serializes everything that touches the files.
+        # replace_lock is only held to check ``discarded`` and move a written
+        # snapshot into place, so discard never waits for a save to finish
+        # writing, yet cannot run between a save's check and its replace.
+        self.dirty_lock = threading.Lock()
+        self.lock = threading.RLock()
+        self.replace_lock = threading.Lock()
+        self.discarded = False
+
+    def mark(self, table, row):
+        """
+        Records a new or changed row, keyed by its first column.
+        """
+        with self.dirty_lock:
+            self.dirty[table][row[0]] = tuple(row)
+
+    def mark_deleted(self, table, key):
+        """
+        Records that the row with ``key`` was deleted.
+        """
+        with self.dirty_lock:
+            self.dirty[table][key] = None
+
+    def is_dirty(self):
+        return any(self.dirty.values())
+
+    def take_dirty(self):
+        with self.dirty_lock:
+            dirty = self.dirty
+            self.dirty = {table: {} for table in self.columns}
+        return dirty
+
+    def restore_dirty(self, dirty):
+        # Rows marked again since they were taken are newer and win.
+        with self.dirty_lock:
+            for table, changes in dirty.items():
+                for key, row in changes.items():
+                    self.dirty[table].setdefault(key, row)
+
+    def save(self, read_tables, compact=True):
+        """
+        Writes the rows changed since the last save.
+
+        Args:
+            read_tables (callable): Returns ``{table: rows}`` with every row; only
+                called when there is no snapshot yet, to write the first one.
+            compact (bool): Whether a long change log may be compacted by this save.
+                Compaction rewrites the whole snapshot, so a save that has to be
+                quick can leave it to a later one.
+
+        Returns:
+            int: Number of rows written.
+        """
+        with self.lock:
+            dirty = self.take_dirty()
+            try:
+                if not os.path.exists(self.path):
+                    # The full snapshot already holds every row taken from dirty.
+                    with self.replace_lock:
+                        self.discarded = False
+                    temporary_path = self.path + ".tmp"
+                    counts = save_snapshot(temporary_path, {
+                        table: (self.columns[table], rows) for table, rows in read_tables().items()
+                    })
+                    if not self.install(temporary_path):
+                        return 0
+                    return sum(counts.values())
+                if not any(dirty.values()):
+                    return 0
+
+                written = 0
+                with open(self.changes_path, "a", encoding="utf-8") as f:
+                    for table, changes in dirty.items():
+                        for key, row in changes.items():
+                            f.write(json.dumps([table, key, row]))
+                            f.write("\n")
+                            written += 1
+            except BaseException:
+                self.restore_dirty(dirty)
+                raise
+
+            if compact and os.path.getsize(self.changes_path) > max(
+                    self.compact_minimum, self.compact_ratio * os.path.getsize(self.path)):
+                self.compact()
+            return written
+
+    def compact(self):
+        """
+        Rewrites the snapshot with the change log applied and empties the log.
+        """
+        with self.lock:
+            temporary_path = self.path + ".tmp"
+            snapshot = self.load()
+            try:
+                save_snapshot(temporary_path, {
+                    table: (self.columns[table], snapshot[table]) for table in self.columns
+                })
+            finally:
+                snapshot.close()
+            self.install(temporary_path)
+
+    def install(self, temporary_path):
+        """
+        Moves a fully written snapshot into place and empties the change log.
+
+        Nothing is installed if :meth:`discard` ran since the save began, so a
+        save that outlived its timeout cannot write back the discarded files.
+
+        Returns:
+            bool: Whether the snapshot was installed.
+        """
+        with self.replace_lock:
+            if self.discarded:
+                os.remove(temporary_path)
+                return False
+            os.replace(temporary_path, self.path)
+            self.clear_changes()
+            return True
+
+    def discard(self):
+        """
+        Deletes the snapshot and its change log, so the next save writes it in full.
+
+        Unlike the other methods this does not wait for a save in progress; it is
+        meant for giving up on one that did not finish in time. That save's
+        snapshot, if it writes one, is then dropped instead of installed.
+        """
+        with self.replace_lock:
+            self.discarded = True
+            for path in (self.path, self.changes_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def clear_changes(self):
+        try:
+            os.remove(self.changes_path)
+        except FileNotFoundError:
+            pass
+
+    def read_changes(self):
+        changes = {table: {} for table in self.columns}
+        try:
+            with open(self.changes_path, encoding="utf-8") as f:
+                for line in f:
+                    # A last line without its newline was cut off mid-write; the
+                    # rows on it are still marked or were lost with the process.
+                    if line.strip() and line.endswith("\n"):
+                        table, key, row = json.loads(line)
+                        changes[table][key] = tuple(row) if row is not None else None
+        except FileNotFoundError:
+            pass
+        with self.dirty_lock:
+            for table, dirty in self.dirty.items():
+                changes[table].update(dirty)
+        return changes
+
+    def load(self):
+        """
+        Opens the snapshot with the change log and unsaved changes applied.
+
+        Returns:
+            Snapshot: A snapshot whose tables are MergedTables; close it when done.
+
+        Raises:
+            FileNotFoundError: If nothing was saved yet.
+            ValueError: If the snapshot or change log is not valid.
+        """
+        with self.lock:
+            snapshot = Snapshot(self.path)
+            try:
+                changes = self.read_changes()
+            except (ValueError, KeyError):
+                snapshot.close()
+                raise ValueError("The snapshot change log is not valid")
+        snapshot.tables = {
+            table: MergedTable(snapshot.tables.get(table), changes[table]) for table in self.columns
+        }
+        return snapshot
+
+
+class WriteBehind:
+    """
+    Saves a SnapshotStore on a background thread, so the GUI never waits for it.
+
+    Every ``interval`` seconds the rows marked since the last save are appended to
+    the change log. :meth:`flush` asks for a save now and waits for it, and
+    :meth:`close` does a last save without compaction, so it only writes the rows
+    still marked, and gives up after a timeout.
+
+    The thread is a daemon thread, so a save still running when the program exits
+    is cut short. Only the log's last line can be left cut off, and it is ignored
+    on load (see :meth:`SnapshotStore.read_changes`).
+
+    Args:
+        store (SnapshotStore): The store to save.
+        read_tables (callable): Passed to :meth:`SnapshotStore.save`. It runs on the
+            background thread, so it must open its own database connection.
+        interval (float): Seconds between saves.
+    """
+
+    def __init__(self, store, read_tables, interval=10.0):
+        self.store = store
+        self.read_tables = read_tables
+        self.interval = interval
+        self.wake = threading.Event()
+        self.done = threading.Condition()
+        self.requested = 0
+        self.completed = 0
+        self.error = None
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="snapshot-write-behind", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            with self.done:
+                target = self.requested
+                stopping = self.stopping
+            try:
+                self.store.save(self.read_tables, compact=not stopping)
+                error = None
+            except Exception as e:
+                # The taken rows are marked again, so the next save retries them.
+                error = e
+            with self.done:
+                self.completed = target
+                self.error = error
+                self.done.notify_all()
+            if stopping:
+                return
+
+    def flush(self, timeout=None):
+        """
+        Saves the rows marked so far and waits for the save to finish.
+
+        Args:
+            timeout (float): Seconds to wait, or None to wait until it is done.
+
+        Returns:
+            bool: True if the save finished, False if the timeout ran out first.
+
+        Raises:
+            Exception: The error the save failed with, e.g. OSError or sqlite3.Error.
+        """
+        if not self.thread.is_alive():
+            # Closed already: nothing else will save, so save here.
+            self.store.save(self.read_tables)
+            return True
+        with self.done:
+            self.requested += 1
+            target = self.requested
+            self.wake.set()
+            if not self.done.wait_for(lambda: self.completed >= target, timeout):
+                return False
+            if self.error is not None:
+                raise self.error
+            return True
+
+    def close(self, timeout=2.0):
+        """
+        Saves the rows still marked, stops the thread, and waits at most ``timeout`` seconds.
+
+        If the save does not finish in time, the snapshot is discarded instead
+        of being left behind without the latest changes, and the next save
+        writes it in full.
+
+        Returns:
+            bool: True if everything marked was saved.
+        """
+        with self.done:
+            self.stopping = True
+        try:
+            finished = self.flush(timeout)
+        except Exception:
+            finished = False
+        if not finished:
+            self.store.discard()
+        return finished
@@ -0,0 +1,45 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# The modules under test live at the top of the repository, not in a package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import SQLiteBackend  # noqa: E402
+from migrations import version_tracking  # noqa: E402
+from repository import MYSQL_ROSTER, MYSQL_VERSIONED, Repository  # noqa: E402
+
+# SQLite version of Part2_GUI.py's MySQL tables once MYSQL_ROSTER_MIGRATIONS ran.
+ROSTER_SCHEMA = [
+    "CREATE TABLE students (id INTEGER PRIMARY KEY, student_id TEXT UNIQUE, name TEXT, age INTEGER, email TEXT)",
+    "CREATE TABLE instructors (id INTEGER PRIMARY KEY, instructor_id TEXT UNIQUE, name TEXT, age INTEGER, email TEXT)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, course_id TEXT UNIQUE, name TEXT, instructor_name TEXT)",
+    """CREATE TABLE course_registrations (
+        student_id INTEGER NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+        course_id INTEGER NOT NULL REFERENCES courses (id) ON DELETE CASCADE,
+        PRIMARY KEY (course_id, student_id)
+    )""",
+    "CREATE INDEX course_registrations_student ON course_registrations (student_id, course_id)",
+]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys = ON")
+    for statement in ROSTER_SCHEMA + version_tracking(MYSQL_VERSIONED):
+        conn.execute(statement)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def repository():
+    return Repository.for_backend(SQLiteBackend, MYSQL_ROSTER, MYSQL_VERSIONED)
+
+
+def table_versions(conn):
+    return dict(conn.execute("SELECT table_name, version FROM table_versions"))
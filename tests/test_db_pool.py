@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeoutError, SQLiteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "pool.db"))
+    conn = backend.connect()
+    conn.execute("CREATE TABLE notes (text TEXT)")
+    conn.commit()
+    conn.close()
+    return backend
+
+
+@pytest.fixture
+def pool(backend):
+    pool = ConnectionPool(backend, size=2, timeout=0.05)
+    yield pool
+    pool.close_all()
+
+
+def test_returned_connections_are_reused(pool):
+    first = pool.acquire()
+    pool.release(first)
+    with pool.connection() as conn:
+        assert conn is first
+    second, third = pool.acquire(), pool.acquire()
+    assert second is first
+    assert third is not first
+    pool.release(second)
+    pool.release(third)
+
+
+def test_exhausted_pool_times_out(pool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    pool.release(held.pop())
+    pool.release(pool.acquire())
+    pool.release(held.pop())
+
+
+def test_waiting_borrower_gets_released_connection(backend):
+    pool = ConnectionPool(backend, size=1, timeout=5.0)
+    held = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    waiter.start()
+    pool.release(held)
+    waiter.join(5.0)
+    assert borrowed == [held]
+    pool.release(held)
+    pool.close_all()
+
+
+def test_broken_idle_connection_is_replaced(pool):
+    broken = pool.acquire()
+    pool.release(broken)
+    broken.close()
+    with pool.connection() as conn:
+        assert conn is not broken
+        assert conn.execute("SELECT COUNT(*) FROM notes").fetchone() == (0,)
+
+
+def test_uncommitted_work_is_rolled_back_on_return(pool):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO notes VALUES ('draft')")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM notes").fetchone() == (0,)
+
+
+def test_releasing_twice_is_a_no_op(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    pool.release(conn)
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    for conn in held:
+        pool.release(conn)
+
+
+def test_connection_that_cannot_be_reset_is_closed(backend):
+    class FailingReset(SQLiteBackend):
+        def reset(self, connection):
+            raise sqlite3.OperationalError("reset failed")
+
+    pool = ConnectionPool(FailingReset(backend.path), size=1, timeout=0.05)
+    first = pool.acquire()
+    pool.release(first)
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    with pool.connection() as conn:
+        assert conn is not first
+    pool.close_all()
+
+
+def test_discarded_connection_is_closed_and_frees_its_slot(backend):
+    pool = ConnectionPool(backend, size=1, timeout=0.05)
+    first = pool.acquire()
+    pool.discard(first)
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    pool.release(first)
+    pool.discard(first)
+    with pool.connection() as conn:
+        assert conn is not first
+    with pytest.raises(PoolTimeoutError):
+        with pool.connection():
+            pool.acquire()
+    pool.close_all()
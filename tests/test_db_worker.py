@@ -0,0 +1,70 @@
+import threading
+from contextlib import contextmanager
+
+from db_worker import DatabaseWorker
+
+
+class ManualWidget:
+    # Stands in for a Tk widget: after() callbacks run when run_pending() is called.
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+
+class FakePool:
+    @contextmanager
+    def connection(self):
+        yield object()
+
+
+def run_until_idle(widget, worker):
+    while worker.pending or widget.scheduled:
+        widget.run_pending()
+
+
+def test_jobs_wait_for_submit_first():
+    widget = ManualWidget()
+    worker = DatabaseWorker(widget, FakePool(), poll_interval=0)
+    migrating = threading.Event()
+    migrated = threading.Event()
+    order = []
+
+    def migrate(conn):
+        migrating.set()
+        migrated.wait(5)
+        order.append("migrate")
+
+    worker.submit_first(migrate, lambda result: order.append("migrated"))
+    worker.submit(lambda conn: order.append("refresh"))
+    migrating.wait(5)
+    widget.run_pending()
+    assert order == []
+    migrated.set()
+    run_until_idle(widget, worker)
+    worker.shutdown()
+
+    assert order == ["migrate", "migrated", "refresh"]
+
+
+def test_failed_submit_first_still_runs_held_jobs():
+    widget = ManualWidget()
+    worker = DatabaseWorker(widget, FakePool(), poll_interval=0)
+    errors, order = [], []
+
+    def migrate(conn):
+        raise RuntimeError("migration failed")
+
+    worker.submit_first(migrate, on_error=errors.append)
+    worker.submit(lambda conn: order.append("refresh"))
+    run_until_idle(widget, worker)
+    worker.shutdown()
+
+    assert [str(error) for error in errors] == ["migration failed"]
+    assert order == ["refresh"]
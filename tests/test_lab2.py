@@ -0,0 +1,72 @@
+import pytest
+
+from Lab2 import Course, EnrollmentRegistry, Instructor, Student, load_from_file, save_to_file
+
+
+def test_student_in_courses_with_different_instructors(capsys):
+    i1 = Instructor("Alice", 40, "alice@example.com", "I1")
+    i2 = Instructor("Bob", 45, "bob@example.com", "I2")
+    c1 = Course("C1", "Math", i1)
+    c2 = Course("C2", "Phys", i2)
+    assert c1.registry is not c2.registry
+    s = Student("Sam", 20, "sam@example.com", "S1")
+
+    s.register_course(c1)
+    s.register_course(c2)
+
+    registry = s.registry
+    assert all(record.registry is registry for record in (i1, i2, c1, c2))
+    assert list(s.registered_courses) == ["C1", "C2"]
+    assert list(c2.enrolled_students) == ["S1"]
+    assert c1.instructor is i1 and c2.instructor is i2
+    assert list(i2.assigned_courses) == ["C2"]
+    assert set(registry.courses) == {"C1", "C2"}
+    assert set(registry.instructors) == {"I1", "I2"}
+
+
+def test_merge_keeps_relations_and_empties_other():
+    registry = EnrollmentRegistry()
+    other = EnrollmentRegistry()
+    course = Course("C1", "Math", registry=registry)
+    student = Student("Sam", 20, "sam@example.com", "S1", other)
+    other_course = Course("C2", "Phys", registry=other)
+    other.enroll(student, other_course)
+
+    registry.merge(other)
+
+    assert student.registry is registry and other_course.registry is registry
+    assert list(registry.courses_of("S1")) == ["C2"]
+    assert list(registry.students_in("C2")) == ["S1"]
+    assert not (other.students or other.courses or other.enrollments.pairs())
+    registry.enroll(student, course)
+    assert list(student.registered_courses) == ["C2", "C1"]
+
+
+def test_merge_rejects_duplicate_ids():
+    registry = EnrollmentRegistry()
+    other = EnrollmentRegistry()
+    Course("C1", "Math", registry=registry)
+    duplicate = Course("C1", "Phys", registry=other)
+
+    with pytest.raises(ValueError):
+        registry.merge(other)
+    assert duplicate.registry is other and other.courses["C1"] is duplicate
+
+
+@pytest.mark.parametrize("order", [(0, 1, 2), (2, 0, 1), (1, 2, 0)])
+def test_load_restores_links_in_any_record_order(tmp_path, order, capsys):
+    instructor = Instructor("Alice", 40, "alice@example.com", "I1")
+    course = Course("C1", "Math", instructor)
+    student = Student("Sam", 20, "sam@example.com", "S1")
+    student.register_course(course)
+    records = [instructor, course, student]
+    path = str(tmp_path / "records.jsonl")
+
+    assert save_to_file(path, [records[i] for i in order]) == 3
+    registry = EnrollmentRegistry()
+    loaded = list(load_from_file(path, registry))
+
+    assert len(loaded) == 3
+    assert list(registry.courses_of("S1")) == ["C1"]
+    assert list(registry.students_in("C1")) == ["S1"]
+    assert registry.courses["C1"].instructor is registry.instructors["I1"]
@@ -0,0 +1,101 @@
+import logging
+import sqlite3
+
+import pytest
+
+from migrations import SQLITE_ROSTER_MIGRATIONS, Migration, drop_version_triggers, migrate
+from repository import SQLITE_ROSTER, SQLITE_VERSIONED, Repository
+
+# pyQt5.py's tables, as create_database makes them.
+PYQT_SCHEMA = [
+    "CREATE TABLE students (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, email TEXT, student_id TEXT UNIQUE)",
+    "CREATE TABLE instructors (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, email TEXT, instructor_id TEXT UNIQUE)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, name TEXT, course_id TEXT UNIQUE, instructor_id TEXT)",
+]
+
+
+@pytest.fixture
+def pyqt_conn():
+    conn = sqlite3.connect(":memory:")
+    for statement in PYQT_SCHEMA:
+        conn.execute(statement)
+    yield conn
+    conn.close()
+
+
+def names(conn, kind):
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def test_applies_each_migration_once(pyqt_conn):
+    assert migrate(pyqt_conn, SQLITE_ROSTER_MIGRATIONS) == [0, 1, 2, 3, 4]
+    assert migrate(pyqt_conn, SQLITE_ROSTER_MIGRATIONS) == []
+    assert {"students_name", "courses_instructor"} <= names(pyqt_conn, "index")
+    assert [row[0] for row in pyqt_conn.execute("SELECT version FROM schema_migrations ORDER BY version")] == \
+        [0, 1, 2, 3, 4]
+
+
+def test_drops_per_row_version_triggers(pyqt_conn):
+    migrate(pyqt_conn, SQLITE_ROSTER_MIGRATIONS[:4])
+    for table in SQLITE_VERSIONED:
+        pyqt_conn.execute(f"CREATE TRIGGER {table}_version_insert AFTER INSERT ON {table} BEGIN "
+                          f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; END")
+    assert migrate(pyqt_conn, SQLITE_ROSTER_MIGRATIONS) == [4]
+    assert names(pyqt_conn, "trigger") == set()
+
+    repository = Repository(SQLITE_ROSTER, versioned=SQLITE_VERSIONED)
+    repository.insert_many(pyqt_conn, "students", [(f"S{i}", "Name", 20, "e") for i in range(3)])
+    assert pyqt_conn.execute("SELECT version FROM table_versions WHERE table_name = 'students'").fetchone() == (1,)
+
+
+def test_converts_shipped_courses_layout():
+    # The tables of the school_management.db in the repository.
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE instructors (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, age INTEGER NOT NULL,
+                                  email VARCHAR NOT NULL UNIQUE, instructor_id VARCHAR NOT NULL UNIQUE);
+        CREATE TABLE students (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, age INTEGER NOT NULL,
+                               email VARCHAR NOT NULL UNIQUE, student_id VARCHAR NOT NULL UNIQUE);
+        CREATE TABLE courses (id INTEGER PRIMARY KEY, course_id VARCHAR NOT NULL UNIQUE,
+                              course_name VARCHAR NOT NULL,
+                              instructor_id INTEGER NOT NULL REFERENCES instructors (id));
+        INSERT INTO instructors VALUES (1, 'fadi', 40, 'f@example.com', '12'), (2, 'rana', 41, 'r@example.com', 'I2');
+        INSERT INTO courses VALUES (1, '1', 'eece1', 12), (2, '1000', 'eece2', 2);
+    """)
+    assert migrate(conn, SQLITE_ROSTER_MIGRATIONS) == [0, 1, 2, 3, 4]
+    assert [row[1] for row in conn.execute("PRAGMA table_info(courses)")] == \
+        ["id", "name", "course_id", "instructor_id"]
+    assert conn.execute("SELECT courses.*, instructors.name FROM courses "
+                        "JOIN instructors USING (instructor_id)").fetchall() == \
+        [(1, "eece1", "1", "12", "fadi"), (2, "eece2", "1000", "I2", "rana")]
+    assert "courses_converted" not in names(conn, "table")
+    conn.close()
+
+
+def test_failed_migration_is_not_recorded_and_resumes(pyqt_conn):
+    create = ("CREATE TABLE notes (text TEXT)", "SELECT 1 FROM sqlite_master WHERE name = 'notes'")
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(pyqt_conn, [Migration(1, "notes", [create, "INSERT INTO missing VALUES (1)"])])
+    assert "notes" in names(pyqt_conn, "table")
+    assert migrate(pyqt_conn, []) == []
+    assert pyqt_conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone() == (0,)
+
+    # The CREATE already ran; its done query skips it on the retry.
+    assert migrate(pyqt_conn, [Migration(1, "notes", [create, "INSERT INTO notes VALUES ('x')"])]) == [1]
+    assert pyqt_conn.execute("SELECT text FROM notes").fetchall() == [("x",)]
+
+
+def test_report_rows_are_logged(pyqt_conn, caplog):
+    migration = Migration(1, "report", ["CREATE TABLE notes (text TEXT)", "INSERT INTO notes VALUES ('x')"],
+                          report=("left behind", "SELECT text FROM notes"))
+    with caplog.at_level(logging.WARNING, logger="migrations"):
+        migrate(pyqt_conn, [migration])
+    assert [record.getMessage() for record in caplog.records] == ["Migration 1: left behind: ('x',)"]
+
+
+def test_drop_version_triggers_names_every_event():
+    assert drop_version_triggers(["students"]) == [
+        "DROP TRIGGER IF EXISTS students_version_insert",
+        "DROP TRIGGER IF EXISTS students_version_update",
+        "DROP TRIGGER IF EXISTS students_version_delete",
+    ]
@@ -0,0 +1,156 @@
+import os
+import sqlite3
+from contextlib import closing
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from pyQt5 import SEARCH_INDEXES, MainWindow, RecordTableModel  # noqa: E402
+from repository import SQLITE_ROSTER, Repository  # noqa: E402
+from snapshot import SnapshotStore  # noqa: E402
+
+SCHEMA = [
+    "CREATE TABLE students (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, email TEXT, student_id TEXT UNIQUE)",
+    "CREATE TABLE instructors (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, email TEXT, instructor_id TEXT UNIQUE)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, name TEXT, course_id TEXT UNIQUE, instructor_id TEXT)",
+]
+
+repository = Repository(SQLITE_ROSTER)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "school.db")
+    with closing(sqlite3.connect(path)) as conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for table, columns in SEARCH_INDEXES.items():
+            MainWindow.create_search_index(None, conn.cursor(), table, columns)
+        repository.insert_many(conn, "students", [(f"S{i}", f"Student {i}", 20, f"s{i}@example.com") for i in range(5)])
+        repository.insert_many(conn, "instructors", [(f"I{i}", f"Teacher {i}", 40, f"i{i}@example.com") for i in range(5)])
+        repository.insert_many(conn, "courses", [(f"C{i}", f"Course {i}", f"I{i}") for i in range(5)])
+        conn.commit()
+    return path
+
+
+@pytest.fixture(params=["database", "snapshot"])
+def model(request, app, db_path, tmp_path):
+    model = RecordTableModel(db_path, page_size=2)
+    if request.param == "snapshot":
+        store = SnapshotStore(str(tmp_path / "school.snap"))
+        with closing(sqlite3.connect(db_path)) as conn:
+            store.save(lambda: {table: repository.all(conn, table) for table in RecordTableModel.SNAPSHOT_TABLES})
+        model.reload(snapshot=store.load())
+    yield model
+    model.reload()
+    model.connection.close()
+
+
+def insert(db_path, model, record_type, row, instructor_name=None):
+    # Writes the record, then shows it, as MainWindow's add_* methods do.
+    table = RecordTableModel.SNAPSHOT_TABLES[model.section_of(record_type)]
+    with closing(sqlite3.connect(db_path)) as conn:
+        repository.insert(conn, table, row)
+        conn.commit()
+    if record_type == "Course":
+        course_id, name, instructor_id = row
+        model.insert_record("Course", course_id, name, instructor_name, None, instructor_id)
+    else:
+        key, name, age, email = row
+        model.insert_record(record_type, key, name, age, email)
+
+
+def fetch_all(model):
+    while model.canFetchMore():
+        model.fetchMore()
+    return [row[:2] for row in model.rows]
+
+
+def test_insert_into_section_not_paged_yet(db_path, model):
+    model.fetchMore()
+    assert model.source == 0
+
+    insert(db_path, model, "Instructor", ("I9", "New Teacher", 50, "i9@example.com"))
+    insert(db_path, model, "Course", ("C9", "New Course", "I9"), "New Teacher")
+
+    keys = fetch_all(model)
+    assert keys[-1] == ("Course", "C9")
+    assert keys.count(("Course", "C9")) == 1
+    assert keys[9:11] == [("Instructor", "I4"), ("Instructor", "I9")]
+    assert len(keys) == 17
+    assert model.rows[-1][3] == "Instructor: New Teacher"
+
+
+def test_insert_into_section_being_paged(db_path, model):
+    model.fetchMore()
+    insert(db_path, model, "Student", ("S9", "Student Nine", 21, "s9@example.com"))
+
+    keys = fetch_all(model)
+    assert keys[:6] == [("Student", f"S{i}") for i in (0, 1, 2, 3, 4, 9)]
+    assert len(keys) == 16
+
+
+def test_insert_into_fetched_section(db_path, model):
+    fetch_all(model)
+    insert(db_path, model, "Student", ("S9", "Student Nine", 21, "s9@example.com"))
+
+    keys = [row[:2] for row in model.rows]
+    assert keys[5] == ("Student", "S9")
+    assert model.section_counts == [6, 5, 5]
+    assert not model.canFetchMore()
+
+
+def test_insert_during_search_ignores_the_old_searchs_ranks(app, db_path):
+    model = RecordTableModel(db_path, page_size=2)
+    term = RecordTableModel.match_query("student")
+    generation = model.begin_search(term)
+    insert(db_path, model, "Student", ("S9", "Student Nine", 21, "s9@example.com"))
+    assert model.generation != generation
+
+    # A SearchWorker of the old search delivering late changes nothing.
+    model.add_ranked_ids(generation, 0, [1])
+    keys = fetch_all(model)
+    assert keys[0] == ("Student", "S0")
+    assert ("Student", "S9") in keys
+    assert len(keys) == 6
+    model.connection.close()
+
+
+def test_main_window_searches_again_for_a_record_added_during_a_search(app, db_path):
+    model = RecordTableModel(db_path)
+    searches = []
+    window = SimpleNamespace(model=model, search_records=lambda: searches.append(model.generation))
+
+    MainWindow.show_new_record(window, "Student", "S9", "Student Nine", 21, "s9@example.com")
+    assert searches == []
+    assert model.rows == [] and model.section_counts == [0, 0, 0]
+
+    generation = model.begin_search(RecordTableModel.match_query("nine"))
+    MainWindow.show_new_record(window, "Student", "S9", "Student Nine", 21, "s9@example.com")
+    assert searches == [generation]
+    assert model.generation == generation
+    model.connection.close()
+
+
+def test_failed_search_index_leaves_table_writable():
+    # A courses table whose columns the index does not find, as in the shipped
+    # database before migration 0.
+    with closing(sqlite3.connect(":memory:")) as conn:
+        conn.execute("CREATE TABLE courses (id INTEGER PRIMARY KEY, course_id TEXT, course_name TEXT)")
+        conn.execute("INSERT INTO courses VALUES (1, 'C1', 'Math')")
+        cursor = conn.cursor()
+        with pytest.raises(sqlite3.Error):
+            MainWindow.create_search_index(None, cursor, "courses", SEARCH_INDEXES["courses"])
+        MainWindow.drop_search_index(None, cursor, "courses")
+        conn.execute("INSERT INTO courses VALUES (2, 'C2', 'Physics')")
+        conn.execute("UPDATE courses SET course_name = 'Algebra' WHERE id = 1")
+        conn.execute("DELETE FROM courses WHERE id = 2")
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'courses_fts%'").fetchall() == []
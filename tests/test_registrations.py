@@ -0,0 +1,42 @@
+import pytest
+
+from conftest import table_versions
+from registrations import batches, register
+
+
+@pytest.fixture
+def roster(conn, repository):
+    repository.insert_many(conn, "students", [(f"S{i}", f"Student {i}", 20, f"s{i}@example.com") for i in range(5)])
+    repository.insert_many(conn, "courses", [(f"C{i}", f"Course {i}", "Teacher") for i in range(3)])
+    return conn
+
+
+def registered(conn):
+    return conn.execute(
+        "SELECT students.student_id, courses.course_id FROM course_registrations "
+        "JOIN students ON students.id = course_registrations.student_id "
+        "JOIN courses ON courses.id = course_registrations.course_id ORDER BY 1, 2").fetchall()
+
+
+def test_registers_every_pair(roster, repository):
+    assert register(roster, repository, ["S0", "S1"], ["C0", "C1"]) == 4
+    assert registered(roster) == [("S0", "C0"), ("S0", "C1"), ("S1", "C0"), ("S1", "C1")]
+
+
+def test_existing_registrations_and_unknown_ids_are_skipped(roster, repository):
+    register(roster, repository, ["S0"], ["C0"])
+    assert register(roster, repository, ["S0", "S1", "S1", "missing"], ["C0", "nope"]) == 1
+    assert registered(roster) == [("S0", "C0"), ("S1", "C0")]
+
+
+def test_batches(roster, repository):
+    assert batches(["a", "b", "a", "c"], 2) == [["a", "b"], ["c"]]
+    assert register(roster, repository, [f"S{i}" for i in range(5)], ["C0", "C1", "C2"], batch_size=2) == 15
+    assert len(registered(roster)) == 15
+
+
+def test_bumps_version_once_per_call(roster, repository):
+    before = table_versions(roster)["course_registrations"]
+    register(roster, repository, [f"S{i}" for i in range(5)], ["C0"], batch_size=2)
+    register(roster, repository, ["S0"], ["C0"])
+    assert table_versions(roster)["course_registrations"] == before + 1
@@ -0,0 +1,112 @@
+from conftest import table_versions
+from repository import MYSQL_ROSTER, Repository
+
+STUDENTS = [(f"S{i}", f"Student {i}", 20 + i, f"s{i}@example.com") for i in range(5)]
+
+
+def test_insert_many_and_read(conn, repository):
+    assert repository.insert_many(conn, "students", iter(STUDENTS), batch_size=2) == 5
+    assert repository.all(conn, "students") == STUDENTS
+    assert repository.count(conn, "students") == 5
+    assert repository.column(conn, "students", "name") == [row[1] for row in STUDENTS]
+
+
+def test_find_and_get(conn, repository):
+    repository.insert_many(conn, "students", STUDENTS + [("S9", "Student 1", 30, "other@example.com")])
+    assert repository.get(conn, "students", "S2") == STUDENTS[2]
+    assert repository.get(conn, "students", "missing") is None
+    assert [row[0] for row in repository.find(conn, "students", "name", "Student 1")] == ["S1", "S9"]
+    assert repository.get(conn, "students", "S3", ("email",)) == ("s3@example.com",)
+
+
+def test_update(conn, repository):
+    repository.insert_many(conn, "students", STUDENTS)
+    assert repository.update(conn, "students", "S1", {"name": "Renamed", "age": 40}) == 1
+    assert repository.get(conn, "students", "S1") == ("S1", "Renamed", 40, "s1@example.com")
+    assert repository.update(conn, "students", 20, {"age": 21}, where="age") == 1
+    assert repository.update(conn, "students", "missing", {"age": 1}) == 0
+
+
+def test_delete(conn, repository):
+    repository.insert_many(conn, "students", STUDENTS)
+    assert repository.delete(conn, "students", "S0") == 1
+    assert repository.delete(conn, "students", "S0") == 0
+    assert repository.count(conn, "students") == 4
+
+
+def test_chunks(conn, repository):
+    repository.insert_many(conn, "students", STUDENTS)
+    assert [len(chunk) for chunk in repository.chunks(conn, "students", chunk_size=2)] == [2, 2, 1]
+    chunks = repository.chunks(conn, "students", ("student_id",), chunk_size=2)
+    assert next(chunks) == [("S0",), ("S1",)]
+    chunks.close()
+    assert repository.count(conn, "students") == 5
+
+
+def test_statements_are_cached(repository):
+    sql = repository.statement("select", "students", where="name")
+    assert sql == "SELECT student_id, name, age, email FROM students WHERE name = ?"
+    assert repository.statement("select", "students", where="name") is sql
+    assert Repository(MYSQL_ROSTER, "%s").statement("delete", "courses", where="course_id") == \
+        "DELETE FROM courses WHERE course_id = %s"
+
+
+def test_writes_bump_versions_once_per_call(conn, repository):
+    repository.insert_many(conn, "students", STUDENTS)
+    repository.insert(conn, "courses", ("C1", "Course 1", "Teacher"))
+    repository.update(conn, "students", "S1", {"age": 50})
+    repository.update(conn, "students", "missing", {"age": 50})
+    repository.insert_many(conn, "instructors", [])
+    assert table_versions(conn) == {"students": 2, "instructors": 0, "courses": 1, "course_registrations": 0}
+
+    repository.delete(conn, "courses", "C1")
+    assert table_versions(conn)["course_registrations"] == 1
+
+
+def test_unversioned_repository_does_not_need_table_versions(conn):
+    conn.execute("DROP TABLE table_versions")
+    repository = Repository(MYSQL_ROSTER)
+    repository.insert(conn, "students", STUDENTS[0])
+    assert repository.delete(conn, "students", "S0") == 1
+
+
+def test_versioned_writes_before_table_versions_exists(conn, repository):
+    # Part2_GUI.py writes while the migration creating the table may not have run.
+    conn.execute("DROP TABLE table_versions")
+    repository.insert_many(conn, "students", STUDENTS)
+    repository.update(conn, "students", "S1", {"age": 50})
+    assert repository.delete(conn, "students", "S0") == 1
+    assert repository.count(conn, "students") == 4
+
+
+class UnbufferedCursor:
+    # Behaves like a mysql.connector unbuffered cursor: closing it with rows
+    # left unread fails.
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+
+    def execute(self, sql, params=()):
+        pass
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        if self.rows:
+            raise RuntimeError("Unread result found")
+        self.closed = True
+
+
+def test_closing_chunks_early_leaves_the_rest_unread(repository):
+    cursor = UnbufferedCursor([(i,) for i in range(10)])
+    conn = type("Connection", (), {"cursor": lambda self: cursor})()
+    chunks = repository.chunks(conn, "students", chunk_size=3)
+    assert next(chunks) == [(0,), (1,), (2,)]
+    chunks.close()
+    assert not cursor.closed and len(cursor.rows) == 7
+
+    cursor = UnbufferedCursor([(i,) for i in range(4)])
+    assert list(repository.chunks(conn, "students", chunk_size=3)) == [[(0,), (1,), (2,)], [(3,)]]
+    assert cursor.closed
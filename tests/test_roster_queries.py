@@ -0,0 +1,81 @@
+import pytest
+
+from registrations import register
+from roster_queries import RosterQueries
+
+
+@pytest.fixture
+def roster(conn, repository):
+    repository.insert_many(conn, "students", [
+        ("S1", "Cara", 20, "cara@example.com"),
+        ("S2", "Abe", 21, "abe@example.com"),
+        ("S3", "Bo", 22, "bo@example.com"),
+    ])
+    repository.insert_many(conn, "instructors", [
+        ("I1", "Teacher One", 40, "one@example.com"),
+        ("I2", "Teacher Two", 41, "two@example.com"),
+        ("I3", "Teacher Three", 42, "three@example.com"),
+    ])
+    repository.insert_many(conn, "courses", [
+        ("C1", "Algebra", "Teacher One"),
+        ("C2", "Biology", "Teacher Two"),
+        ("C3", "Chemistry", "Teacher One"),
+    ])
+    register(conn, repository, ["S1", "S2", "S3"], ["C1"])
+    register(conn, repository, ["S1"], ["C2"])
+    conn.commit()
+    return conn
+
+
+def test_course_roster(roster):
+    assert RosterQueries().course_roster(roster, "C1") == [
+        ("S2", "Abe", "abe@example.com", 3),
+        ("S3", "Bo", "bo@example.com", 3),
+        ("S1", "Cara", "cara@example.com", 3),
+    ]
+    assert RosterQueries().course_roster(roster, "C3") == []
+
+
+def test_course_sizes(roster):
+    assert RosterQueries().course_sizes(roster) == [
+        ("C1", "Algebra", "Teacher One", 3),
+        ("C2", "Biology", "Teacher Two", 1),
+        ("C3", "Chemistry", "Teacher One", 0),
+    ]
+
+
+def test_student_schedule(roster):
+    queries = RosterQueries()
+    assert queries.student_schedule(roster, "S1") == [
+        ("C1", "Algebra", "Teacher One", 3, 2),
+        ("C2", "Biology", "Teacher Two", 1, 2),
+    ]
+    assert queries.student_schedule(roster, "S2") == [("C1", "Algebra", "Teacher One", 3, 1)]
+
+
+def test_instructor_loads(roster):
+    assert RosterQueries().instructor_loads(roster) == [
+        ("I1", "Teacher One", 2, 3, 1),
+        ("I2", "Teacher Two", 1, 1, 2),
+        ("I3", "Teacher Three", 0, 0, 3),
+    ]
+
+
+def test_results_follow_writes_from_any_connection(roster, repository):
+    queries = RosterQueries()
+    assert queries.course_sizes(roster)[1][3] == 1
+
+    # Written without calling queries.invalidate, e.g. by another program.
+    register(roster, repository, ["S2", "S3"], ["C2"])
+    assert queries.course_sizes(roster)[1][3] == 3
+
+    repository.delete(roster, "students", "S3")
+    assert queries.course_sizes(roster)[1][3] == 2
+
+
+def test_results_are_cached_until_a_write(roster):
+    queries = RosterQueries()
+    first = queries.course_sizes(roster)
+    assert queries.course_sizes(roster) is first
+    queries.invalidate()
+    assert queries.course_sizes(roster) is not first
@@ -0,0 +1,88 @@
+import os
+import threading
+
+import pytest
+
+import snapshot
+from snapshot import SnapshotStore
+
+STUDENTS = [(f"S{i}", f"Student {i}", 20, f"s{i}@example.com") for i in range(3)]
+
+
+def read_tables():
+    return {"students": STUDENTS, "instructors": [], "courses": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "school.snap"))
+
+
+def discard_during_replace(monkeypatch, store):
+    # Starts discard on another thread just before the snapshot is moved into
+    # place and gives it time to run, as WriteBehind.close does on a timeout.
+    replace = os.replace
+    threads = []
+
+    def racing_replace(source, target):
+        thread = threading.Thread(target=store.discard)
+        thread.start()
+        thread.join(0.2)
+        threads.append(thread)
+        replace(source, target)
+
+    monkeypatch.setattr(snapshot.os, "replace", racing_replace)
+    return threads
+
+
+def test_save_and_load(store):
+    assert store.save(read_tables) == 3
+    store.mark("students", ("S9", "Student Nine", 21, "s9@example.com"))
+    store.mark_deleted("students", "S0")
+    assert store.save(read_tables) == 2
+    loaded = store.load()
+    try:
+        assert [row[0] for row in loaded["students"]] == ["S1", "S2", "S9"]
+    finally:
+        loaded.close()
+
+
+def test_discard_during_compaction_wins(monkeypatch, store):
+    store.save(read_tables)
+    store.mark("students", ("S9", "Student Nine", 21, "s9@example.com"))
+    store.save(read_tables, compact=False)
+
+    threads = discard_during_replace(monkeypatch, store)
+    store.compact()
+    threads[0].join()
+
+    assert not os.path.exists(store.path)
+    assert not os.path.exists(store.changes_path)
+    assert not os.path.exists(store.path + ".tmp")
+
+
+def test_discard_during_first_save_wins(monkeypatch, store):
+    threads = discard_during_replace(monkeypatch, store)
+    store.save(read_tables)
+    threads[0].join()
+    assert not os.path.exists(store.path)
+    assert not os.path.exists(store.changes_path)
+
+
+def test_snapshot_written_after_discard_is_dropped(monkeypatch, store):
+    save_snapshot = snapshot.save_snapshot
+
+    def save_then_discard(path, tables):
+        counts = save_snapshot(path, tables)
+        store.discard()
+        return counts
+
+    monkeypatch.setattr(snapshot, "save_snapshot", save_then_discard)
+    assert store.save(read_tables) == 0
+    assert not os.path.exists(store.path)
+    assert not os.path.exists(store.path + ".tmp")
+
+    # The next save starts over with a full snapshot.
+    monkeypatch.undo()
+    assert store.save(read_tables) == 3
+    assert os.path.exists(store.path)
@@ -0,0 +1,52 @@
+from versioned_cache import VersionedCache
+
+
+def counting_loader(conn, repository, calls):
+    def load(conn):
+        calls.append(1)
+        return repository.column(conn, "students", "name")
+    return load
+
+
+def test_reloads_only_after_a_versioned_write(conn, repository):
+    cache, calls = VersionedCache(), []
+    load = counting_loader(conn, repository, calls)
+    repository.insert(conn, "students", ("S1", "Ann", 20, "ann@example.com"))
+
+    assert cache.get(conn, "names", ("students",), load) == ["Ann"]
+    assert cache.get(conn, "names", ("students",), load) == ["Ann"]
+    assert len(calls) == 1
+
+    repository.insert(conn, "courses", ("C1", "Course", "Teacher"))
+    cache.get(conn, "names", ("students",), load)
+    assert len(calls) == 1
+
+    repository.insert(conn, "students", ("S2", "Bob", 20, "bob@example.com"))
+    assert cache.get(conn, "names", ("students",), load) == ["Ann", "Bob"]
+    assert len(calls) == 2
+
+
+def test_invalidate(conn, repository):
+    cache, calls = VersionedCache(), []
+    load = counting_loader(conn, repository, calls)
+    cache.get(conn, "names", ("students",), load)
+    cache.get(conn, "courses", ("courses",), lambda conn: calls.append(1))
+
+    cache.invalidate("students")
+    cache.get(conn, "names", ("students",), load)
+    cache.get(conn, "courses", ("courses",), lambda conn: calls.append(1))
+    assert len(calls) == 3
+
+    cache.invalidate()
+    cache.get(conn, "names", ("students",), load)
+    assert len(calls) == 4
+
+
+def test_reads_through_without_table_versions(conn, repository):
+    conn.execute("DROP TABLE table_versions")
+    cache, calls = VersionedCache(), []
+    load = counting_loader(conn, repository, calls)
+    cache.get(conn, "names", ("students",), load)
+    cache.get(conn, "names", ("students",), load)
+    assert len(calls) == 2
+    assert cache.entries == {}
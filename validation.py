@@ -0,0 +1,61 @@
+import re
+
+# Compiled once at import instead of being looked up in re's cache on every call.
+NAME_PATTERN = re.compile(r'^[a-zA-Z\s]+$')
+# Email rule used by Lab2.Person.
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+# Email rule used by Lab2_Nael.Person: the domain must end in a 2+ character TLD.
+EMAIL_WITH_TLD_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w{2,}$")
+
+NAME_ERROR = "Name must contain only letters"
+EMAIL_ERROR = "Invalid email format"
+AGE_ERROR = "Age cannot be negative"
+
+
+def is_valid_name(name):
+    return NAME_PATTERN.match(name) is not None
+
+
+def is_valid_email(email, pattern=EMAIL_PATTERN):
+    return pattern.match(email) is not None
+
+
+def validate_many(names=None, emails=None, ages=None, email_pattern=EMAIL_PATTERN):
+    """
+    Validates whole columns of names, emails and ages, collecting every failure.
+
+    Each given column is checked in a single pass with the precompiled patterns.
+    Unlike the Person constructors, a bad value doesn't stop the check: every row
+    with a problem is reported, so an import can point at all of its bad rows at once.
+    Values of the wrong type count as invalid instead of raising.
+
+    Args:
+        names (list): Names to check against ``NAME_PATTERN``, or None to skip.
+        emails (list): Emails to check against ``email_pattern``, or None to skip.
+        ages (list): Ages that must be non-negative numbers, or None to skip.
+        email_pattern (re.Pattern): ``EMAIL_PATTERN`` or ``EMAIL_WITH_TLD_PATTERN``.
+
+    Returns:
+        dict: Maps the index of each invalid row to its list of error messages;
+        empty if every row is valid.
+
+    Example:
+        errors = validate_many(names=[row[0] for row in rows], emails=[row[2] for row in rows])
+        for row, messages in errors.items():
+            print(row, "; ".join(messages))
+    """
+    errors = {}
+    for column, check, message in (
+        (names, NAME_PATTERN.match, NAME_ERROR),
+        (emails, email_pattern.match, EMAIL_ERROR),
+    ):
+        if column is None:
+            continue
+        for row, value in enumerate(column):
+            if not isinstance(value, str) or check(value) is None:
+                errors.setdefault(row, []).append(message)
+    if ages is not None:
+        for row, age in enumerate(ages):
+            if isinstance(age, bool) or not isinstance(age, (int, float)) or age < 0:
+                errors.setdefault(row, []).append(AGE_ERROR)
+    return errors
@@ -0,0 +1,85 @@
+"""
+Times the bulk write paths with and without table version tracking.
+
+Each path runs against a fresh in-memory SQLite copy of Part2_GUI.py's tables
+three ways: without ``table_versions``, with the per-row triggers that
+migrations.version_tracking used to create, and with the once-per-statement
+bumps of a versioned Repository. The paths are Repository.insert_many of
+``count`` students and registrations.register of all of them into one course.
+
+Usage:
+    python version_benchmark.py [count]
+"""
+import sqlite3
+import sys
+import time
+
+from migrations import version_tracking
+from registrations import register
+from repository import MYSQL_ROSTER, MYSQL_VERSIONED, Repository
+
+SCHEMA = [
+    "CREATE TABLE students (id INTEGER PRIMARY KEY, student_id TEXT UNIQUE, name TEXT, age INTEGER, email TEXT)",
+    "CREATE TABLE instructors (id INTEGER PRIMARY KEY, instructor_id TEXT UNIQUE, name TEXT, age INTEGER, email TEXT)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, course_id TEXT UNIQUE, name TEXT, instructor_name TEXT)",
+    "CREATE TABLE course_registrations (student_id INTEGER NOT NULL, course_id INTEGER NOT NULL, "
+    "PRIMARY KEY (course_id, student_id))",
+]
+
+
+def row_triggers(tables):
+    # The FOR EACH ROW triggers of the first version_tracking.
+    return [f"CREATE TRIGGER {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN "
+            f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; END"
+            for table in tables for event in ("INSERT", "UPDATE", "DELETE")]
+
+
+def setup(mode):
+    conn = sqlite3.connect(":memory:")
+    statements = list(SCHEMA)
+    if mode != "untracked":
+        statements += version_tracking(MYSQL_VERSIONED)
+    if mode == "per row":
+        statements += row_triggers(MYSQL_VERSIONED)
+    for statement in statements:
+        conn.execute(statement)
+    versioned = MYSQL_VERSIONED if mode == "per statement" else ()
+    return conn, Repository(MYSQL_ROSTER, versioned=versioned)
+
+
+def run(mode, count):
+    """
+    Runs both bulk paths once in a fresh database.
+
+    Returns:
+        tuple: Seconds taken by insert_many and by register, and the final
+        ``table_versions`` rows (empty when untracked).
+    """
+    conn, repository = setup(mode)
+    rows = [(f"S{i}", f"Student {chr(65 + i % 26)}", 20, f"student{i}@example.com") for i in range(count)]
+    repository.insert(conn, "courses", ("CS101", "Computer Science", "Instructor A"))
+    conn.commit()
+
+    start = time.perf_counter()
+    repository.insert_many(conn, "students", rows)
+    conn.commit()
+    inserted = time.perf_counter()
+    register(conn, repository, [row[0] for row in rows], ["CS101"])
+    conn.commit()
+    registered = time.perf_counter()
+
+    versions = [] if mode == "untracked" else conn.execute("SELECT * FROM table_versions").fetchall()
+    conn.close()
+    return inserted - start, registered - inserted, versions
+
+
+def main(count=100_000):
+    print(f"{count} students inserted, then registered in one course")
+    for mode in ("untracked", "per row", "per statement"):
+        insert_time, register_time, versions = min(run(mode, count) for _ in range(3))
+        print(f"{mode:>13}: insert_many {insert_time * 1000:7.1f} ms, register {register_time * 1000:7.1f} ms"
+              + (f", versions {dict(versions)}" if versions else ""))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
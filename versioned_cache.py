@@ -0,0 +1,88 @@
+"""
+Read-through cache for table reads, kept until the tables change.
+
+Each cached table has a row in ``table_versions`` whose counter the
+Repository write methods bump once per statement, in the writing transaction
+(see repository.Repository and migrations.version_tracking). Checking a cached
+result costs one read of that small table instead of re-reading the cached
+tables, and also notices writes made through a versioned Repository by other
+programs or connections.
+"""
+import threading
+
+
+class VersionedCache:
+    """
+    Caches the results of reads, keyed by the versions of the tables they read.
+
+    :meth:`get` returns the cached value while the versions of its tables are
+    unchanged and reloads it otherwise. The app's own writes can also drop
+    entries at once with :meth:`invalidate`. If ``table_versions`` cannot be
+    read (e.g. its migration has not run yet), every read goes to the database.
+    Safe to share between threads.
+
+    Example:
+        names = cache.get(conn, "student names", ("students",),
+                          lambda conn: repository.column(conn, "students", "name"))
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def versions(conn, tables):
+        """
+        Reads the current version of each of ``tables``.
+
+        Returns:
+            tuple: One version per table, or None if the versions are not available.
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT table_name, version FROM table_versions")
+            versions = dict(cursor.fetchall())
+        except Exception:
+            # The drivers share no error base class; any failure here just
+            # means reading without the cache.
+            return None
+        finally:
+            cursor.close()
+        return tuple(versions.get(table) for table in tables)
+
+    def get(self, conn, key, tables, load):
+        """
+        Returns the cached result for ``key``, calling ``load(conn)`` if ``tables`` changed since.
+
+        Args:
+            conn: An open sqlite3 or mysql.connector connection.
+            key: Identifies the read, e.g. "dropdowns".
+            tables (tuple): Names of the tables ``load`` reads.
+            load (callable): Reads the value from ``conn``.
+        """
+        versions = self.versions(conn, tables)
+        with self.lock:
+            entry = self.entries.get(key)
+            generation = self.generation
+        if versions is not None and entry is not None and entry[0] == versions:
+            return entry[1]
+        value = load(conn)
+        # The versions were read before loading, so a write in between only
+        # makes the next get reload again.
+        with self.lock:
+            if versions is not None and generation == self.generation:
+                self.entries[key] = (versions, value, frozenset(tables))
+        return value
+
+    def invalidate(self, *tables):
+        """
+        Drops the cached results that read any of ``tables``, or all of them if none are given.
+        """
+        with self.lock:
+            self.generation += 1
+            if not tables:
+                self.entries.clear()
+                return
+            for key in [key for key, entry in self.entries.items() if entry[2].intersection(tables)]:
+                del self.entries[key]
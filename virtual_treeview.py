@@ -0,0 +1,92 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Flat ttk.Treeview that only creates items for the rows currently in view.
+
+    The rows live in a plain list given to :meth:`set_rows`. The widget keeps just
+    enough items to fill its height and rewrites their values as it scrolls, so
+    loading or replacing the rows costs the same for ten rows or a million.
+    Scrolling goes through :meth:`yview`, so a ttk.Scrollbar can be connected as
+    usual with ``command=tree.yview`` and ``yscrollcommand=scrollbar.set``. The
+    mouse wheel and the Up/Down/Prior/Next keys scroll the rows too.
+
+    Args:
+        master: The parent widget.
+        yscrollcommand (callable): Called with the visible fraction, like a Treeview's.
+        **kw: Other ttk.Treeview options.
+    """
+
+    def __init__(self, master=None, yscrollcommand=None, **kw):
+        super().__init__(master, **kw)
+        self.rows = []
+        self.first = 0
+        self.visible = 1
+        self.scroll_callback = yscrollcommand
+        self.bind("<Configure>", self.on_configure)
+        self.bind("<MouseWheel>", lambda event: self.yview("scroll", -3 if event.delta > 0 else 3, "units"))
+        self.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+        self.bind("<Up>", lambda event: self.yview("scroll", -1, "units") or "break")
+        self.bind("<Down>", lambda event: self.yview("scroll", 1, "units") or "break")
+        self.bind("<Prior>", lambda event: self.yview("scroll", -1, "pages") or "break")
+        self.bind("<Next>", lambda event: self.yview("scroll", 1, "pages") or "break")
+
+    def set_rows(self, rows):
+        """
+        Replaces the rows shown by the table and scrolls back to the top.
+
+        Args:
+            rows (list): One tuple of column values per row.
+        """
+        self.rows = rows
+        self.first = 0
+        self.render()
+
+    def row_height(self):
+        try:
+            return int(ttk.Style(self).lookup("Treeview", "rowheight")) or 20
+        except (ValueError, tk.TclError):
+            return 20
+
+    def on_configure(self, event):
+        # One row height is left for the headings.
+        visible = max(1, event.height // self.row_height() - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def render(self):
+        self.first = max(0, min(self.first, len(self.rows) - self.visible))
+        window = self.rows[self.first:self.first + self.visible]
+        items = self.get_children()
+        if len(items) > len(window):
+            self.delete(*items[len(window):])
+        # Items are reused for whichever rows are in view, so a selection would
+        # follow the item rather than the row.
+        self.selection_remove(self.selection())
+        for index, values in enumerate(window):
+            if index < len(items):
+                self.item(items[index], values=values)
+            else:
+                self.insert("", tk.END, values=values)
+        if self.scroll_callback:
+            self.scroll_callback(*self.yview())
+
+    def yview(self, *args):
+        """
+        Returns the visible fraction of the rows, or scrolls them like ``Treeview.yview``.
+
+        Args:
+            *args: Nothing, ``("moveto", fraction)`` or ``("scroll", number, "units" | "pages")``.
+        """
+        if not args:
+            total = len(self.rows) or 1
+            return self.first / total, min(1.0, (self.first + self.visible) / total)
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            self.first += int(args[1]) * (self.visible if args[2] == "pages" else 1)
+        self.render()